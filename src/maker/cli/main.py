@@ -1,11 +1,15 @@
 import argparse
 import asyncio
 import json
+import os
+import sys
 from maker import run_task
-from maker.core.models import TaskConfig
+from maker.core.checkpoint import RunCheckpoint, new_run_id
+from maker.core.models import TaskConfig, VoteWeightingConfig
 from maker.core.events import (
     TaskSubmitted, PlanCreated, ValidationPassed, ValidationFailed,
     StepStarted, StepCompleted, StepFailed, TaskCompleted, TaskFailed,
+    AgentSampleCompleted, AgentSampleRedFlagged, VoteCompleted, ContextOverflowHandled,
 )
 
 
@@ -13,14 +17,87 @@ def parse_args(argv=None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="MAKER: Maximal Agentic Decomposition")
     parser.add_argument("instruction", help="The task to execute")
     parser.add_argument("--model", default="claude-sonnet-4-5", help="Model to use")
-    parser.add_argument("--voting", default="none", choices=["none", "majority", "first_to_k"])
+    parser.add_argument("--voting", default="none", choices=["none", "majority", "first_to_k", "sequential", "fieldwise"])
     parser.add_argument("--voting-n", type=int, default=3, help="Samples for majority voting")
-    parser.add_argument("--voting-k", type=int, default=2, help="K for first-to-K voting")
+    parser.add_argument("--voting-k", type=int, default=2, help="K for first-to-K and fieldwise voting")
     parser.add_argument("--max-voting-samples", type=int, default=10, help="Max voting samples per step")
+    parser.add_argument("--max-concurrent-samples", type=int, default=5,
+                        help="Max agent samples running at once per step")
+    parser.add_argument("--voting-window", type=int, default=1,
+                        help="Samples kept in flight for first-to-K voting")
+    parser.add_argument("--voting-confidence", type=float, default=0.95,
+                        help="Posterior confidence to stop sequential voting")
+    parser.add_argument("--voting-prior-accuracy", type=float, default=0.8,
+                        help="Assumed per-sample accuracy for sequential voting")
+    parser.add_argument("--weighted-voting", action="store_true",
+                        help="Count repaired samples as half a vote in first-to-K, sequential and fieldwise voting")
+    parser.add_argument("--similarity-threshold", type=float, default=None,
+                        help="Cluster free-text votes at this Jaccard similarity (0-1)")
+    parser.add_argument("--cascade-model", default=None,
+                        help="Cheap model to sample first; escalate on disagreement")
+    parser.add_argument("--escalation-model", default=None,
+                        help="Model to escalate to (defaults to --model)")
+    parser.add_argument("--cascade-agreement", type=float, default=0.6,
+                        help="Escalate if the leader's share of cheap samples stays below this")
+    parser.add_argument("--cascade-min-samples", type=int, default=3,
+                        help="Cheap samples to draw before deciding to escalate")
+    parser.add_argument("--hedge-max", type=int, default=0,
+                        help="Duplicate samples allowed per step for slow samples (0 disables)")
+    parser.add_argument("--hedge-after-ms", type=int, default=None,
+                        help="Fixed hedge threshold (default: rolling p90 per step type)")
+    parser.add_argument("--sample-budget", type=int, default=None,
+                        help="Agent samples for the whole task, shared across steps")
+    parser.add_argument("--cost-budget", type=float, default=None,
+                        help="Agent spend in USD for the whole task")
+    parser.add_argument("--red-flag-rules", default="agent_error,not_dict",
+                        help="Comma-separated red-flag rules: agent_error, not_dict, missing_fields, "
+                             "repaired, raw_size, error_object")
+    parser.add_argument("--max-raw-chars", type=int, default=None,
+                        help="Raw response size limit for the raw_size rule")
+    parser.add_argument("--declared-error-threshold", type=int, default=2,
+                        help="Fail a step once this many samples declare the same kind of error (0 disables)")
+    parser.add_argument("--max-output-chars", type=int, default=None,
+                        help="Red-flag and abort a sample once its output exceeds this many chars")
+    parser.add_argument("--max-turns", type=int, default=None,
+                        help="Red-flag and abort a sample after this many assistant turns")
+    parser.add_argument("--max-tool-calls", type=int, default=None,
+                        help="Red-flag and abort a sample after this many tool calls")
+    parser.add_argument("--max-sample-seconds", type=float, default=None,
+                        help="Red-flag and abort a sample that runs longer than this")
+    parser.add_argument("--isolate-workspaces", action="store_true",
+                        help="Give each sample of a file-changing step its own copy of the working directory")
+    parser.add_argument("--tool-cache", default="off", choices=["off", "step", "task"],
+                        help="Share read-only tool results across samples of a step or the whole task")
+    parser.add_argument("--execution-mode", default="sequential", choices=["sequential", "dag"],
+                        help="Run steps whose inputs are ready concurrently (dag)")
+    parser.add_argument("--max-parallel-steps", type=int, default=4,
+                        help="Steps running at once in dag mode")
+    parser.add_argument("--step-cache-dir", default=None,
+                        help="Reuse results of identical side-effect-free steps from earlier tasks")
+    parser.add_argument("--step-cache-max-mb", type=float, default=256.0,
+                        help="Size limit of the step cache; least recently used entries are evicted")
+    parser.add_argument("--context-max-tokens", type=int, default=None,
+                        help="Token budget for the context injected into each step")
+    parser.add_argument("--context-overflow", default="truncate", choices=["truncate", "spill", "summarize"],
+                        help="How to shrink context values over the budget")
+    parser.add_argument("--context-summary-model", default=None,
+                        help="Model that summarizes oversized context values")
+    parser.add_argument("--runs-dir", default=".maker/runs",
+                        help="Where runs are checkpointed for `maker resume`")
+    parser.add_argument("--no-checkpoint", action="store_true", help="Don't checkpoint this run")
     parser.add_argument("--quality-checks", action="store_true", help="Enable LLM quality checks")
     return parser.parse_args(argv)
 
 
+def parse_resume_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="maker resume", description="Continue a run from its first unfinished step",
+    )
+    parser.add_argument("run_id", help="Run to resume, as printed when it started")
+    parser.add_argument("--runs-dir", default=".maker/runs", help="Where runs are checkpointed")
+    return parser.parse_args(argv)
+
+
 def print_plan(plan) -> str:
     """Format a Plan for CLI display."""
     lines = [f"Plan created: {len(plan.steps)} steps"]
@@ -54,6 +131,23 @@ def format_event(event) -> str:
         return f"Validation failed: {errors}"
     elif isinstance(event, StepStarted):
         return f"Step {event.step} started: {event.title}"
+    elif isinstance(event, ContextOverflowHandled):
+        where = f" to {event.spill_path}" if event.spill_path else ""
+        return (
+            f"  Context {event.variable}: {event.policy}{where} "
+            f"({event.tokens_before} -> {event.tokens_after} tokens)"
+        )
+    elif isinstance(event, AgentSampleCompleted):
+        return f"  Sample {event.sample_index} done ({event.duration_ms}ms, ${event.cost_usd:.4f})"
+    elif isinstance(event, AgentSampleRedFlagged):
+        return f"  Sample {event.sample_index} red-flagged: {event.reason}"
+    elif isinstance(event, VoteCompleted):
+        hits = ", ".join(f"{rule}: {n}" for rule, n in sorted(event.red_flag_hits.items()))
+        return (
+            f"  Vote decided after {event.total_samples} samples ({event.red_flagged} red-flagged"
+            f"{f' by {hits}' if hits else ''}), "
+            f"entropy {event.agreement_entropy:.2f} bits, {event.decision_ms}ms"
+        )
     elif isinstance(event, StepCompleted):
         output_str = json.dumps(event.output, indent=2) if isinstance(event.output, dict) else str(event.output)
         return f"Step {event.step} completed: {event.title}\n  Output: {output_str}"
@@ -74,7 +168,15 @@ def format_event(event) -> str:
 
 
 def cli():
-    args = parse_args()
+    argv = sys.argv[1:]
+    if argv[:1] == ["resume"]:
+        args = parse_resume_args(argv[1:])
+        config = RunCheckpoint(os.path.join(args.runs_dir, args.run_id)).load_config()
+        print(f"Resuming run {args.run_id}")
+        _run(config)
+        return
+
+    args = parse_args(argv)
     config = TaskConfig(
         instruction=args.instruction,
         model=args.model,
@@ -82,14 +184,51 @@ def cli():
         voting_n=args.voting_n,
         voting_k=args.voting_k,
         max_voting_samples=args.max_voting_samples,
+        max_concurrent_samples=args.max_concurrent_samples,
+        voting_window=args.voting_window,
+        voting_confidence=args.voting_confidence,
+        voting_prior_accuracy=args.voting_prior_accuracy,
+        vote_weighting=VoteWeightingConfig(enabled=args.weighted_voting),
+        voting_similarity_threshold=args.similarity_threshold,
+        cascade_model=args.cascade_model,
+        escalation_model=args.escalation_model,
+        cascade_agreement=args.cascade_agreement,
+        cascade_min_samples=args.cascade_min_samples,
+        hedge_max_per_step=args.hedge_max,
+        hedge_after_ms=args.hedge_after_ms,
+        task_sample_budget=args.sample_budget,
+        task_cost_budget_usd=args.cost_budget,
+        red_flag_rules=[r.strip() for r in args.red_flag_rules.split(",") if r.strip()],
+        red_flag_max_raw_chars=args.max_raw_chars,
+        declared_error_threshold=args.declared_error_threshold,
+        red_flag_max_output_chars=args.max_output_chars,
+        red_flag_max_turns=args.max_turns,
+        red_flag_max_tool_calls=args.max_tool_calls,
+        red_flag_max_seconds=args.max_sample_seconds,
+        isolate_sample_workspaces=args.isolate_workspaces,
+        tool_cache=args.tool_cache,
+        execution_mode=args.execution_mode,
+        max_parallel_steps=args.max_parallel_steps,
+        step_cache_dir=args.step_cache_dir,
+        step_cache_max_mb=args.step_cache_max_mb,
+        context_max_tokens=args.context_max_tokens,
+        context_overflow=args.context_overflow,
+        context_summary_model=args.context_summary_model,
         enable_quality_checks=args.quality_checks,
     )
+    if not args.no_checkpoint:
+        run_id = new_run_id()
+        config.checkpoint_dir = os.path.abspath(os.path.join(args.runs_dir, run_id))
+        print(f"Run {run_id} (continue with: maker resume {run_id})")
+    _run(config)
+
 
-    async def _run():
+def _run(config: TaskConfig) -> None:
+    async def _events():
         async for event in run_task(config):
             print(format_event(event))
 
-    asyncio.run(_run())
+    asyncio.run(_events())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,93 @@
+import json
+import os
+import time
+import uuid
+from dataclasses import asdict, fields
+from maker.core.models import (
+    NormalizationConfig, Plan, PlanStep, TaskConfig, VoteWeightingConfig, VotingSummary,
+)
+
+
+def new_run_id() -> str:
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+class RunCheckpoint:
+    """Everything needed to resume a run, saved under one directory as it happens:
+
+        config.json      the TaskConfig
+        plan.json        the validated plan
+        steps/<n>.json   the winner and voting summary of each finished step
+
+    Files are written under a temporary name and renamed, so a killed process
+    never leaves a half-written step behind.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @property
+    def run_id(self) -> str:
+        return os.path.basename(os.path.normpath(self.path))
+
+    def save_config(self, config: TaskConfig) -> None:
+        self._write("config.json", asdict(config))
+
+    def load_config(self) -> TaskConfig:
+        data = self._read("config.json")
+        if data is None:
+            raise FileNotFoundError(f"No run at {self.path}")
+        known = {f.name for f in fields(TaskConfig)}
+        data = {k: v for k, v in data.items() if k in known}
+        data["normalization"] = NormalizationConfig(**data.get("normalization", {}))
+        data["vote_weighting"] = VoteWeightingConfig(**data.get("vote_weighting", {}))
+        # The run lives wherever it was loaded from, whatever directory saved it
+        data["checkpoint_dir"] = os.path.abspath(self.path)
+        return TaskConfig(**data)
+
+    def save_plan(self, plan: Plan) -> None:
+        self._write("plan.json", asdict(plan))
+
+    def load_plan(self) -> Plan | None:
+        data = self._read("plan.json")
+        if data is None:
+            return None
+        return Plan(reasoning=data["reasoning"], steps=[PlanStep(**s) for s in data["steps"]])
+
+    def save_step(self, step: PlanStep, output: dict, summary: VotingSummary,
+                  cost_usd: float, duration_ms: int) -> None:
+        self._write(os.path.join("steps", f"{step.step}.json"), {
+            "step": step.step,
+            "output_variable": step.output_variable,
+            "output": output,
+            "voting": asdict(summary),
+            "cost_usd": cost_usd,
+            "duration_ms": duration_ms,
+        })
+
+    def completed_steps(self) -> dict[int, dict]:
+        """Saved step records by step number."""
+        steps_dir = os.path.join(self.path, "steps")
+        if not os.path.isdir(steps_dir):
+            return {}
+        records = {}
+        for name in os.listdir(steps_dir):
+            if name.endswith(".json"):
+                record = self._read(os.path.join("steps", name))
+                records[record["step"]] = record
+        return records
+
+    def _write(self, name: str, data: dict) -> None:
+        target = os.path.join(self.path, name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp = f"{target}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f, indent=2, default=str)
+        os.replace(tmp, target)
+
+    def _read(self, name: str) -> dict | None:
+        try:
+            with open(os.path.join(self.path, name)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
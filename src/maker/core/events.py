@@ -47,6 +47,18 @@ class StepStarted:
     type: str = field(init=False, default="step_started")
 
 
+@dataclass
+class ContextOverflowHandled:
+    timestamp: float
+    step: int
+    variable: str
+    policy: str  # "truncate" | "spill" | "summarize"
+    tokens_before: int
+    tokens_after: int
+    spill_path: str | None = None
+    type: str = field(init=False, default="context_overflow_handled")
+
+
 @dataclass
 class AgentSampleCompleted:
     timestamp: float
@@ -55,6 +67,7 @@ class AgentSampleCompleted:
     output: dict
     cost_usd: float
     duration_ms: int
+    tally: dict[str, int] = field(default_factory=dict)  # vote counts after this sample
     type: str = field(init=False, default="agent_sample_completed")
 
 
@@ -74,6 +87,10 @@ class VoteCompleted:
     winner: dict
     total_samples: int
     red_flagged: int
+    vote_counts: dict[str, int] = field(default_factory=dict)
+    agreement_entropy: float = 0.0
+    decision_ms: int = 0
+    red_flag_hits: dict[str, int] = field(default_factory=dict)
     type: str = field(init=False, default="vote_completed")
 
 
@@ -95,6 +112,7 @@ class StepFailed:
     step: int
     title: str
     error: str
+    error_category: str | None = None  # set when agents declared the failure themselves
     type: str = field(init=False, default="step_failed")
 
 
@@ -16,14 +16,74 @@ class ToolInfo:
     server_name: str | None = None
 
 
+@dataclass
+class NormalizationConfig:
+    """How outputs are normalized before vote hashing."""
+    whitespace: bool = True  # trim strings and collapse internal whitespace
+    unicode_nfc: bool = True
+    numeric_strings: bool = True  # "1", "1.0" and 1 are the same value; "007" stays a string
+    float_tolerance: float = 0.0  # >0: numbers are bucketed to this resolution
+    lowercase: bool = False
+    unordered_lists: bool = False  # sort every list; schema types set[...] are always sorted
+
+
+@dataclass
+class VoteWeightingConfig:
+    """How much a valid sample's vote counts. Weights multiply; a clean sample is 1."""
+    enabled: bool = False
+    repaired: float = 0.5  # output needed YAML repair
+    slow_after_ms: int | None = None
+    slow: float = 0.75
+    long_after_chars: int | None = None  # raw response length
+    long: float = 0.75
+    model_weights: dict[str, float] = field(default_factory=dict)  # e.g. cheaper tier < 1
+
+
 @dataclass
 class TaskConfig:
     instruction: str
     model: str = "claude-sonnet-4-5"
-    voting_strategy: str = "none"  # "none" | "majority" | "first_to_k"
+    voting_strategy: str = "none"  # "none" | "majority" | "first_to_k" | "sequential" | "fieldwise"
     voting_n: int = 3
     voting_k: int = 2
     max_voting_samples: int = 10
+    max_concurrent_samples: int = 5  # per-step cap on agent samples in flight
+    voting_window: int = 1  # first_to_k samples kept in flight; extras cancelled on K-lead
+    voting_confidence: float = 0.95  # sequential: posterior needed to stop
+    voting_prior_accuracy: float = 0.8  # sequential: assumed per-sample accuracy
+    project_votes_to_schema: bool = True  # hash only output_schema fields when voting
+    normalization: NormalizationConfig = field(default_factory=NormalizationConfig)
+    vote_weighting: VoteWeightingConfig = field(default_factory=VoteWeightingConfig)
+    voting_similarity_threshold: float | None = None  # cluster free-text votes by Jaccard
+    voting_shingle_size: int = 1  # words per shingle for similarity clustering
+    cascade_model: str | None = None  # cheap model to sample first; None disables cascading
+    escalation_model: str | None = None  # model after escalation; defaults to model
+    cascade_agreement: float = 0.6  # escalate if leader share stays below this...
+    cascade_min_samples: int = 3  # ...after this many cheap samples
+    hedge_max_per_step: int = 0  # duplicate samples allowed per step to cut tail latency
+    hedge_after_ms: int | None = None  # fixed hedge threshold; None uses the rolling quantile
+    hedge_quantile: float = 0.9  # rolling latency quantile per step type
+    task_sample_budget: int | None = None  # samples for the whole task; replaces max_voting_samples
+    task_cost_budget_usd: float | None = None  # agent spend for the whole task
+    red_flag_rules: list[str] = field(default_factory=lambda: ["agent_error", "not_dict"])  # see red_flag.rules
+    red_flag_max_raw_chars: int | None = None  # limit for the raw_size rule
+    declared_error_threshold: int = 2  # same-kind {error: ...} samples that fail a step; 0 lets them vote
+    red_flag_max_output_chars: int | None = None  # abort a sample once its text exceeds this
+    red_flag_max_turns: int | None = None  # ...once it takes more assistant turns
+    red_flag_max_tool_calls: int | None = None  # ...once it makes more tool calls
+    red_flag_max_seconds: float | None = None  # ...once it runs longer
+    workspace_dir: str | None = None  # directory agents work in; None is the current directory
+    isolate_sample_workspaces: bool = False  # copy workspace_dir per sample for file-changing steps
+    tool_cache: str = "off"  # "off" | "step" | "task": share read-only tool results across samples
+    execution_mode: str = "sequential"  # "sequential" | "dag": run independent steps concurrently
+    max_parallel_steps: int = 4  # dag: steps running at once
+    checkpoint_dir: str | None = None  # save the plan and each finished step here so the run can resume
+    step_cache_dir: str | None = None  # reuse winners of identical side-effect-free steps across tasks
+    step_cache_max_mb: float = 256.0  # least recently used entries are evicted beyond this
+    context_max_tokens: int | None = None  # estimated tokens of injected step context; None is unlimited
+    context_overflow: str = "truncate"  # "truncate" | "spill" | "summarize" when over context_max_tokens
+    context_spill_dir: str | None = None  # spill: where values go; None is a temp directory
+    context_summary_model: str | None = None  # summarize: defaults to cascade_model, then model
     step_max_retries: int = 2
     enable_quality_checks: bool = False
     max_planner_retries: int = 2
@@ -62,6 +122,20 @@ class AgentResult:
     cost_usd: float
     duration_ms: int
     error: str | None = None
+    model: str | None = None  # set by SamplePool when samples may come from several models
+    aborted: bool = False  # a stream red-flag limit stopped the sample early
+
+
+@dataclass
+class SampleRecord:
+    """One voting sample, in the order samples finished."""
+    index: int
+    elapsed_ms: int  # since the vote started
+    output: dict
+    cost_usd: float
+    duration_ms: int
+    red_flag_reason: str | None = None
+    tally: dict[str, int] = field(default_factory=dict)  # vote counts after this sample
 
 
 @dataclass
@@ -70,6 +144,13 @@ class VotingSummary:
     total_samples: int
     red_flagged: int
     winning_votes: int
+    cancelled: int = 0
+    samples_by_model: dict[str, int] = field(default_factory=dict)
+    hedged: int = 0
+    agreement_entropy: float = 0.0
+    decision_ms: int = 0
+    cached: bool = False  # reused from the step cache; no samples were run
+    red_flag_hits: dict[str, int] = field(default_factory=dict)  # discards per red-flag rule
 
 
 @dataclass
@@ -79,3 +160,12 @@ class VoteResult:
     total_samples: int
     red_flagged: int
     vote_counts: dict[str, int]
+    cancelled: int = 0  # in-flight samples cancelled once the vote was decided
+    field_votes: dict[str, dict[str, int]] = field(default_factory=dict)  # fieldwise only
+    samples_by_model: dict[str, int] = field(default_factory=dict)
+    hedged: int = 0  # duplicate samples started because a sample ran long
+    cost_usd: float = 0.0  # cost of the samples that completed
+    samples: list[SampleRecord] = field(default_factory=list)  # vote trajectory
+    agreement_entropy: float = 0.0  # bits; 0 when every valid sample agreed
+    decision_ms: int = 0  # from the first launch to the decision
+    red_flag_hits: dict[str, int] = field(default_factory=dict)  # discards per red-flag rule
@@ -1,3 +1,4 @@
+from maker.core.checkpoint import RunCheckpoint
 from maker.core.models import TaskConfig, Plan
 from maker.core.events import (
     TaskSubmitted, PlanCreated, ValidationPassed, ValidationFailed,
@@ -36,36 +37,44 @@ class Orchestrator:
         )
         yield task_event
 
+        # A run directory that already holds a validated plan is being resumed
+        checkpoint = RunCheckpoint(self._config.checkpoint_dir) if self._config.checkpoint_dir else None
+        plan = checkpoint.load_plan() if checkpoint else None
+        if plan is not None:
+            yield PlanCreated(timestamp=time.time(), plan=plan)
+        elif checkpoint is not None:
+            checkpoint.save_config(self._config)
+
         # 2. Plan → Validate loop (with retries)
-        plan = None
-        plan_event = None
-        for attempt in range(self._config.max_planner_retries + 1):
-            # Run planner
-            async for event in self._planner.process(task_event):
-                yield event
-                if isinstance(event, PlanCreated):
-                    plan_event = event
+        if plan is None:
+            plan_event = None
+            for attempt in range(self._config.max_planner_retries + 1):
+                # Run planner
+                async for event in self._planner.process(task_event):
+                    yield event
+                    if isinstance(event, PlanCreated):
+                        plan_event = event
 
-            if plan_event is None:
-                yield TaskFailed(
-                    timestamp=time.time(),
-                    error="Planner produced no plan",
-                    step=-1,
-                )
-                return
+                if plan_event is None:
+                    yield TaskFailed(
+                        timestamp=time.time(),
+                        error="Planner produced no plan",
+                        step=-1,
+                    )
+                    return
 
-            # Run validator
-            validated = False
-            async for event in self._validator.process(plan_event):
-                yield event
-                if isinstance(event, ValidationPassed):
-                    plan = plan_event.plan
-                    validated = True
-                elif isinstance(event, ValidationFailed):
-                    self._planner.set_validation_feedback(event.errors)
+                # Run validator
+                validated = False
+                async for event in self._validator.process(plan_event):
+                    yield event
+                    if isinstance(event, ValidationPassed):
+                        plan = plan_event.plan
+                        validated = True
+                    elif isinstance(event, ValidationFailed):
+                        self._planner.set_validation_feedback(event.errors)
 
-            if validated:
-                break
+                if validated:
+                    break
 
         if not plan:
             yield TaskFailed(
@@ -74,13 +83,15 @@ class Orchestrator:
                 step=-1,
             )
             return
+        if checkpoint is not None:
+            checkpoint.save_plan(plan)
 
         # 3. Configure executor with validated plan and wire up voter
         self._executor._plan = plan
         self._executor._config = self._config
         if self._executor._voter is None:
             runner = AgentRunner()
-            red_flagger = RedFlagger()
+            red_flagger = RedFlagger.from_config(self._config)
             self._executor._voter = create_voter(
                 self._config.voting_strategy, runner, red_flagger,
             )
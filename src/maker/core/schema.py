@@ -0,0 +1,44 @@
+from functools import lru_cache
+
+_OPEN = "{[("
+_CLOSE = "}])"
+
+
+@lru_cache(maxsize=256)
+def parse_output_schema(output_schema: str) -> dict[str, str]:
+    """Top-level fields of a planner output_schema, mapped to their type text.
+
+    Schemas are written as loose flow mappings, e.g.
+    "{incident_id: string, files: list[string], owner: {id: int}}", which are not
+    always valid YAML, so this only splits on top-level commas.
+    Returns an empty dict if the schema is not a braced mapping.
+    """
+    text = " ".join(output_schema.split())
+    if not (text.startswith("{") and text.endswith("}")):
+        return {}
+
+    fields: dict[str, str] = {}
+    for part in _split_top_level(text[1:-1]):
+        name, sep, type_text = part.partition(":")
+        name = name.strip().strip("\"'")
+        if sep and name:
+            fields[name] = type_text.strip()
+    return fields
+
+
+def _split_top_level(text: str) -> list[str]:
+    parts = []
+    depth = 0
+    current = []
+    for ch in text:
+        if ch in _OPEN:
+            depth += 1
+        elif ch in _CLOSE:
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(ch)
+    parts.append("".join(current))
+    return parts
@@ -1,5 +1,10 @@
+import asyncio
+import time
+from contextlib import aclosing
 import claude_agent_sdk as sdk
 from maker.core.models import PlanStep, AgentResult, TaskConfig
+from maker.red_flag.stream_monitor import StreamMonitor
+from maker.executor.tool_cache import ToolCache
 from maker.yaml_cleaner.cleaner import YAMLCleaner, YAMLParseError
 from maker.prompts import load_prompt
 
@@ -7,12 +12,14 @@ from maker.prompts import load_prompt
 class AgentRunner:
     def __init__(self):
         self._yaml_cleaner = YAMLCleaner()
+        self._tool_caches: dict[int | str, ToolCache] = {}  # by scope: step number or "task"
 
     async def run(self, step: PlanStep, context: str, config: TaskConfig) -> AgentResult:
         """Run one isolated agent for one step.
 
         1. Build prompt from step description + context
-        2. Call SDK query() with step's tools
+        2. Call SDK query() with step's tools, aborting early if a stream
+           red-flag limit is crossed
         3. Extract last TextBlock from final AssistantMessage
         4. Parse through YAML cleaner
         5. Return AgentResult
@@ -32,13 +39,43 @@ class AgentRunner:
         # Collect messages from stream
         assistant_messages = []
         result_message = None
+        monitor = StreamMonitor.from_config(config)
+        flag_reason = None
+        start = time.monotonic()
 
-        async for msg in self._sdk_query(prompt, allowed_tools=allowed_tools, model=config.model):
-            cls_name = type(msg).__name__
-            if cls_name == "AssistantMessage":
-                assistant_messages.append(msg)
-            elif cls_name == "ResultMessage":
-                result_message = msg
+        tool_cache = self._cache_for(step, config)
+        stream = self._sdk_query(prompt, allowed_tools=allowed_tools, model=config.model,
+                                 cwd=config.workspace_dir,
+                                 hooks=tool_cache.hooks() if tool_cache else None)
+        deadline = asyncio.timeout(monitor.max_seconds)
+        try:
+            async with aclosing(stream), deadline:
+                async for msg in stream:
+                    cls_name = type(msg).__name__
+                    if cls_name == "AssistantMessage":
+                        assistant_messages.append(msg)
+                    elif cls_name == "ResultMessage":
+                        result_message = msg
+                    flag_reason = monitor.observe(msg)
+                    if flag_reason:
+                        break
+        except TimeoutError:
+            if not deadline.expired():
+                raise  # raised by the SDK, not our time limit
+            flag_reason = monitor.timeout_reason()
+
+        # Red-flagged mid-stream: the rest of the sample was never run
+        if flag_reason:
+            return AgentResult(
+                output={},
+                raw_response="",
+                was_repaired=False,
+                tokens=0,
+                cost_usd=result_message.total_cost_usd if result_message else 0.0,
+                duration_ms=int((time.monotonic() - start) * 1000),
+                error=f"Red-flagged while streaming: {flag_reason}",
+                aborted=True,
+            )
 
         # Handle empty stream
         if not assistant_messages:
@@ -95,15 +132,37 @@ class AgentRunner:
             error=None,
         )
 
+    def files_changed(self, paths: list[str]) -> None:
+        """Files were changed outside any agent (a committed sample workspace)."""
+        if paths:
+            for cache in self._tool_caches.values():
+                cache.invalidate_files()
+
+    def _cache_for(self, step: PlanStep, config: TaskConfig) -> ToolCache | None:
+        """Tool cache shared by every sample of this step (or of the whole task).
+        Steps running at the same time each keep their own."""
+        if config.tool_cache == "off":
+            return None
+        if config.tool_cache not in ("step", "task"):
+            raise ValueError(f"Unknown tool_cache scope: {config.tool_cache}")
+        scope = "task" if config.tool_cache == "task" else step.step
+        if scope not in self._tool_caches:
+            self._tool_caches[scope] = ToolCache()
+        return self._tool_caches[scope]
+
     async def _sdk_query(self, prompt: str, **kwargs):
         """Call claude-agent-sdk query(). Yields message stream.
         This method exists to be easily mocked in tests."""
         allowed_tools = kwargs.pop("allowed_tools", [])
         model = kwargs.pop("model", None)
+        cwd = kwargs.pop("cwd", None)
+        hooks = kwargs.pop("hooks", None)
 
         options = sdk.ClaudeAgentOptions(
             allowed_tools=allowed_tools,
             model=model,
+            cwd=cwd,
+            hooks=hooks,
             permission_mode="bypassPermissions",
         )
 
@@ -0,0 +1,164 @@
+import hashlib
+import math
+import os
+import tempfile
+from dataclasses import dataclass
+import yaml
+from maker.core.models import TaskConfig
+from maker.prompts import load_prompt
+
+CHARS_PER_TOKEN = 4  # rough average for English text, code and YAML
+POLICIES = ("truncate", "spill", "summarize")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap local token estimate; no tokenizer needed."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+@dataclass
+class ContextOverflow:
+    """One value of a step's context that was shrunk to fit the token budget."""
+    variable: str  # step name, or step name and field, e.g. step_2_output.file_list
+    policy: str  # the policy actually applied; spill and summarize can fall back to truncate
+    tokens_before: int
+    tokens_after: int
+    spill_path: str | None = None
+
+
+class ContextBudget:
+    """Keeps a step's context under max_tokens.
+
+    When the context is over budget, its largest values (each field of each
+    referenced step output) are shrunk first, until it fits:
+
+    - truncate: keep the start of the value's YAML
+    - spill: write the value to a file and tell the agent to Read it (steps
+      without the Read tool truncate instead)
+    - summarize: replace the value with a cheap-model summary, cached by content
+    """
+
+    _summaries: dict[str, str] = {}  # shared by every budget in the process
+
+    def __init__(self, max_tokens: int, policy: str = "truncate", spill_dir: str | None = None,
+                 summary_model: str = "claude-haiku-4-5"):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown context overflow policy {policy!r}; available: {list(POLICIES)}")
+        self.max_tokens = max_tokens
+        self.policy = policy
+        self.spill_dir = spill_dir or os.path.join(tempfile.gettempdir(), "maker-context")
+        self.summary_model = summary_model
+
+    @classmethod
+    def from_config(cls, config: TaskConfig) -> "ContextBudget | None":
+        if config.context_max_tokens is None:
+            return None
+        return cls(
+            config.context_max_tokens,
+            config.context_overflow,
+            config.context_spill_dir,
+            config.context_summary_model or config.cascade_model or config.model,
+        )
+
+    async def fit(self, context: dict, can_read: bool = True) -> tuple[dict, list[ContextOverflow]]:
+        """context (as from ContextBuilder.collect) shrunk to fit, and what was done.
+        can_read is whether the step's agent has the Read tool for spilled values."""
+        total = estimate_tokens(_dump(context))
+        if total <= self.max_tokens:
+            return context, []
+
+        fitted = {name: dict(value) if isinstance(value, dict) else value for name, value in context.items()}
+        units = []
+        for name, value in fitted.items():
+            if isinstance(value, dict):
+                units += [(name, key, _dump(v)) for key, v in value.items()]
+            else:
+                units.append((name, None, _dump(value)))
+        units.sort(key=lambda unit: len(unit[2]), reverse=True)
+
+        overflows = []
+        for name, key, text in units:
+            if total <= self.max_tokens:
+                break
+            before = estimate_tokens(text)
+            target = before - (total - self.max_tokens)
+            variable = name if key is None else f"{name}.{key}"
+            while True:
+                replacement, overflow = await self._shrink(variable, text, max(0, target), can_read)
+                overflow.tokens_after = estimate_tokens(_dump(replacement))
+                if overflow.tokens_after >= before:
+                    break  # too small to shrink
+                _set(fitted, name, key, replacement)
+                total = estimate_tokens(_dump(fitted))
+                # YAML quoting can make the truncated value render longer than planned
+                if total <= self.max_tokens or target <= 0 or overflow.policy != "truncate":
+                    break
+                target -= total - self.max_tokens
+            if overflow.tokens_after < before:
+                overflows.append(overflow)
+        return fitted, overflows
+
+    async def _shrink(self, variable: str, text: str, target: int,
+                      can_read: bool) -> tuple[str, ContextOverflow]:
+        before = estimate_tokens(text)
+        if self.policy == "spill" and can_read:
+            path = self._spill(text)
+            return (
+                f"[{before} tokens moved to {path}; Read that file for the full value]",
+                ContextOverflow(variable, "spill", before, 0, spill_path=path),
+            )
+        if self.policy == "summarize":
+            try:
+                summary = await self._cached_summary(variable, text, max(target, 1))
+                return summary, ContextOverflow(variable, "summarize", before, 0)
+            except Exception:
+                pass  # fall back to truncation
+        marker = f"\n... [truncated from {len(text)} characters]"
+        kept = text[:max(0, target * CHARS_PER_TOKEN - len(marker))]
+        return kept + marker, ContextOverflow(variable, "truncate", before, 0)
+
+    def _spill(self, text: str) -> str:
+        """Write text to a file named by its hash, so identical values share a file."""
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = os.path.join(self.spill_dir, f"{hashlib.sha256(text.encode()).hexdigest()[:16]}.yaml")
+        if not os.path.exists(path):
+            with open(f"{path}.tmp", "w") as f:
+                f.write(text)
+            os.replace(f"{path}.tmp", path)
+        return path
+
+    async def _cached_summary(self, variable: str, text: str, max_tokens: int) -> str:
+        key = hashlib.sha256(f"{self.summary_model}\0{max_tokens}\0{text}".encode()).hexdigest()
+        if key not in self._summaries:
+            prompt = load_prompt("context_summary", variable=variable, value=text, max_tokens=max_tokens)
+            self._summaries[key] = await self._summarize(prompt)
+        return self._summaries[key]
+
+    async def _summarize(self, prompt: str) -> str:
+        """Call claude-agent-sdk query() with the summary model; returns the final text."""
+        from claude_agent_sdk import query, ClaudeAgentOptions, AssistantMessage, TextBlock
+
+        options = ClaudeAgentOptions(model=self.summary_model, max_turns=1, allowed_tools=[])
+        last_assistant = None
+        async for message in query(prompt=prompt, options=options):
+            if isinstance(message, AssistantMessage):
+                last_assistant = message
+        if last_assistant is None:
+            raise RuntimeError("No AssistantMessage received from SDK")
+        for block in reversed(last_assistant.content):
+            if isinstance(block, TextBlock):
+                return block.text
+        raise RuntimeError("No TextBlock found in final AssistantMessage")
+
+
+def _set(context: dict, name: str, key, value) -> None:
+    if key is None:
+        context[name] = value
+    else:
+        context[name][key] = value
+
+
+def _dump(value) -> str:
+    if isinstance(value, str):
+        return value
+    return yaml.dump(value, default_flow_style=False)
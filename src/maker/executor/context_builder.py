@@ -1,30 +1,80 @@
+import re
 import yaml
 from maker.core.models import PlanStep
 
+# One path segment: a field name, optionally followed by list indexes, e.g. files[0]
+_SEGMENT = re.compile(r"^([^\[\]]*)((?:\[-?\d+\])*)$")
+
 
 class ContextBuilder:
     def build(self, step: PlanStep, step_outputs: dict[str, dict]) -> str:
-        """Build context string by injecting full outputs of referenced steps.
+        """Build context string by injecting the referenced parts of earlier outputs.
 
-        From each input_variable, extracts the step name (everything before first '.'),
-        then injects the full output dict of that step as YAML.
+        Each input_variable is a step name (everything before the first '.'),
+        optionally followed by a field path such as `file_list`, `owner.id` or
+        `files[0].name`. Only the named fields of that step's output are injected,
+        as YAML keyed by their path. A bare step name, or a path that doesn't exist
+        in the output, injects the whole output.
 
         Returns empty string if no input_variables.
         """
         if not step.input_variables:
             return ""
+        return self.render(self.collect(step, step_outputs))
 
-        # Extract unique step names
-        step_names = set()
+    def collect(self, step: PlanStep, step_outputs: dict[str, dict]) -> dict:
+        """The context build() renders, as a dict keyed by step name."""
+        # Group field paths by step name; None means the whole output
+        paths: dict[str, set[str] | None] = {}
         for var in step.input_variables:
-            step_name = var.split(".")[0]
-            step_names.add(step_name)
+            step_name, _, path = var.partition(".")
+            if not path:
+                paths[step_name] = None
+            elif paths.get(step_name, set()) is not None:
+                paths.setdefault(step_name, set()).add(path)
 
         # Build context dict
         context = {}
-        for name in sorted(step_names):
+        for name in sorted(paths):
             if name not in step_outputs:
                 raise KeyError(f"Step output '{name}' not found. Available: {list(step_outputs.keys())}")
-            context[name] = step_outputs[name]
+            context[name] = _project(step_outputs[name], paths[name])
+        return context
 
+    @staticmethod
+    def render(context: dict) -> str:
+        if not context:
+            return ""
         return yaml.dump(context, default_flow_style=False)
+
+
+def _project(output, paths: set[str] | None):
+    """The fields of output named by paths, keyed by path, or all of output."""
+    if paths is None:
+        return output
+    # A path inside another requested path is already covered by it
+    kept = [p for p in sorted(paths) if not any(p.startswith(f"{q}.") or p.startswith(f"{q}[") for q in paths)]
+    projected = {}
+    for path in kept:
+        try:
+            projected[path] = _resolve(output, path)
+        except (KeyError, IndexError, TypeError, ValueError):
+            return output
+    return projected
+
+
+def _resolve(value, path: str):
+    for segment in path.split("."):
+        match = _SEGMENT.match(segment)
+        if match is None:
+            raise ValueError(f"Bad field path segment {segment!r}")
+        name, indexes = match.groups()
+        if name:
+            if not isinstance(value, dict):
+                raise TypeError(f"{name!r} is not a field of a {type(value).__name__}")
+            value = value[name]
+        for index in re.findall(r"-?\d+", indexes):
+            if not isinstance(value, list):
+                raise TypeError(f"Cannot index a {type(value).__name__}")
+            value = value[int(index)]
+    return value
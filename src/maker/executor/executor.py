@@ -1,16 +1,33 @@
 from maker.core.module import Module
 from maker.core.events import (
     ValidationPassed, StepStarted, StepCompleted, StepFailed,
-    TaskCompleted, TaskFailed,
+    TaskCompleted, TaskFailed, AgentSampleCompleted, AgentSampleRedFlagged,
+    VoteCompleted, ContextOverflowHandled,
 )
-from maker.core.models import Plan, TaskConfig, VotingSummary
+from maker.core.checkpoint import RunCheckpoint
+from maker.core.models import Plan, PlanStep, SampleRecord, TaskConfig, VoteResult, VotingSummary
+from maker.executor.context_budget import ContextBudget
 from maker.executor.context_builder import ContextBuilder
 from maker.executor.result_collector import ResultCollector
+from maker.executor.step_cache import StepCache, step_fingerprint
+from maker.executor.workspace import has_side_effects
 from maker.voting.base import Voter
+from maker.voting.budget import SampleBudget
+from maker.voting.declared_error import DeclaredStepError
+from dataclasses import dataclass, replace
 from typing import AsyncIterator
+import asyncio
 import time
 
 
+@dataclass
+class _StepOutcome:
+    events: list  # telemetry to report before StepCompleted
+    vote_result: VoteResult
+    summary: VotingSummary
+    duration_ms: int
+
+
 class ExecutorModule(Module):
     def __init__(self, config: TaskConfig, plan: Plan):
         self._config = config
@@ -18,6 +35,10 @@ class ExecutorModule(Module):
         self._context_builder = ContextBuilder()
         self._step_outputs: dict[str, dict] = {}
         self._voter: Voter = None  # set externally or via factory
+        self._checkpoint: RunCheckpoint | None = None
+        self._saved_steps: dict[int, dict] = {}  # finished in an earlier attempt at this run
+        self._step_cache: StepCache | None = None
+        self._context_budget: ContextBudget | None = None
 
     async def process(self, event) -> AsyncIterator:
         if not isinstance(event, ValidationPassed):
@@ -25,7 +46,22 @@ class ExecutorModule(Module):
 
         collector = ResultCollector(instruction=self._config.instruction)
         step_map = {s.step: s for s in self._plan.steps}
+        budget = SampleBudget.from_config(self._config)
+        visited: set[int] = set()
         current_step_num = 0
+        if self._config.checkpoint_dir:
+            self._checkpoint = RunCheckpoint(self._config.checkpoint_dir)
+            self._saved_steps = self._checkpoint.completed_steps()
+        self._step_cache = StepCache.from_config(self._config)
+        self._context_budget = ContextBudget.from_config(self._config)
+
+        dag_steps = self._dag_steps() if self._config.execution_mode == "dag" else None
+        if dag_steps is not None:
+            async for e in self._process_dag(dag_steps, collector, budget):
+                yield e
+                if isinstance(e, TaskFailed):
+                    return
+            current_step_num = -1  # every step already ran
 
         while current_step_num >= 0:
             step = step_map.get(current_step_num)
@@ -46,20 +82,11 @@ class ExecutorModule(Module):
             yield StepStarted(timestamp=time.time(), step=step.step, title=step.title)
 
             try:
-                start = time.time()
-                context = self._context_builder.build(step, self._step_outputs)
-                vote_result = await self._voter.vote(step, context, self._config)
-                duration_ms = int((time.time() - start) * 1000)
-
-                self._step_outputs[step.output_variable] = vote_result.winner
-
-                # Build voting summary
-                summary = VotingSummary(
-                    strategy=self._config.voting_strategy,
-                    total_samples=vote_result.total_samples,
-                    red_flagged=vote_result.red_flagged,
-                    winning_votes=vote_result.vote_counts.get(vote_result.canonical_hash, 1),
-                )
+                outcome = await self._execute_step(step, budget, len(step_map.keys() - visited))
+                visited.add(step.step)
+                for e in outcome.events:
+                    yield e
+                vote_result = outcome.vote_result
 
                 # Handle conditional routing
                 if step.task_type == "conditional_step":
@@ -81,36 +108,11 @@ class ExecutorModule(Module):
                 else:
                     current_step_num = step.next_step_sequence_number
 
-                yield StepCompleted(
-                    timestamp=time.time(),
-                    step=step.step,
-                    title=step.title,
-                    output=vote_result.winner,
-                    voting_summary=summary,
-                    cost_usd=0.0,
-                    duration_ms=duration_ms,
-                )
-                collector.add_step(
-                    step=step.step,
-                    title=step.title,
-                    output=vote_result.winner,
-                    voting_summary=summary,
-                    cost_usd=0.0,
-                    duration_ms=duration_ms,
-                )
+                yield self._complete(step, outcome, collector)
 
             except Exception as e:
-                yield StepFailed(
-                    timestamp=time.time(),
-                    step=step.step,
-                    title=step.title,
-                    error=str(e),
-                )
-                yield TaskFailed(
-                    timestamp=time.time(),
-                    error=str(e),
-                    step=step.step,
-                )
+                for failure in self._failure_events(step, e):
+                    yield failure
                 return
 
         result = collector.finalize()
@@ -120,3 +122,306 @@ class ExecutorModule(Module):
             total_cost_usd=result["total_cost_usd"],
             total_duration_ms=result["total_duration_ms"],
         )
+
+    async def _execute_step(self, step: PlanStep, budget: SampleBudget | None,
+                            steps_left: int) -> "_StepOutcome":
+        """Vote on one step and store its winner. Raises if the step fails."""
+        saved = self._saved_steps.pop(step.step, None)
+        if saved is not None:
+            return self._restore_step(step, saved, budget)
+
+        start = time.time()
+        context, overflows = await self._build_context(step)
+        cache_key, vote_result = None, None
+        if self._step_cache is not None and not has_side_effects(step):
+            cache_key = step_fingerprint(step, context, self._config)
+            vote_result = self._step_cache.get(cache_key)
+        cached = vote_result is not None
+        if not cached:
+            vote_result = await self._vote(step, context, budget, steps_left)
+            if cache_key is not None:
+                self._step_cache.put(cache_key, vote_result)
+        duration_ms = int((time.time() - start) * 1000)
+
+        self._step_outputs[step.output_variable] = vote_result.winner
+
+        # Context budget decisions, then the vote trajectory
+        events = [
+            ContextOverflowHandled(
+                timestamp=start,
+                step=step.step,
+                variable=o.variable,
+                policy=o.policy,
+                tokens_before=o.tokens_before,
+                tokens_after=o.tokens_after,
+                spill_path=o.spill_path,
+            )
+            for o in overflows
+        ]
+        events += [self._sample_event(step, sample, start) for sample in vote_result.samples]
+        events.append(VoteCompleted(
+            timestamp=time.time(),
+            step=step.step,
+            winner=vote_result.winner,
+            total_samples=vote_result.total_samples,
+            red_flagged=vote_result.red_flagged,
+            vote_counts=vote_result.vote_counts,
+            agreement_entropy=vote_result.agreement_entropy,
+            decision_ms=vote_result.decision_ms,
+            red_flag_hits=vote_result.red_flag_hits,
+        ))
+
+        summary = VotingSummary(
+            strategy=self._config.voting_strategy,
+            total_samples=vote_result.total_samples,
+            red_flagged=vote_result.red_flagged,
+            winning_votes=vote_result.vote_counts.get(vote_result.canonical_hash, 1),
+            cancelled=vote_result.cancelled,
+            samples_by_model=vote_result.samples_by_model,
+            hedged=vote_result.hedged,
+            agreement_entropy=vote_result.agreement_entropy,
+            decision_ms=vote_result.decision_ms,
+            cached=cached,
+            red_flag_hits=vote_result.red_flag_hits,
+        )
+        if self._checkpoint is not None:
+            self._checkpoint.save_step(step, vote_result.winner, summary, vote_result.cost_usd, duration_ms)
+        return _StepOutcome(events, vote_result, summary, duration_ms)
+
+    async def _build_context(self, step: PlanStep) -> tuple[str, list]:
+        """The step's context, shrunk to context_max_tokens if set, and the overflows handled."""
+        if self._context_budget is None:
+            return self._context_builder.build(step, self._step_outputs), []
+        context = self._context_builder.collect(step, self._step_outputs)
+        can_read = "Read" in step.primary_tools or "Read" in step.fallback_tools
+        context, overflows = await self._context_budget.fit(context, can_read)
+        return self._context_builder.render(context), overflows
+
+    async def _vote(self, step: PlanStep, context: str, budget: SampleBudget | None,
+                    steps_left: int) -> VoteResult:
+        step_config = self._config
+        held = 0
+        if budget is not None:
+            cap = budget.step_cap(self._config, steps_left)
+            if cap == 0:
+                raise RuntimeError(
+                    f"Task budget exhausted before step {step.step} "
+                    f"({budget.samples_spent} samples, ${budget.cost_spent_usd:.2f} spent)"
+                )
+            step_config = replace(self._config, max_voting_samples=cap)
+            # Hold the cap so steps voting concurrently can't spend it too
+            held = cap
+            budget.reserve(held)
+        failed_samples, failed_cost = 0, 0.0
+        try:
+            vote_result = await self._voter.vote(step, context, step_config)
+        except DeclaredStepError as e:
+            # The abandoned vote was paid for whether or not failover succeeds
+            failed_samples, failed_cost = e.total_samples, e.cost_usd
+            if budget is not None:
+                budget.record(failed_samples, failed_cost)
+                used = min(held, failed_samples)
+                budget.release(used)
+                held -= used
+                step_config = replace(step_config, max_voting_samples=max(1, held))
+            failover = self._failover_step(step, e)
+            if failover is None:
+                raise
+            vote_result = await self._voter.vote(failover, context, step_config)
+        finally:
+            if budget is not None:
+                budget.release(held)
+        if budget is not None:
+            budget.record(vote_result.total_samples, vote_result.cost_usd)
+        if failed_samples or failed_cost:
+            vote_result = replace(
+                vote_result,
+                total_samples=vote_result.total_samples + failed_samples,
+                cost_usd=vote_result.cost_usd + failed_cost,
+            )
+        return vote_result
+
+    def _restore_step(self, step: PlanStep, saved: dict, budget: SampleBudget | None) -> "_StepOutcome":
+        """Outcome of a step finished before the run was resumed; nothing is re-run."""
+        summary = VotingSummary(**saved["voting"])
+        vote_result = VoteResult(
+            winner=saved["output"],
+            canonical_hash="",
+            total_samples=summary.total_samples,
+            red_flagged=summary.red_flagged,
+            vote_counts={},
+            cost_usd=saved["cost_usd"],
+        )
+        if budget is not None:
+            budget.record(vote_result.total_samples, vote_result.cost_usd)
+        self._step_outputs[step.output_variable] = vote_result.winner
+        return _StepOutcome([], vote_result, summary, saved["duration_ms"])
+
+    def _complete(self, step: PlanStep, outcome: "_StepOutcome", collector: ResultCollector) -> StepCompleted:
+        vote_result = outcome.vote_result
+        collector.add_step(
+            step=step.step,
+            title=step.title,
+            output=vote_result.winner,
+            voting_summary=outcome.summary,
+            cost_usd=vote_result.cost_usd,
+            duration_ms=outcome.duration_ms,
+        )
+        return StepCompleted(
+            timestamp=time.time(),
+            step=step.step,
+            title=step.title,
+            output=vote_result.winner,
+            voting_summary=outcome.summary,
+            cost_usd=vote_result.cost_usd,
+            duration_ms=outcome.duration_ms,
+        )
+
+    def _dag_steps(self) -> list[PlanStep] | None:
+        """Steps on the plan's next_step chain from step 0, in the order their events
+        are reported, or None if the plan can't run as a DAG (conditional routing,
+        or a chain that is broken or loops) and must run sequentially."""
+        step_map = {s.step: s for s in self._plan.steps}
+        chain, current = [], 0
+        while current >= 0:
+            step = step_map.get(current)
+            if step is None or step.task_type == "conditional_step" or step in chain:
+                return None
+            chain.append(step)
+            current = step.next_step_sequence_number
+        return chain
+
+    async def _process_dag(self, steps: list[PlanStep], collector: ResultCollector,
+                           budget: SampleBudget | None) -> AsyncIterator:
+        """Run steps as soon as the steps producing their input_variables have finished,
+        up to max_parallel_steps at a time. Steps with file-changing tools are barriers:
+        they run alone, after every earlier step and before every later one.
+        Events are reported step by step in chain order, whatever order steps finish in."""
+        # A step depends on the earlier steps producing its input_variables
+        deps, producers = {}, {}
+        for s in steps:
+            deps[s.step] = {producers[v.split(".")[0]] for v in s.input_variables
+                            if v.split(".")[0] in producers}
+            producers[s.output_variable] = s.step
+        limit = max(1, self._config.max_parallel_steps)
+        tasks: dict[int, asyncio.Task] = {}
+        succeeded: set[int] = set()
+        running: set[asyncio.Task] = set()
+        reported = 0
+        failed = False
+
+        try:
+            while reported < len(steps):
+                if not failed:
+                    self._schedule_ready(steps, deps, tasks, succeeded, running, limit, budget)
+
+                # Report finished steps in chain order
+                while reported < len(steps):
+                    step = steps[reported]
+                    task = tasks.get(step.step)
+                    if task is None or not task.done():
+                        break
+                    yield StepStarted(timestamp=time.time(), step=step.step, title=step.title)
+                    if task.exception() is not None:
+                        for e in self._failure_events(step, task.exception()):
+                            yield e
+                        return
+                    outcome = task.result()
+                    for e in outcome.events:
+                        yield e
+                    yield self._complete(step, outcome, collector)
+                    reported += 1
+
+                if reported == len(steps):
+                    break
+                if not running:
+                    # A failed step left later ones unscheduled: report the first failure
+                    step = next(s for s in steps if s.step in tasks and tasks[s.step].exception())
+                    yield StepStarted(timestamp=time.time(), step=step.step, title=step.title)
+                    for e in self._failure_events(step, tasks[step.step].exception()):
+                        yield e
+                    return
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                running -= done
+                for task in done:
+                    step_num = next(n for n, t in tasks.items() if t is task)
+                    if task.exception() is None:
+                        succeeded.add(step_num)
+                    else:
+                        failed = True
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    def _schedule_ready(self, steps, deps, tasks, succeeded, running, limit, budget) -> None:
+        for i, step in enumerate(steps):
+            if len(running) >= limit:
+                return
+            if step.step in tasks:
+                continue
+            earlier = steps[:i]
+            barrier_pending = any(has_side_effects(s) and s.step not in succeeded for s in earlier)
+            if barrier_pending:
+                return
+            if has_side_effects(step):
+                if running or any(s.step not in succeeded for s in earlier):
+                    return
+            elif not deps[step.step] <= succeeded:
+                continue
+            steps_left = len(steps) - len(succeeded)  # running steps hold reservations too
+            task = asyncio.ensure_future(self._execute_step(step, budget, steps_left))
+            tasks[step.step] = task
+            running.add(task)
+            if has_side_effects(step):
+                return
+
+    def _failure_events(self, step: PlanStep, error: BaseException) -> list:
+        return [
+            StepFailed(
+                timestamp=time.time(),
+                step=step.step,
+                title=step.title,
+                error=str(error),
+                error_category=getattr(error, "category", None),
+            ),
+            TaskFailed(
+                timestamp=time.time(),
+                error=str(error),
+                step=step.step,
+            ),
+        ]
+
+    def _sample_event(self, step: PlanStep, sample: SampleRecord, start: float):
+        timestamp = start + sample.elapsed_ms / 1000
+        if sample.red_flag_reason is not None:
+            return AgentSampleRedFlagged(
+                timestamp=timestamp,
+                step=step.step,
+                sample_index=sample.index,
+                reason=sample.red_flag_reason,
+            )
+        return AgentSampleCompleted(
+            timestamp=timestamp,
+            step=step.step,
+            sample_index=sample.index,
+            output=sample.output,
+            cost_usd=sample.cost_usd,
+            duration_ms=sample.duration_ms,
+            tally=sample.tally,
+        )
+
+    def _failover_step(self, step: PlanStep, error: DeclaredStepError) -> PlanStep | None:
+        """The step rerun on its fallback tools only, or None if there is nothing to
+        fail over to. Bad inputs from earlier steps won't be fixed by other tools."""
+        if not step.fallback_tools or error.category == "invalid_input":
+            return None
+        return replace(
+            step,
+            primary_tools=list(step.fallback_tools),
+            fallback_tools=[],
+            primary_tool_instructions=step.fallback_tool_instructions,
+            fallback_tool_instructions="",
+        )
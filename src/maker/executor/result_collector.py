@@ -19,6 +19,13 @@ class ResultCollector:
                 "samples": voting_summary.total_samples,
                 "red_flagged": voting_summary.red_flagged,
                 "winning_votes": voting_summary.winning_votes,
+                "cancelled": voting_summary.cancelled,
+                "samples_by_model": voting_summary.samples_by_model,
+                "hedged": voting_summary.hedged,
+                "agreement_entropy": voting_summary.agreement_entropy,
+                "decision_ms": voting_summary.decision_ms,
+                "cached": voting_summary.cached,
+                "red_flag_hits": voting_summary.red_flag_hits,
             },
             "cost_usd": cost_usd,
             "duration_ms": duration_ms,
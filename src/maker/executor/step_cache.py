@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+from dataclasses import asdict, replace
+from maker.core.models import PlanStep, TaskConfig, VoteResult
+
+# TaskConfig fields that can change which answer a step's vote settles on.
+VOTE_CONFIG_FIELDS = (
+    "model", "voting_strategy", "voting_n", "voting_k", "max_voting_samples",
+    "voting_confidence", "voting_prior_accuracy", "project_votes_to_schema", "normalization",
+    "vote_weighting", "voting_similarity_threshold", "voting_shingle_size", "cascade_model",
+    "escalation_model", "cascade_agreement", "cascade_min_samples", "red_flag_rules",
+    "red_flag_max_raw_chars", "declared_error_threshold", "mcp_servers", "allowed_builtin_tools",
+)
+
+
+def step_fingerprint(step: PlanStep, context: str, config: TaskConfig) -> str:
+    """Hash of everything a step's winner depends on: what the step asks for, the
+    context it is given, and the model and voting settings. The step number, title
+    and output variable are left out, so the same step in another plan still hits."""
+    settings = asdict(config)
+    key = {
+        "task_type": step.task_type,
+        "task_description": step.task_description,
+        "primary_tools": step.primary_tools,
+        "fallback_tools": step.fallback_tools,
+        "primary_tool_instructions": step.primary_tool_instructions,
+        "fallback_tool_instructions": step.fallback_tool_instructions,
+        "output_schema": step.output_schema,
+        "context": context,
+        "config": {name: settings[name] for name in VOTE_CONFIG_FIELDS},
+    }
+    encoded = json.dumps(key, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class StepCache:
+    """Vote results of finished steps, one JSON file per step_fingerprint.
+
+    Shared by every task using the same directory. Reading an entry refreshes its
+    mtime, and once the directory holds more than max_bytes the least recently used
+    entries are deleted. Only use it for steps without side effects: a hit returns
+    the stored winner without running any agent.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls, config: TaskConfig) -> "StepCache | None":
+        if config.step_cache_dir is None:
+            return None
+        return cls(config.step_cache_dir, int(config.step_cache_max_mb * 1024 * 1024))
+
+    def get(self, key: str) -> VoteResult | None:
+        """The stored vote, costing nothing this time, or None."""
+        entry = self._entry(key)
+        try:
+            with open(entry) as f:
+                data = json.load(f)
+            os.utime(entry)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return replace(VoteResult(**data), cost_usd=0.0)
+
+    def put(self, key: str, vote_result: VoteResult) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        entry = self._entry(key)
+        data = asdict(replace(vote_result, samples=[]))
+        with open(f"{entry}.tmp", "w") as f:
+            json.dump(data, f, default=str)
+        os.replace(f"{entry}.tmp", entry)
+        self._evict()
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.json")
+
+    def _evict(self) -> None:
+        entries = []
+        for name in os.listdir(self.path):
+            if name.endswith(".json"):
+                stat = os.stat(os.path.join(self.path, name))
+                entries.append((stat.st_mtime_ns, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.path, name))
+            total -= size
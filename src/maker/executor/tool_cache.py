@@ -0,0 +1,113 @@
+import json
+from typing import Any
+import claude_agent_sdk as sdk
+
+# Tools whose results depend only on their input and the files they read.
+READ_ONLY_TOOLS = frozenset({"Read", "Glob", "Grep", "LS", "WebFetch", "WebSearch"})
+WEB_TOOLS = frozenset({"WebFetch", "WebSearch"})
+# Tools that write the path named in their input.
+WRITE_TOOLS = {"Write": "file_path", "Edit": "file_path", "MultiEdit": "file_path",
+               "NotebookEdit": "notebook_path"}
+
+
+class ToolCache:
+    """Results of read-only tool calls, shared by the samples of a step (or a task).
+
+    Installed as SDK hooks: PostToolUse records results, and PreToolUse answers an
+    identical call from memory by denying it with the cached result as the reason,
+    so the tool never runs. A file written by any sample is never served from cache
+    again, and neither are listings or searches once anything was written. Bash can
+    touch anything, so after a Bash call only web results are served.
+
+    File results are keyed by the sample's working directory (the hook input's cwd)
+    as well, since their paths point into it: samples in separate workspaces never
+    see each other's results.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self._max_entries = max_entries
+        self._entries: dict[str, str] = {}
+        self._dirty_paths: set[str] = set()
+        self._files_dirty = False
+        self._listings_dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def hooks(self) -> dict:
+        return {
+            "PreToolUse": [sdk.HookMatcher(hooks=[self._pre_tool_use])],
+            "PostToolUse": [sdk.HookMatcher(hooks=[self._post_tool_use])],
+        }
+
+    def get(self, tool_name: str, tool_input: dict, cwd: str | None = None) -> str | None:
+        if not self._cacheable(tool_name, tool_input):
+            return None
+        cached = self._entries.get(_key(tool_name, tool_input, cwd))
+        if cached is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return cached
+
+    def put(self, tool_name: str, tool_input: dict, response: Any, cwd: str | None = None) -> None:
+        if not self._cacheable(tool_name, tool_input) or len(self._entries) >= self._max_entries:
+            return
+        text = response if isinstance(response, str) else json.dumps(response, default=str)
+        self._entries[_key(tool_name, tool_input, cwd)] = text
+
+    def record_write(self, tool_name: str, tool_input: dict) -> None:
+        """Stop serving anything a write may have changed."""
+        if tool_name == "Bash":
+            self._files_dirty = True
+        elif tool_name in WRITE_TOOLS:
+            path = tool_input.get(WRITE_TOOLS[tool_name])
+            if path:
+                self._dirty_paths.add(path)
+            # Listings and searches may include the written file
+            self._listings_dirty = True
+
+    def invalidate_files(self) -> None:
+        """Forget every file result, e.g. after files changed behind the hooks' back
+        (a sample workspace committed to the real directory). Web results stay."""
+        self._entries = {key: text for key, text in self._entries.items()
+                         if json.loads(key)[0] in WEB_TOOLS}
+
+    def _cacheable(self, tool_name: str, tool_input: dict) -> bool:
+        if tool_name not in READ_ONLY_TOOLS:
+            return False
+        if tool_name in WEB_TOOLS:
+            return True
+        if self._files_dirty:
+            return False
+        if tool_name != "Read":
+            return not self._listings_dirty
+        return tool_input.get("file_path") not in self._dirty_paths
+
+    async def _pre_tool_use(self, input_data, tool_use_id, context) -> dict:
+        cached = self.get(input_data["tool_name"], input_data["tool_input"], input_data.get("cwd"))
+        if cached is None:
+            return {}
+        return {
+            "hookSpecificOutput": {
+                "hookEventName": "PreToolUse",
+                "permissionDecision": "deny",
+                "permissionDecisionReason": (
+                    f"Not run: an identical {input_data['tool_name']} call was already made. "
+                    f"Its result was:\n{cached}"
+                ),
+            }
+        }
+
+    async def _post_tool_use(self, input_data, tool_use_id, context) -> dict:
+        tool_name, tool_input = input_data["tool_name"], input_data["tool_input"]
+        if tool_name in READ_ONLY_TOOLS:
+            self.put(tool_name, tool_input, input_data.get("tool_response"), input_data.get("cwd"))
+        else:
+            self.record_write(tool_name, tool_input)
+        return {}
+
+
+def _key(tool_name: str, tool_input: dict, cwd: str | None) -> str:
+    # Web results don't depend on the working directory
+    root = None if tool_name in WEB_TOOLS else cwd
+    return json.dumps([tool_name, root, tool_input], sort_keys=True, default=str)
@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+from maker.core.models import PlanStep
+
+# Builtin tools that can change files; samples using them must not share a directory.
+SIDE_EFFECT_TOOLS = frozenset({"Write", "Edit", "MultiEdit", "NotebookEdit", "Bash"})
+
+# Not copied into sample workspaces (and so never committed back).
+IGNORED = (".git",)
+
+
+def has_side_effects(step: PlanStep) -> bool:
+    return not SIDE_EFFECT_TOOLS.isdisjoint([*step.primary_tools, *step.fallback_tools])
+
+
+class SampleWorkspace:
+    """Private copy of the project directory for one voting sample.
+
+    The copy keeps file mtimes, so changes are found by comparing (size, mtime)
+    with the snapshot taken at copy time, without reading file contents.
+    commit() applies the sample's writes and deletes to the real directory.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self.path = tempfile.mkdtemp(prefix="maker-sample-")
+        shutil.copytree(self.root, self.path, symlinks=True, dirs_exist_ok=True,
+                        ignore=shutil.ignore_patterns(*IGNORED))
+        self._snapshot = _stat_tree(self.path)
+
+    def changes(self) -> tuple[list[str], list[str]]:
+        """(written, deleted) paths relative to the workspace root."""
+        current = _stat_tree(self.path)
+        written = sorted(rel for rel, stat in current.items() if self._snapshot.get(rel) != stat)
+        deleted = sorted(rel for rel in self._snapshot if rel not in current)
+        return written, deleted
+
+    def commit(self) -> list[str]:
+        """Apply this sample's changes to the real directory. Returns the paths changed."""
+        written, deleted = self.changes()
+        for rel in written:
+            target = os.path.join(self.root, rel)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copy2(os.path.join(self.path, rel), target, follow_symlinks=False)
+        for rel in deleted:
+            target = os.path.join(self.root, rel)
+            if os.path.lexists(target):
+                os.remove(target)
+        return written + deleted
+
+    def cleanup(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def _stat_tree(root: str) -> dict[str, tuple[int, int]]:
+    stats = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in IGNORED]
+        for name in filenames:
+            full = os.path.join(dirpath, name)
+            stat = os.lstat(full)
+            stats[os.path.relpath(full, root)] = (stat.st_size, stat.st_mtime_ns)
+    return stats
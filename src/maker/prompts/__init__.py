@@ -2,6 +2,7 @@ from maker.prompts.planner_system import PLANNER_SYSTEM_PROMPT
 from maker.prompts.planner_user import PLANNER_USER_PROMPT
 from maker.prompts.yaml_fixer import YAML_FIXER_PROMPT
 from maker.prompts.executor_step import EXECUTOR_STEP_PROMPT
+from maker.prompts.context_summary import CONTEXT_SUMMARY_PROMPT
 from maker.prompts.quality_single_purpose import QUALITY_SINGLE_PURPOSE_PROMPT
 from maker.prompts.quality_self_contained import QUALITY_SELF_CONTAINED_PROMPT
 from maker.prompts.quality_max_k_tools import QUALITY_MAX_K_TOOLS_PROMPT
@@ -14,6 +15,7 @@ _PROMPTS = {
     "planner_user": PLANNER_USER_PROMPT,
     "yaml_fixer": YAML_FIXER_PROMPT,
     "executor_step": EXECUTOR_STEP_PROMPT,
+    "context_summary": CONTEXT_SUMMARY_PROMPT,
     "quality_single_purpose": QUALITY_SINGLE_PURPOSE_PROMPT,
     "quality_self_contained": QUALITY_SELF_CONTAINED_PROMPT,
     "quality_max_k_tools": QUALITY_MAX_K_TOOLS_PROMPT,
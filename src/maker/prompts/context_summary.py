@@ -0,0 +1,12 @@
+CONTEXT_SUMMARY_PROMPT = """You are condensing the output of an earlier step so a later step can use it. The later step will see only your summary.
+
+Rules:
+- Stay within about {max_tokens} tokens
+- Keep every identifier, name, path, number, and date that a later step could need
+- Drop repetition, boilerplate, and formatting
+- Output the summary only, with no preamble
+
+Output of `{variable}`:
+{value}
+
+Summary:"""
@@ -1,16 +1,41 @@
-from maker.core.models import AgentResult
+from maker.core.models import AgentResult, PlanStep, TaskConfig
+from maker.red_flag.rules import RULES, DEFAULT_RULES, agent_error
 
 
 class RedFlagger:
-    def check(self, result: AgentResult) -> bool:
+    """Applies red-flag rules (see red_flag.rules) in order; the first hit discards
+    the sample. Results with an error (a failed or aborted sample) are always
+    discarded, whether or not agent_error is among the rules."""
+
+    def __init__(self, rules: list[str] | None = None, config: TaskConfig | None = None):
+        names = DEFAULT_RULES if rules is None else rules
+        unknown = [name for name in names if name not in RULES]
+        if unknown:
+            raise ValueError(f"Unknown red-flag rules {unknown}; available: {sorted(RULES)}")
+        self._rules = [(name, RULES[name]) for name in names]
+        self._config = config
+
+    @classmethod
+    def from_config(cls, config: TaskConfig) -> "RedFlagger":
+        return cls(config.red_flag_rules, config)
+
+    def check(self, result: AgentResult, step: PlanStep | None = None) -> bool:
         """Returns True if the result should be discarded (red-flagged)."""
-        flagged, _ = self.check_with_reason(result)
+        flagged, _ = self.check_with_reason(result, step)
         return flagged
 
-    def check_with_reason(self, result: AgentResult) -> tuple[bool, str]:
+    def check_with_reason(self, result: AgentResult, step: PlanStep | None = None) -> tuple[bool, str]:
         """Returns (is_flagged, reason)."""
+        rule, reason = self.check_rule(result, step)
+        return rule is not None, reason
+
+    def check_rule(self, result: AgentResult, step: PlanStep | None = None) -> tuple[str | None, str]:
+        """Returns (name of the rule that fired, reason), or (None, "").
+        A sample aborted by a stream limit is reported as stream_limit."""
         if result.error:
-            return True, f"Agent error: {result.error}"
-        if not isinstance(result.output, dict):
-            return True, f"Output is not a dict (got {type(result.output).__name__})"
-        return False, ""
+            return ("stream_limit" if result.aborted else "agent_error"), agent_error(result, step, self._config)
+        for name, rule in self._rules:
+            reason = rule(result, step, self._config)
+            if reason:
+                return name, reason
+        return None, ""
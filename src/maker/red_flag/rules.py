@@ -0,0 +1,64 @@
+from typing import Callable
+from maker.core.models import AgentResult, PlanStep, TaskConfig
+from maker.core.schema import parse_output_schema
+
+# A rule returns the reason a sample should be discarded, or None to let it through.
+# Rules see the step when the caller has one; rules that need it pass without it.
+Rule = Callable[[AgentResult, PlanStep | None, TaskConfig | None], str | None]
+
+
+def agent_error(result: AgentResult, step, config) -> str | None:
+    if result.error:
+        return f"Agent error: {result.error}"
+    return None
+
+
+def not_dict(result: AgentResult, step, config) -> str | None:
+    if not isinstance(result.output, dict):
+        return f"Output is not a dict (got {type(result.output).__name__})"
+    return None
+
+
+def missing_fields(result: AgentResult, step, config) -> str | None:
+    """Output lacks a field named in the step's output_schema."""
+    if step is None or not isinstance(result.output, dict):
+        return None
+    fields = ["next_step"] if step.task_type == "conditional_step" else parse_output_schema(step.output_schema)
+    missing = [f for f in fields if f not in result.output]
+    if missing:
+        return f"Output missing schema fields {missing}"
+    return None
+
+
+def repaired(result: AgentResult, step, config) -> str | None:
+    if result.was_repaired:
+        return "Output needed YAML repair"
+    return None
+
+
+def raw_size(result: AgentResult, step, config) -> str | None:
+    limit = config.red_flag_max_raw_chars if config else None
+    if limit is not None and len(result.raw_response) > limit:
+        return f"Raw response is {len(result.raw_response)} chars (limit {limit})"
+    return None
+
+
+def error_object(result: AgentResult, step, config) -> str | None:
+    """Output is only the {error: ...} object the step prompt asks for on failure."""
+    if not isinstance(result.output, dict) or set(result.output) != {"error"}:
+        return None
+    if step is not None and "error" in parse_output_schema(step.output_schema):
+        return None
+    return f"Agent reported failure: {result.output['error']}"
+
+
+RULES: dict[str, Rule] = {
+    "agent_error": agent_error,
+    "not_dict": not_dict,
+    "missing_fields": missing_fields,
+    "repaired": repaired,
+    "raw_size": raw_size,
+    "error_object": error_object,
+}
+
+DEFAULT_RULES = ["agent_error", "not_dict"]
@@ -0,0 +1,55 @@
+import time
+from maker.core.models import TaskConfig
+
+
+class StreamMonitor:
+    """Red-flag rules applied to an agent's message stream as it arrives.
+
+    Samples that run too long, take too many turns or call too many tools are
+    discarded by voting anyway, so the runner aborts them as soon as a limit is
+    crossed instead of paying for the rest of the stream. A limit of None is off.
+    """
+
+    def __init__(self, max_output_chars: int | None = None, max_turns: int | None = None,
+                 max_tool_calls: int | None = None, max_seconds: float | None = None):
+        self.max_output_chars = max_output_chars
+        self.max_turns = max_turns
+        self.max_tool_calls = max_tool_calls
+        self.max_seconds = max_seconds
+        self.output_chars = 0
+        self.turns = 0
+        self.tool_calls = 0
+        self._start = time.monotonic()
+
+    @classmethod
+    def from_config(cls, config: TaskConfig) -> "StreamMonitor":
+        return cls(
+            max_output_chars=config.red_flag_max_output_chars,
+            max_turns=config.red_flag_max_turns,
+            max_tool_calls=config.red_flag_max_tool_calls,
+            max_seconds=config.red_flag_max_seconds,
+        )
+
+    def observe(self, msg) -> str | None:
+        """Account for one streamed message. Returns the reason if a limit is crossed."""
+        if type(msg).__name__ == "AssistantMessage":
+            self.turns += 1
+            for block in msg.content:
+                block_type = type(block).__name__
+                if block_type == "TextBlock":
+                    self.output_chars += len(block.text)
+                elif block_type == "ToolUseBlock":
+                    self.tool_calls += 1
+
+        if self.max_output_chars is not None and self.output_chars > self.max_output_chars:
+            return f"output exceeded {self.max_output_chars} chars"
+        if self.max_turns is not None and self.turns > self.max_turns:
+            return f"exceeded {self.max_turns} turns"
+        if self.max_tool_calls is not None and self.tool_calls > self.max_tool_calls:
+            return f"exceeded {self.max_tool_calls} tool calls"
+        if self.max_seconds is not None and time.monotonic() - self._start > self.max_seconds:
+            return self.timeout_reason()
+        return None
+
+    def timeout_reason(self) -> str:
+        return f"ran longer than {self.max_seconds}s"
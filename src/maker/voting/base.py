@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
-from maker.core.models import PlanStep, VoteResult, TaskConfig
+from maker.core.models import PlanStep, VoteResult, TaskConfig, AgentResult
 from maker.executor.agent_runner import AgentRunner
+from maker.voting.declared_error import DeclaredErrorTracker
+from maker.voting.trace import VoteTrace
 
 
 class Voter(ABC):
@@ -8,3 +10,17 @@ class Voter(ABC):
     async def vote(self, step: PlanStep, context: str, config: TaskConfig) -> VoteResult:
         """Run agent(s) and return the winning output."""
         ...
+
+    def _discard_reason(self, result: AgentResult, step: PlanStep,
+                        declared: DeclaredErrorTracker, trace: VoteTrace) -> str | None:
+        """Why result must not vote (a declared error or red-flagged), else None.
+        Declared errors are checked first, so a rule such as error_object cannot
+        hide them from fail-fast. Red-flag hits are counted per rule in trace.
+        Voters keep their RedFlagger as self._red_flagger."""
+        if declared.observe(result.output):
+            return f"Agent declared error: {result.output['error']}"
+        rule, reason = self._red_flagger.check_rule(result, step)
+        if rule is not None:
+            trace.red_flag_hits[rule] = trace.red_flag_hits.get(rule, 0) + 1
+            return reason
+        return None
@@ -0,0 +1,77 @@
+import math
+from maker.core.models import TaskConfig
+
+
+def min_samples(config: TaskConfig) -> int:
+    """Fewest samples a step can be decided with under config's voting strategy."""
+    if config.voting_strategy == "majority":
+        return max(1, config.voting_n)
+    if config.voting_strategy in ("first_to_k", "fieldwise"):
+        return max(1, config.voting_k)
+    if config.voting_strategy == "sequential":
+        # Unanimous samples needed before the posterior reaches voting_confidence
+        c, p = config.voting_confidence, config.voting_prior_accuracy
+        if not (0 < c < 1 and 0.5 < p < 1):
+            return 1
+        return max(1, math.ceil(math.log(c / (1 - c)) / math.log(p / (1 - p)) - 1e-9))
+    return 1
+
+
+class SampleBudget:
+    """Per-task sample and cost budget shared by all steps.
+
+    Each step may spend whatever the budget has left after reserving the minimum
+    samples for every step still to run. Steps that agree on the first K spend
+    little, which leaves more for contested steps later on. When a budget is set,
+    it replaces max_voting_samples as the per-step limit.
+
+    The cost budget is turned into a sample count using the average cost per sample
+    seen so far, so it only takes effect after the first step.
+
+    Steps running at the same time reserve their cap while they vote, so their caps
+    together never exceed the budget; release() returns the reservation when they finish.
+    """
+
+    def __init__(self, max_samples: int | None = None, max_cost_usd: float | None = None):
+        self.max_samples = max_samples
+        self.max_cost_usd = max_cost_usd
+        self.samples_spent = 0
+        self.cost_spent_usd = 0.0
+        self.reserved = 0  # samples held by steps still voting
+
+    @classmethod
+    def from_config(cls, config: TaskConfig) -> "SampleBudget | None":
+        if config.task_sample_budget is None and config.task_cost_budget_usd is None:
+            return None
+        return cls(config.task_sample_budget, config.task_cost_budget_usd)
+
+    def remaining(self) -> int | None:
+        """Samples left in the budget and not reserved, or None if unlimited so far."""
+        limits = []
+        if self.max_samples is not None:
+            limits.append(self.max_samples - self.samples_spent)
+        if self.max_cost_usd is not None and self.samples_spent and self.cost_spent_usd > 0:
+            per_sample = self.cost_spent_usd / self.samples_spent
+            limits.append(int((self.max_cost_usd - self.cost_spent_usd) / per_sample + 1e-9))
+        return max(0, min(limits) - self.reserved) if limits else None
+
+    def step_cap(self, config: TaskConfig, steps_left: int) -> int:
+        """Sample cap for the next step, with steps_left counting that step.
+        Returns 0 when the budget cannot pay for even one decided step."""
+        remaining = self.remaining()
+        if remaining is None:
+            return config.max_voting_samples
+        floor = min_samples(config)
+        if remaining < floor:
+            return 0
+        return max(floor, remaining - floor * max(0, steps_left - 1))
+
+    def reserve(self, samples: int) -> None:
+        self.reserved += samples
+
+    def release(self, samples: int) -> None:
+        self.reserved -= samples
+
+    def record(self, samples: int, cost_usd: float) -> None:
+        self.samples_spent += samples
+        self.cost_spent_usd += cost_usd
@@ -1,5 +1,15 @@
 import json
 import hashlib
+import re
+import unicodedata
+from maker.core.models import PlanStep, TaskConfig, NormalizationConfig
+from maker.core.schema import parse_output_schema
+from maker.voting.similarity import SimilarityClusterer
+
+# Plain decimals only: leading zeros ("007", ZIP codes) and exponent forms ("2e5",
+# hex IDs) mean the string is an identifier, not a number
+_NUMBER = re.compile(r"-?(0|[1-9]\d*)(\.\d+)?")
+_UNORDERED_TYPE = re.compile(r"^(set|unordered)\b", re.IGNORECASE)
 
 
 class Canonicalizer:
@@ -13,6 +23,100 @@ class Canonicalizer:
         canonical = self.canonicalize(data)
         return hashlib.sha256(canonical.encode()).hexdigest()[:16]
 
+    def vote_hash(self, data: dict, step: PlanStep, config: TaskConfig) -> str:
+        """Hash used to group votes for a step.
+
+        With config.project_votes_to_schema, the output is first projected down to the
+        fields named in step.output_schema (only next_step for conditional steps), so
+        extra commentary keys don't split votes. It is then normalized according to
+        config.normalization, so near-identical outputs (trailing newline, 1.0 vs 1)
+        land on the same hash.
+        """
+        return self.hash(self.vote_data(data, step, config))
+
+    def clusterer(self, step: PlanStep, config: TaskConfig) -> SimilarityClusterer | None:
+        """Similarity clusterer for one vote, or None unless
+        config.voting_similarity_threshold is set."""
+        if config.voting_similarity_threshold is None:
+            return None
+        return SimilarityClusterer(
+            threshold=config.voting_similarity_threshold,
+            shingle_size=config.voting_shingle_size,
+            prepare=lambda output: self.vote_data(output, step, config),
+        )
+
+    def vote_data(self, data: dict, step: PlanStep, config: TaskConfig) -> dict:
+        """The projected, normalized form of data that vote_hash hashes."""
+        if config.project_votes_to_schema:
+            data = self.project(data, step)
+        return self.normalize(data, config.normalization, self._unordered_fields(step))
+
+    def project(self, data: dict, step: PlanStep) -> dict:
+        """Keep only the fields of data that the step's output schema names.
+        Falls back to the whole dict if none of them are present."""
+        if step.task_type == "conditional_step":
+            fields = ["next_step"]
+        else:
+            fields = parse_output_schema(step.output_schema)
+        projected = {k: data[k] for k in fields if k in data}
+        return projected or data
+
+    def normalize(self, data: dict, options: NormalizationConfig,
+                  unordered_fields: frozenset[str] = frozenset()) -> dict:
+        """Apply options to every value in data. Top-level fields named in
+        unordered_fields have their lists sorted even if options.unordered_lists is off."""
+        return {
+            k: self._normalize_value(v, options, options.unordered_lists or k in unordered_fields)
+            for k, v in data.items()
+        }
+
+    def _normalize_value(self, value, options: NormalizationConfig, sort_lists: bool):
+        if isinstance(value, dict):
+            return {k: self._normalize_value(v, options, sort_lists) for k, v in value.items()}
+        if isinstance(value, list):
+            items = [self._normalize_value(v, options, sort_lists) for v in value]
+            if sort_lists:
+                items.sort(key=lambda v: json.dumps(v, sort_keys=True, default=str))
+            return items
+        if isinstance(value, bool) or value is None:
+            return value
+        if isinstance(value, (int, float)):
+            return self._normalize_number(value, options)
+        if isinstance(value, str):
+            return self._normalize_string(value, options)
+        return value
+
+    def _normalize_string(self, value: str, options: NormalizationConfig):
+        if options.unicode_nfc:
+            value = unicodedata.normalize("NFC", value)
+        if options.whitespace:
+            value = " ".join(value.split())
+        if options.numeric_strings and _NUMBER.fullmatch(value.strip()):
+            text = value.strip()
+            # Parse integers exactly so long numeric IDs don't collide through float
+            number = int(text) if text.lstrip("-").isdigit() else float(text)
+            return self._normalize_number(number, options)
+        if options.lowercase:
+            value = value.lower()
+        return value
+
+    def _normalize_number(self, value: int | float, options: NormalizationConfig):
+        if options.float_tolerance > 0:
+            value = round(value / options.float_tolerance) * options.float_tolerance
+        if isinstance(value, float) and value.is_integer() and abs(value) < 2**53:
+            return int(value)
+        if isinstance(value, float) and options.float_tolerance > 0:
+            # Strip float noise left over from bucketing (0.30000000000000004)
+            return float(f"{value:.12g}")
+        return value
+
+    def _unordered_fields(self, step: PlanStep) -> frozenset[str]:
+        """Top-level fields whose schema type says order doesn't matter (set[...])."""
+        return frozenset(
+            name for name, type_text in parse_output_schema(step.output_schema).items()
+            if _UNORDERED_TYPE.match(type_text)
+        )
+
     def _sort_keys_recursive(self, obj):
         """Recursively sort dict keys. Lists maintain order but dicts inside them are sorted."""
         if isinstance(obj, dict):
@@ -0,0 +1,64 @@
+import re
+from maker.core.models import PlanStep, TaskConfig
+from maker.core.schema import parse_output_schema
+
+# Checked in order; the first pattern that matches the agent's message wins.
+_CATEGORIES = [
+    ("tool_unavailable", re.compile(r"tool\b.*\b(not available|unavailable|not allowed)|no access to|cannot use", re.I)),
+    ("not_found", re.compile(r"not found|no such|does not exist|doesn't exist|\b404\b", re.I)),
+    ("permission", re.compile(r"permission|denied|forbidden|unauthori[sz]ed|\b40[13]\b", re.I)),
+    ("timeout", re.compile(r"timed? ?out", re.I)),
+    ("invalid_input", re.compile(r"invalid|malformed|cannot parse|could not parse|unexpected format|empty input", re.I)),
+]
+
+
+def classify_error(message: str) -> str:
+    """Coarse category of an agent-declared error message."""
+    for category, pattern in _CATEGORIES:
+        if pattern.search(message):
+            return category
+    return "unknown"
+
+
+class DeclaredStepError(RuntimeError):
+    """Enough samples declared the same kind of failure that the step cannot succeed
+    as planned. Raised by voters so the executor can fail over instead of sampling
+    to the cap. total_samples and cost_usd are what the vote spent before giving up."""
+
+    def __init__(self, step: int, category: str, message: str, samples: int,
+                 total_samples: int = 0, cost_usd: float = 0.0):
+        super().__init__(
+            f"Agents declared failure ({category}) in {samples} samples for step {step}: {message}"
+        )
+        self.step = step
+        self.category = category
+        self.message = message
+        self.samples = samples
+        self.total_samples = total_samples
+        self.cost_usd = cost_usd
+
+
+class DeclaredErrorTracker:
+    """Spots the {error: ...} object agents are told to return when they cannot finish.
+
+    Declared errors never vote. Once declared_error_threshold samples in the same
+    category have been seen, observe() raises DeclaredStepError. Steps whose
+    output_schema has its own error field are left alone.
+    """
+
+    def __init__(self, step: PlanStep, config: TaskConfig):
+        self._step = step
+        self._threshold = config.declared_error_threshold
+        self._enabled = self._threshold > 0 and "error" not in parse_output_schema(step.output_schema)
+        self.counts: dict[str, int] = {}
+
+    def observe(self, output: dict) -> bool:
+        """True if output is a declared error (and so must not vote)."""
+        if not self._enabled or not isinstance(output, dict) or set(output) != {"error"}:
+            return False
+        message = str(output["error"])
+        category = classify_error(message)
+        self.counts[category] = self.counts.get(category, 0) + 1
+        if self.counts[category] >= self._threshold:
+            raise DeclaredStepError(self._step.step, category, message, self.counts[category])
+        return True
@@ -2,6 +2,8 @@ from maker.voting.base import Voter
 from maker.voting.no_voter import NoVoter
 from maker.voting.majority_voter import MajorityVoter
 from maker.voting.first_to_k_voter import FirstToKVoter
+from maker.voting.sequential_voter import SequentialVoter
+from maker.voting.fieldwise_voter import FieldwiseVoter
 from maker.executor.agent_runner import AgentRunner
 from maker.red_flag.red_flagger import RedFlagger
 
@@ -13,5 +15,9 @@ def create_voter(strategy: str, runner: AgentRunner, red_flagger: RedFlagger) ->
         return MajorityVoter(runner=runner, red_flagger=red_flagger)
     elif strategy == "first_to_k":
         return FirstToKVoter(runner=runner, red_flagger=red_flagger)
+    elif strategy == "sequential":
+        return SequentialVoter(runner=runner, red_flagger=red_flagger)
+    elif strategy == "fieldwise":
+        return FieldwiseVoter(runner=runner, red_flagger=red_flagger)
     else:
         raise ValueError(f"Unknown voting strategy: {strategy}")
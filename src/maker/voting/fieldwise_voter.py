@@ -0,0 +1,137 @@
+from maker.voting.base import Voter
+from maker.core.models import PlanStep, VoteResult, TaskConfig
+from maker.core.schema import parse_output_schema
+from maker.executor.agent_runner import AgentRunner
+from maker.red_flag.red_flagger import RedFlagger
+from maker.voting.canonicalizer import Canonicalizer
+from maker.voting.declared_error import DeclaredErrorTracker
+from maker.voting.weights import keeps_cheap_votes, sample_weight
+from maker.voting.trace import VoteTrace, entropy
+from maker.voting.sampler import SamplePool, LatencyTracker
+from maker.voting.tally import VoteTally
+
+_ABSENT = "absent"
+
+
+class FieldwiseVoter(Voter):
+    """First-to-K per top-level output field.
+
+    Every valid sample votes on each field that hasn't locked yet. A field locks once
+    its leading value is K votes ahead of the runner-up, so fields that agree stop
+    costing anything while contested ones keep sampling. The winner is assembled from
+    the per-field winners. With a cascade model, the vote escalates when the
+    least-agreeing open field stays below cascade_agreement.
+    """
+
+    def __init__(self, runner: AgentRunner, red_flagger: RedFlagger):
+        self._runner = runner
+        self._red_flagger = red_flagger
+        self._canonicalizer = Canonicalizer()
+        self._latencies = LatencyTracker()
+
+    async def vote(self, step: PlanStep, context: str, config: TaskConfig) -> VoteResult:
+        """Keep voting_window agents in flight. Done when every field has a K-lead.
+        Fields come from output_schema (next_step for conditional steps); without a
+        parseable schema, every key seen in a valid sample is a field.
+        Fail if max_voting_samples reached."""
+        fields = self._fields(step)
+        tallies: dict[str, VoteTally] = {f: VoteTally() for f in fields}
+        locked: set[str] = set()
+        valid = 0
+        red_flagged = 0
+        declared = DeclaredErrorTracker(step, config)
+        trace = VoteTrace()
+
+        async with SamplePool(self._runner, step, context, config, self._latencies) as pool:
+            pool.launch(min(max(1, config.voting_window), config.max_voting_samples))
+
+            while pool.in_flight:
+                result = await pool.next_result()
+
+                reason = self._discard_reason(result, step, declared, trace)
+                if reason:
+                    red_flagged += 1
+                    trace.record(result, reason)
+                else:
+                    data = self._canonicalizer.vote_data(result.output, step, config)
+                    if not fields:
+                        self._add_new_fields(tallies, data, valid)
+                    valid += 1
+                    weight = sample_weight(result, config)
+
+                    for name, tally in tallies.items():
+                        if name in locked:
+                            continue
+                        key = self._canonicalizer.hash({name: data[name]}) if name in data else _ABSENT
+                        tally.add(key, result.output, weight)
+                        if tally.margin >= config.voting_k:
+                            locked.add(name)
+                    trace.record(result, tally={
+                        f"{name}:{key}": count
+                        for name, tally in tallies.items() for key, count in tally.counts().items()
+                    })
+
+                    if len(locked) == len(tallies):
+                        await pool.cancel_all()
+                        winner = self._assemble(tallies)
+                        canonical_hash = self._canonicalizer.hash(winner)
+                        await pool.commit(winner)
+                        return VoteResult(
+                            winner=winner,
+                            canonical_hash=canonical_hash,
+                            total_samples=pool.completed,
+                            red_flagged=red_flagged,
+                            vote_counts={
+                                canonical_hash: min((t.leader_count for t in tallies.values()), default=valid),
+                            },
+                            cancelled=pool.cancelled,
+                            samples_by_model=pool.samples_by_model(),
+                            hedged=pool.hedged,
+                            cost_usd=pool.cost_usd,
+                            samples=trace.samples,
+                            red_flag_hits=trace.red_flag_hits,
+                            agreement_entropy=max((entropy(t.counts()) for t in tallies.values()), default=0.0),
+                            decision_ms=trace.elapsed_ms(),
+                            field_votes={name: t.counts() for name, t in tallies.items()},
+                        )
+
+                # Cascade on the least-agreeing field still open
+                unlocked = [tally for name, tally in tallies.items() if name not in locked]
+                weakest = min(unlocked, key=lambda t: t.leader_count / t.weight if t.weight else 0.0,
+                              default=VoteTally())
+                if pool.should_escalate(weakest, red_flagged):
+                    await pool.escalate()
+                    if not keeps_cheap_votes(config):
+                        tallies = {f: VoteTally() for f in fields}
+                        locked = set()
+                        valid = 0
+                    pool.launch(min(max(1, config.voting_window), config.max_voting_samples - pool.launched))
+                elif pool.launched < config.max_voting_samples:
+                    pool.launch(1)
+
+        unlocked = [name for name in tallies if name not in locked]
+        raise RuntimeError(
+            f"Reached max_voting_samples ({config.max_voting_samples}) without "
+            f"K={config.voting_k} lead on fields {unlocked} for step {step.step}"
+        )
+
+    def _fields(self, step: PlanStep) -> list[str]:
+        if step.task_type == "conditional_step":
+            return ["next_step"]
+        return list(parse_output_schema(step.output_schema))
+
+    def _add_new_fields(self, tallies: dict[str, VoteTally], data: dict, valid: int) -> None:
+        """A field first seen now was absent from every earlier valid sample."""
+        for name in data:
+            if name not in tallies:
+                tally = VoteTally()
+                for _ in range(valid):
+                    tally.add(_ABSENT, {})
+                tallies[name] = tally
+
+    def _assemble(self, tallies: dict[str, VoteTally]) -> dict:
+        winner = {}
+        for name, tally in tallies.items():
+            if tally.leader != _ABSENT:
+                winner[name] = tally.output(tally.leader)[name]
+        return winner
@@ -1,9 +1,13 @@
-from collections import Counter
 from maker.voting.base import Voter
 from maker.core.models import PlanStep, VoteResult, TaskConfig
 from maker.executor.agent_runner import AgentRunner
 from maker.red_flag.red_flagger import RedFlagger
 from maker.voting.canonicalizer import Canonicalizer
+from maker.voting.declared_error import DeclaredErrorTracker
+from maker.voting.weights import keeps_cheap_votes, sample_weight
+from maker.voting.trace import VoteTrace, entropy
+from maker.voting.sampler import SamplePool, LatencyTracker
+from maker.voting.tally import VoteTally
 
 
 class FirstToKVoter(Voter):
@@ -13,42 +17,65 @@ class FirstToKVoter(Voter):
         self._runner = runner
         self._red_flagger = red_flagger
         self._canonicalizer = Canonicalizer()
+        self._latencies = LatencyTracker()
 
     async def vote(self, step: PlanStep, context: str, config: TaskConfig) -> VoteResult:
-        """Run agents one at a time. Track vote counts per canonical hash.
-        Winner when leader_count - runner_up_count >= K.
+        """Keep voting_window agents in flight (one at a time by default).
+        Track vote counts per canonical hash.
+        Winner when leader_count - runner_up_count >= K; samples still in flight
+        are cancelled and reported separately.
         Fail if max_voting_samples reached."""
-        vote_counts: Counter[str] = Counter()
-        hash_to_output: dict[str, dict] = {}
-        total_samples = 0
+        tally = VoteTally(self._canonicalizer.clusterer(step, config))
         red_flagged = 0
+        declared = DeclaredErrorTracker(step, config)
+        trace = VoteTrace()
 
-        while total_samples < config.max_voting_samples:
-            result = await self._runner.run(step, context, config)
-            total_samples += 1
-
-            if self._red_flagger.check(result):
-                red_flagged += 1
-                continue
-
-            h = self._canonicalizer.hash(result.output)
-            vote_counts[h] += 1
-            if h not in hash_to_output:
-                hash_to_output[h] = result.output
-
-            # Check if leader is ahead by K
-            ranked = vote_counts.most_common()
-            leader_hash, leader_count = ranked[0]
-            runner_up_count = ranked[1][1] if len(ranked) > 1 else 0
-
-            if leader_count - runner_up_count >= config.voting_k:
-                return VoteResult(
-                    winner=hash_to_output[leader_hash],
-                    canonical_hash=leader_hash,
-                    total_samples=total_samples,
-                    red_flagged=red_flagged,
-                    vote_counts=dict(vote_counts),
-                )
+        async with SamplePool(self._runner, step, context, config, self._latencies) as pool:
+            pool.launch(min(max(1, config.voting_window), config.max_voting_samples))
+
+            while pool.in_flight:
+                result = await pool.next_result()
+
+                reason = self._discard_reason(result, step, declared, trace)
+                if reason:
+                    red_flagged += 1
+                    trace.record(result, reason)
+                else:
+                    h = self._canonicalizer.vote_hash(result.output, step, config)
+                    tally.add(h, result.output, sample_weight(result, config))
+                    trace.record(result, tally=tally.counts())
+
+                    # Check if leader is ahead by K
+                    if tally.margin >= config.voting_k:
+                        await pool.cancel_all()
+                        winner = tally.output(tally.leader)
+                        await pool.commit(winner)
+                        return VoteResult(
+                            winner=winner,
+                            canonical_hash=tally.leader,
+                            total_samples=pool.completed,
+                            red_flagged=red_flagged,
+                            vote_counts=tally.counts(),
+                            cancelled=pool.cancelled,
+                            samples_by_model=pool.samples_by_model(),
+                            hedged=pool.hedged,
+                            cost_usd=pool.cost_usd,
+                            samples=trace.samples,
+                            red_flag_hits=trace.red_flag_hits,
+                            agreement_entropy=entropy(tally.counts()),
+                            decision_ms=trace.elapsed_ms(),
+                        )
+
+                if pool.should_escalate(tally, red_flagged):
+                    await pool.escalate()
+                    if not keeps_cheap_votes(config):
+                        tally = VoteTally(self._canonicalizer.clusterer(step, config))
+
+                # Refill the window
+                pool.launch(max(0, min(
+                    max(1, config.voting_window) - pool.in_flight,
+                    config.max_voting_samples - pool.launched,
+                )))
 
         raise RuntimeError(
             f"Reached max_voting_samples ({config.max_voting_samples}) without "
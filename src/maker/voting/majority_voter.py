@@ -1,9 +1,12 @@
-from collections import Counter
 from maker.voting.base import Voter
 from maker.core.models import PlanStep, VoteResult, TaskConfig
 from maker.executor.agent_runner import AgentRunner
 from maker.red_flag.red_flagger import RedFlagger
 from maker.voting.canonicalizer import Canonicalizer
+from maker.voting.declared_error import DeclaredErrorTracker
+from maker.voting.trace import VoteTrace, entropy
+from maker.voting.sampler import SamplePool, LatencyTracker
+from maker.voting.tally import VoteTally
 
 
 class MajorityVoter(Voter):
@@ -11,41 +14,95 @@ class MajorityVoter(Voter):
         self._runner = runner
         self._red_flagger = red_flagger
         self._canonicalizer = Canonicalizer()
+        self._latencies = LatencyTracker()
 
     async def vote(self, step: PlanStep, context: str, config: TaskConfig) -> VoteResult:
-        """Run N agents, take majority. If no majority, run more up to max_voting_samples."""
-        vote_counts: Counter[str] = Counter()
-        hash_to_output: dict[str, dict] = {}
-        total_samples = 0
+        """Run N agents concurrently, take majority. If no majority, top up in
+        concurrent waves up to max_voting_samples.
+
+        After every sample, stop early if the leader can no longer lose the majority,
+        or if no answer can reach one within the remaining budget."""
+        tally = VoteTally(self._canonicalizer.clusterer(step, config))
         red_flagged = 0
+        declared = DeclaredErrorTracker(step, config)
+        trace = VoteTrace()
 
-        while total_samples < config.max_voting_samples:
-            result = await self._runner.run(step, context, config)
-            total_samples += 1
+        async with SamplePool(self._runner, step, context, config, self._latencies) as pool:
+            pool.launch(min(config.voting_n, config.max_voting_samples))
 
-            if self._red_flagger.check(result):
-                red_flagged += 1
-                continue
+            while pool.in_flight:
+                result = await pool.next_result()
 
-            h = self._canonicalizer.hash(result.output)
-            vote_counts[h] += 1
-            if h not in hash_to_output:
-                hash_to_output[h] = result.output
+                reason = self._discard_reason(result, step, declared, trace)
+                if reason:
+                    red_flagged += 1
+                    trace.record(result, reason)
+                else:
+                    h = self._canonicalizer.vote_hash(result.output, step, config)
+                    tally.add(h, result.output)
+                    trace.record(result, tally=tally.counts())
 
-            # Check for majority after collecting at least voting_n valid samples
-            valid_samples = sum(vote_counts.values())
-            if valid_samples >= config.voting_n:
-                leader_hash, leader_count = vote_counts.most_common(1)[0]
-                if leader_count > valid_samples / 2:
+                if self._clinched(tally, pool, config):
+                    await pool.cancel_all()
+                    winner = tally.output(tally.leader)
+                    await pool.commit(winner)
                     return VoteResult(
-                        winner=hash_to_output[leader_hash],
-                        canonical_hash=leader_hash,
-                        total_samples=total_samples,
+                        winner=winner,
+                        canonical_hash=tally.leader,
+                        total_samples=pool.completed,
                         red_flagged=red_flagged,
-                        vote_counts=dict(vote_counts),
+                        vote_counts=tally.counts(),
+                        cancelled=pool.cancelled,
+                        samples_by_model=pool.samples_by_model(),
+                        hedged=pool.hedged,
+                        cost_usd=pool.cost_usd,
+                        samples=trace.samples,
+                        red_flag_hits=trace.red_flag_hits,
+                        agreement_entropy=entropy(tally.counts()),
+                        decision_ms=trace.elapsed_ms(),
                     )
 
+                if pool.should_escalate(tally, red_flagged):
+                    await pool.escalate()
+                    tally = VoteTally(self._canonicalizer.clusterer(step, config))
+
+                if not self._reachable(tally, pool, config):
+                    await pool.cancel_all()
+                    raise RuntimeError(
+                        f"Stopped early: no majority possible within max_voting_samples "
+                        f"({config.max_voting_samples}) for step {step.step}"
+                    )
+
+                # Wave drained without a decision: top up
+                if not pool.in_flight:
+                    remaining = config.max_voting_samples - pool.launched
+                    pool.launch(min(remaining, self._wave_size(tally, config)))
+
         raise RuntimeError(
             f"Reached max_voting_samples ({config.max_voting_samples}) with no majority "
             f"for step {step.step}"
         )
+
+    def _clinched(self, tally: VoteTally, pool: SamplePool, config: TaskConfig) -> bool:
+        """Leader wins however the in-flight samples turn out. The vote is checked
+        once at least voting_n samples are valid, so the leader needs more than half
+        of voting_n, or of everything counted once this wave lands, whichever is larger."""
+        return tally.leader_count > max(config.voting_n, tally.total + pool.in_flight) / 2
+
+    def _reachable(self, tally: VoteTally, pool: SamplePool, config: TaskConfig) -> bool:
+        """Some answer can still get a majority if the leader wins every sample
+        that is in flight or left in the budget."""
+        left = config.max_voting_samples - pool.launched + pool.in_flight
+        return (
+            2 * tally.leader_count + left > tally.total
+            and tally.total + left >= config.voting_n
+        )
+
+    def _wave_size(self, tally: VoteTally, config: TaskConfig) -> int:
+        """Smallest top-up that could still produce a decision: enough to reach
+        voting_n valid samples, and enough for the leader to pass half if it wins them all."""
+        return max(
+            config.voting_n - tally.total,
+            tally.total - 2 * tally.leader_count + 1,
+            1,
+        )
@@ -3,6 +3,8 @@ from maker.core.models import PlanStep, VoteResult, TaskConfig
 from maker.executor.agent_runner import AgentRunner
 from maker.red_flag.red_flagger import RedFlagger
 from maker.voting.canonicalizer import Canonicalizer
+from maker.voting.declared_error import DeclaredErrorTracker, DeclaredStepError
+from maker.voting.trace import VoteTrace
 
 
 class NoVoter(Voter):
@@ -12,25 +14,42 @@ class NoVoter(Voter):
         self._canonicalizer = Canonicalizer()
 
     async def vote(self, step: PlanStep, context: str, config: TaskConfig) -> VoteResult:
-        """Run 1 agent with retries. No voting — just get one valid result."""
-        max_attempts = config.step_max_retries + 1
+        """Run 1 agent with retries. No voting — just get one valid result.
+        Attempts are capped by max_voting_samples too, so a task budget holds."""
+        max_attempts = min(config.step_max_retries + 1, config.max_voting_samples)
         total_samples = 0
         red_flagged = 0
+        declared = DeclaredErrorTracker(step, config)
+        trace = VoteTrace()
+        cost_usd = 0.0
 
         for _ in range(max_attempts):
             result = await self._runner.run(step, context, config)
             total_samples += 1
+            cost_usd += result.cost_usd
 
-            if self._red_flagger.check(result):
+            try:
+                reason = self._discard_reason(result, step, declared, trace)
+            except DeclaredStepError as e:
+                e.total_samples, e.cost_usd = total_samples, cost_usd
+                raise
+            if reason:
                 red_flagged += 1
+                trace.record(result, reason)
                 continue
 
+            h = self._canonicalizer.vote_hash(result.output, step, config)
+            trace.record(result, tally={h: 1})
             return VoteResult(
                 winner=result.output,
-                canonical_hash=self._canonicalizer.hash(result.output),
+                canonical_hash=h,
                 total_samples=total_samples,
                 red_flagged=red_flagged,
-                vote_counts={self._canonicalizer.hash(result.output): 1},
+                vote_counts={h: 1},
+                cost_usd=cost_usd,
+                samples=trace.samples,
+                red_flag_hits=trace.red_flag_hits,
+                decision_ms=trace.elapsed_ms(),
             )
 
         raise RuntimeError(
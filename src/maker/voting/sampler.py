@@ -0,0 +1,251 @@
+import asyncio
+import os
+from collections import deque
+from dataclasses import replace
+from maker.core.models import PlanStep, AgentResult, TaskConfig
+from maker.executor.agent_runner import AgentRunner
+from maker.executor.workspace import SampleWorkspace, has_side_effects
+from maker.voting.canonicalizer import Canonicalizer
+from maker.voting.declared_error import DeclaredStepError
+from maker.voting.tally import VoteTally
+
+
+class LatencyTracker:
+    """Rolling window of sample latencies per step type, used to pick hedge thresholds."""
+
+    MIN_HISTORY = 5
+
+    def __init__(self, window: int = 50):
+        self._window = window
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, key: str, ms: float) -> None:
+        self._samples.setdefault(key, deque(maxlen=self._window)).append(ms)
+
+    def quantile(self, key: str, q: float) -> float | None:
+        """q-quantile of recent latencies for key, or None with too little history."""
+        samples = self._samples.get(key)
+        if not samples or len(samples) < self.MIN_HISTORY:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class SamplePool:
+    """Runs agent samples for one step concurrently, capped by max_concurrent_samples.
+
+    Samples beyond the cap wait in a queue and are only started when the voter asks
+    for the next result, so a voter that decides early never pays for them.
+    Use as an async context manager: samples still in flight on exit are cancelled.
+
+    With config.cascade_model set, samples start on that cheap model and move to the
+    escalation model (config.escalation_model, else config.model) after escalate().
+
+    With config.hedge_max_per_step > 0, a sample that runs past the hedge threshold
+    (config.hedge_after_ms, else the rolling hedge_quantile latency for the step type)
+    gets a duplicate; whichever finishes first is used and the other is cancelled.
+
+    Steps with file-changing tools either run each sample in its own SampleWorkspace
+    (config.isolate_sample_workspaces), with the winner's changes applied by
+    commit(), or run their samples one at a time in the shared directory.
+    """
+
+    def __init__(self, runner: AgentRunner, step: PlanStep, context: str, config: TaskConfig,
+                 latencies: LatencyTracker | None = None):
+        self._runner = runner
+        self._step = step
+        self._context = context
+        self._config = config
+        side_effects = has_side_effects(step)
+        self._isolate = side_effects and config.isolate_sample_workspaces
+        self._serial = side_effects and not self._isolate
+        self._limit = 1 if self._serial else max(1, config.max_concurrent_samples)
+        self._workspaces: list[tuple[dict, SampleWorkspace]] = []  # (sample output, workspace)
+        self._pending: dict[asyncio.Task, tuple[int, str]] = {}
+        self._queued = 0
+        self._started = 0
+        self._by_model: dict[str, int] = {}
+        self._latencies = latencies or LatencyTracker()
+        self.hedged = 0  # duplicate samples started to cut tail latency
+        self.model = config.cascade_model or config.model
+        self.launched = 0  # samples requested, whether running or queued
+        self.cancelled = 0  # started samples cancelled before they finished
+        self.cost_usd = 0.0  # cost of samples returned by next_result()
+
+    async def __aenter__(self) -> "SamplePool":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.cancel_all()
+        self._discard_workspaces()
+        if isinstance(exc, DeclaredStepError):
+            exc.total_samples = self.completed
+            exc.cost_usd = self.cost_usd
+
+    @property
+    def in_flight(self) -> int:
+        """Samples requested but not yet returned by next_result()."""
+        return len(self._pending) + self._queued
+
+    @property
+    def completed(self) -> int:
+        """Samples that ran to completion (launched and not cancelled)."""
+        return self.launched - self.cancelled
+
+    @property
+    def escalated(self) -> bool:
+        return self._config.cascade_model is not None and self.model != self._config.cascade_model
+
+    def samples_by_model(self) -> dict[str, int]:
+        return {m: n for m, n in self._by_model.items() if n}
+
+    def launch(self, n: int = 1) -> None:
+        """Request n more samples. They start in launch order as the cap allows."""
+        self._queued += n
+        self.launched += n
+        self._fill()
+
+    async def next_result(self) -> AgentResult:
+        """Wait for the next finished sample. Ties go to the earliest launched."""
+        self._fill()
+        done, _ = await asyncio.wait(self._pending, return_when=asyncio.FIRST_COMPLETED)
+        task = min(done, key=lambda t: self._pending[t][0])
+        del self._pending[task]
+        result = task.result()
+        self.cost_usd += result.cost_usd
+        return result
+
+    async def cancel_all(self) -> int:
+        """Drop queued samples and cancel running ones. Returns how many running
+        samples were cancelled; dropped ones are no longer counted as launched."""
+        self.launched -= self._queued
+        self._queued = 0
+        pending = dict(self._pending)
+        self._pending.clear()
+        running = [t for t in pending if not t.done()]
+        for task in running:
+            task.cancel()
+            self._by_model[pending[task][1]] -= 1
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        self.cancelled += len(running)
+        return len(running)
+
+    async def commit(self, winner: dict) -> list[str]:
+        """Apply the file changes of the sample that produced winner to the real
+        directory and discard every sample workspace. Returns the paths changed."""
+        if not self._isolate:
+            return []
+        match = next((ws for output, ws in self._workspaces if output is winner), None)
+        if match is None:  # fieldwise winners are assembled from several samples
+            match = self._closest_workspace(winner)
+        if match is None:
+            self._discard_workspaces()
+            raise RuntimeError(
+                f"No sample workspace produced the winning output for step {self._step.step}"
+            )
+        try:
+            changed = await asyncio.to_thread(match.commit)
+        finally:
+            self._discard_workspaces()
+        # Shared tool caches never saw these writes
+        files_changed = getattr(self._runner, "files_changed", None)
+        if files_changed is not None:
+            files_changed(changed)
+        return changed
+
+    def _closest_workspace(self, winner: dict) -> SampleWorkspace | None:
+        """Workspace of the first sample agreeing with winner on the most fields,
+        compared in their normalized vote form."""
+        canonicalizer = Canonicalizer()
+        target = canonicalizer.vote_data(winner, self._step, self._config)
+
+        def agreement(output: dict) -> int:
+            data = canonicalizer.vote_data(output, self._step, self._config)
+            return sum(1 for k, v in target.items() if k in data and data[k] == v)
+
+        candidates = [(output, ws) for output, ws in self._workspaces if isinstance(output, dict) and output]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda c: agreement(c[0]))[1]
+
+    def should_escalate(self, tally: VoteTally, red_flagged: int) -> bool:
+        """Cheap-tier agreement (leader share of valid votes, red-flagged samples
+        counting against it) is still below cascade_agreement after
+        cascade_min_samples completed samples."""
+        if self._config.cascade_model is None or self.escalated:
+            return False
+        if tally.total + red_flagged < self._config.cascade_min_samples:
+            return False
+        return tally.leader_count / (tally.weight + red_flagged) < self._config.cascade_agreement
+
+    async def escalate(self) -> None:
+        """Cancel outstanding cheap samples and run all further samples on the
+        escalation model."""
+        await self.cancel_all()
+        self.model = self._config.escalation_model or self._config.model
+
+    def _fill(self) -> None:
+        config = self._config if self.model == self._config.model else replace(self._config, model=self.model)
+        while self._queued and len(self._pending) < self._limit:
+            task = asyncio.ensure_future(self._run_sample(config))
+            self._pending[task] = (self._started, self.model)
+            self._by_model[self.model] = self._by_model.get(self.model, 0) + 1
+            self._started += 1
+            self._queued -= 1
+
+    async def _run_sample(self, config: TaskConfig) -> AgentResult:
+        clock = asyncio.get_running_loop().time  # virtual under the simulator
+        start = clock()
+        threshold_ms = self._hedge_threshold_ms()
+        if threshold_ms is None:
+            result = await self._run_once(config)
+        else:
+            result = await self._run_hedged(config, threshold_ms)
+        self._latencies.record(self._step.task_type, (clock() - start) * 1000)
+        if result.model is None:
+            result.model = config.model
+        return result
+
+    async def _run_hedged(self, config: TaskConfig, threshold_ms: float) -> AgentResult:
+        primary = asyncio.ensure_future(self._run_once(config))
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=threshold_ms / 1000)
+            if not done and self.hedged < self._config.hedge_max_per_step:
+                self.hedged += 1
+                tasks.add(asyncio.ensure_future(self._run_once(config)))
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            winner = primary if primary in done else done.pop()
+            return winner.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run_once(self, config: TaskConfig) -> AgentResult:
+        if not self._isolate:
+            return await self._runner.run(self._step, self._context, config)
+        root = self._config.workspace_dir or os.getcwd()
+        workspace = await asyncio.to_thread(SampleWorkspace, root)
+        try:
+            result = await self._runner.run(
+                self._step, self._context, replace(config, workspace_dir=workspace.path)
+            )
+        except BaseException:
+            workspace.cleanup()
+            raise
+        self._workspaces.append((result.output, workspace))
+        return result
+
+    def _discard_workspaces(self) -> None:
+        for _, workspace in self._workspaces:
+            workspace.cleanup()
+        self._workspaces.clear()
+
+    def _hedge_threshold_ms(self) -> float | None:
+        if self._serial or self.hedged >= self._config.hedge_max_per_step:
+            return None
+        if self._config.hedge_after_ms is not None:
+            return self._config.hedge_after_ms
+        return self._latencies.quantile(self._step.task_type, self._config.hedge_quantile)
@@ -0,0 +1,108 @@
+import math
+from maker.voting.base import Voter
+from maker.core.models import PlanStep, VoteResult, TaskConfig
+from maker.executor.agent_runner import AgentRunner
+from maker.red_flag.red_flagger import RedFlagger
+from maker.voting.canonicalizer import Canonicalizer
+from maker.voting.declared_error import DeclaredErrorTracker
+from maker.voting.weights import keeps_cheap_votes, sample_weight
+from maker.voting.trace import VoteTrace, entropy
+from maker.voting.sampler import SamplePool, LatencyTracker
+from maker.voting.tally import VoteTally
+
+
+class SequentialVoter(Voter):
+    """Sequential test: keep sampling until the posterior that the leading answer
+    is correct reaches voting_confidence.
+
+    Each sample is assumed correct with probability p = voting_prior_accuracy, and
+    wrong answers are assumed to collide (the conservative case). The hypotheses are
+    "answer a is correct" for every observed a, plus "the correct answer has not been
+    seen yet". With r = p / (1 - p) the posterior of the leader is
+
+        P(leader) = r^n_leader / (1 + sum_a r^n_a)
+
+    so unanimous easy steps stop after a couple of samples, while scattered
+    disagreement keeps sampling past any fixed K.
+    """
+
+    def __init__(self, runner: AgentRunner, red_flagger: RedFlagger):
+        self._runner = runner
+        self._red_flagger = red_flagger
+        self._canonicalizer = Canonicalizer()
+        self._latencies = LatencyTracker()
+
+    async def vote(self, step: PlanStep, context: str, config: TaskConfig) -> VoteResult:
+        """Keep voting_window agents in flight. Winner when the leader's posterior
+        reaches voting_confidence. Fail if max_voting_samples reached."""
+        if not 0.5 < config.voting_prior_accuracy < 1:
+            raise ValueError(
+                f"voting_prior_accuracy must be in (0.5, 1), got {config.voting_prior_accuracy}"
+            )
+        tally = VoteTally(self._canonicalizer.clusterer(step, config))
+        red_flagged = 0
+        declared = DeclaredErrorTracker(step, config)
+        trace = VoteTrace()
+
+        async with SamplePool(self._runner, step, context, config, self._latencies) as pool:
+            pool.launch(min(max(1, config.voting_window), config.max_voting_samples))
+
+            while pool.in_flight:
+                result = await pool.next_result()
+
+                reason = self._discard_reason(result, step, declared, trace)
+                if reason:
+                    red_flagged += 1
+                    trace.record(result, reason)
+                else:
+                    h = self._canonicalizer.vote_hash(result.output, step, config)
+                    tally.add(h, result.output, sample_weight(result, config))
+                    trace.record(result, tally=tally.counts())
+
+                    if self.posterior(tally, config.voting_prior_accuracy) >= config.voting_confidence:
+                        await pool.cancel_all()
+                        winner = tally.output(tally.leader)
+                        await pool.commit(winner)
+                        return VoteResult(
+                            winner=winner,
+                            canonical_hash=tally.leader,
+                            total_samples=pool.completed,
+                            red_flagged=red_flagged,
+                            vote_counts=tally.counts(),
+                            cancelled=pool.cancelled,
+                            samples_by_model=pool.samples_by_model(),
+                            hedged=pool.hedged,
+                            cost_usd=pool.cost_usd,
+                            samples=trace.samples,
+                            red_flag_hits=trace.red_flag_hits,
+                            agreement_entropy=entropy(tally.counts()),
+                            decision_ms=trace.elapsed_ms(),
+                        )
+
+                if pool.should_escalate(tally, red_flagged):
+                    await pool.escalate()
+                    if not keeps_cheap_votes(config):
+                        tally = VoteTally(self._canonicalizer.clusterer(step, config))
+
+                # Refill the window
+                pool.launch(max(0, min(
+                    max(1, config.voting_window) - pool.in_flight,
+                    config.max_voting_samples - pool.launched,
+                )))
+
+        raise RuntimeError(
+            f"Reached max_voting_samples ({config.max_voting_samples}) without "
+            f"confidence {config.voting_confidence} for step {step.step}"
+        )
+
+    @staticmethod
+    def posterior(tally: VoteTally, prior_accuracy: float) -> float:
+        """Posterior probability that the current leader is the correct answer."""
+        if tally.leader is None:
+            return 0.0
+        log_r = math.log(prior_accuracy / (1 - prior_accuracy))
+        # Divide through by r^n_leader so every exponent is <= 0
+        denominator = math.exp(-tally.leader_count * log_r)
+        for count in tally.counts().values():
+            denominator += math.exp((count - tally.leader_count) * log_r)
+        return 1 / denominator
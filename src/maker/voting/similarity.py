@@ -0,0 +1,96 @@
+import hashlib
+import json
+import re
+from typing import Callable
+
+# Top-level string fields with at least this many words are compared by similarity;
+# every other field must match exactly for two samples to share a cluster.
+FREE_TEXT_MIN_WORDS = 5
+
+_WORD = re.compile(r"\w+")
+
+
+def shingles(text: str, size: int = 1) -> frozenset:
+    """Set of word n-grams of text (lowercased)."""
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        return frozenset([tuple(words)]) if words else frozenset()
+    return frozenset(tuple(words[i:i + size]) for i in range(len(words) - size + 1))
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class _Member:
+    def __init__(self, output: dict, exact_key: str, text: frozenset):
+        self.output = output
+        self.exact_key = exact_key
+        self.text = text
+
+
+class SimilarityClusterer:
+    """Groups voting samples whose free-text fields are near-duplicates.
+
+    Samples join the most similar existing cluster when their non-text fields are
+    identical and the token-shingle Jaccard similarity of their free-text fields
+    against the cluster's first member is at least threshold. Identical vote keys
+    always share a cluster. Everything is local: no embeddings or model calls.
+    """
+
+    def __init__(self, threshold: float, shingle_size: int = 1,
+                 prepare: Callable[[dict], dict] | None = None):
+        self._threshold = threshold
+        self._shingle_size = shingle_size
+        self._prepare = prepare or (lambda output: output)
+        self._key_to_cluster: dict[str, str] = {}
+        self._clusters: dict[str, list[_Member]] = {}
+
+    def assign(self, key: str, output: dict) -> str:
+        """Return the cluster id for a sample with vote key `key`."""
+        member = self._member(output)
+        cluster_id = self._key_to_cluster.get(key)
+        if cluster_id is None:
+            cluster_id = self._closest(member) or key
+            self._key_to_cluster[key] = cluster_id
+        self._clusters.setdefault(cluster_id, []).append(member)
+        return cluster_id
+
+    def representative(self, cluster_id: str) -> dict:
+        """Medoid of the cluster: the member most similar to all the others."""
+        members = self._clusters[cluster_id]
+        best = max(
+            range(len(members)),
+            key=lambda i: (
+                sum(jaccard(members[i].text, m.text) for m in members),
+                -i,  # earliest wins ties
+            ),
+        )
+        return members[best].output
+
+    def _closest(self, member: _Member) -> str | None:
+        best_id, best_score = None, -1.0
+        for cluster_id, members in self._clusters.items():
+            first = members[0]
+            if first.exact_key != member.exact_key or not (first.text or member.text):
+                continue
+            score = jaccard(first.text, member.text)
+            if score >= self._threshold and score > best_score:
+                best_id, best_score = cluster_id, score
+        return best_id
+
+    def _member(self, output: dict) -> _Member:
+        data = self._prepare(output)
+        exact, text = {}, []
+        for field, value in sorted(data.items()):
+            if isinstance(value, str) and len(value.split()) >= FREE_TEXT_MIN_WORDS:
+                exact[field] = None  # field must be free text in both samples
+                text.append(value)
+            else:
+                exact[field] = value
+        exact_key = hashlib.sha256(
+            json.dumps(exact, sort_keys=True, default=str).encode()
+        ).hexdigest()[:16]
+        return _Member(output, exact_key, shingles(" ".join(text), self._shingle_size))
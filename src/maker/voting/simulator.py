@@ -0,0 +1,216 @@
+"""Offline Monte Carlo harness for voting strategies.
+
+Drives the real voters against SyntheticRunner, so voting_k, voting_n and
+max_voting_samples can be chosen from data, and voter changes can be checked for
+cost or latency regressions without calling a model.
+
+    python -m maker.voting.simulator --accuracy 0.8 --trials 500
+"""
+import argparse
+import asyncio
+import math
+import random
+import selectors
+from dataclasses import dataclass, replace
+from typing import Callable
+from maker.core.models import PlanStep, AgentResult, TaskConfig
+from maker.red_flag.red_flagger import RedFlagger
+from maker.voting.factory import create_voter
+
+CORRECT = {"answer": "correct"}
+
+
+class _VirtualClockSelector(selectors.DefaultSelector):
+    """Selector that never blocks: a wait for timeout seconds advances the clock instead."""
+
+    def __init__(self):
+        super().__init__()
+        self.now = 0.0
+
+    def select(self, timeout=None):
+        if timeout:
+            self.now += timeout
+        return super().select(0)
+
+
+class _VirtualTimeLoop(asyncio.SelectorEventLoop):
+    def __init__(self):
+        self._virtual_selector = _VirtualClockSelector()
+        super().__init__(self._virtual_selector)
+
+    def time(self) -> float:
+        return self._virtual_selector.now
+
+
+def virtual_time_loop() -> asyncio.AbstractEventLoop:
+    """Event loop whose clock jumps straight to the next timer instead of waiting,
+    so simulated latencies are exact and cost no wall time. Only suitable for code
+    that does no real I/O, and that reads time from the loop (loop.time()) rather
+    than time.monotonic().
+
+    Built from public hooks only, a custom selector passed to SelectorEventLoop and
+    an overridden time(), but it still assumes the loop waits for its next timer by
+    calling selector.select(timeout), which is how CPython's selector loop works
+    rather than a documented guarantee."""
+    return _VirtualTimeLoop()
+
+
+def lognormal_latency(median_ms: float = 2000.0, sigma: float = 0.5) -> Callable[[random.Random], float]:
+    """Latency distribution with the long right tail typical of agent samples."""
+    return lambda rng: median_ms * math.exp(rng.gauss(0, sigma))
+
+
+class SyntheticRunner:
+    """Stands in for AgentRunner. Each sample is red-flagged with probability
+    red_flag_rate, else correct with probability accuracy, else one of
+    answer_space - 1 wrong answers chosen uniformly.
+
+    Latency is drawn from latency_ms and slept for latency * time_scale, so samples
+    overlap and get cancelled as they would for real. Run under virtual_time_loop()
+    those sleeps cost no wall time; time_scale=0 just yields.
+    """
+
+    def __init__(self, accuracy: float = 0.8, red_flag_rate: float = 0.0, answer_space: int = 2,
+                 latency_ms: Callable[[random.Random], float] | None = None,
+                 cost_per_sample: float = 0.01, time_scale: float = 1.0, seed: int | None = None):
+        self.accuracy = accuracy
+        self.red_flag_rate = red_flag_rate
+        self.answer_space = max(2, answer_space)
+        self.latency_ms = latency_ms or lognormal_latency()
+        self.cost_per_sample = cost_per_sample
+        self.time_scale = time_scale
+        self._rng = random.Random(seed)
+        self.started = 0
+        self.completed = 0
+        self.cost_usd = 0.0
+
+    async def run(self, step: PlanStep, context: str, config: TaskConfig) -> AgentResult:
+        self.started += 1
+        latency = self.latency_ms(self._rng)
+        roll = self._rng.random()
+        wrong = self._rng.randrange(1, self.answer_space)
+        await asyncio.sleep(latency * self.time_scale / 1000)
+
+        self.completed += 1
+        self.cost_usd += self.cost_per_sample
+        if roll < self.red_flag_rate:
+            output, error = {}, "synthetic red flag"
+        elif roll < self.red_flag_rate + (1 - self.red_flag_rate) * self.accuracy:
+            output, error = dict(CORRECT), None
+        else:
+            output, error = {"answer": f"wrong_{wrong}"}, None
+        return AgentResult(
+            output=output, raw_response="", was_repaired=False, tokens=0,
+            cost_usd=self.cost_per_sample, duration_ms=int(latency), error=error,
+        )
+
+
+@dataclass
+class SimulationReport:
+    strategy: str
+    trials: int
+    expected_samples: float  # completed samples per step
+    p50_latency_ms: float  # simulated step latency
+    p99_latency_ms: float
+    mean_cost_usd: float
+    error_rate: float  # wrong winner or no winner
+    failure_rate: float  # no winner (voter raised)
+
+
+def simulation_step() -> PlanStep:
+    return PlanStep(
+        step=0, task_type="action_step", title="simulated", task_description="simulated",
+        primary_tools=[], fallback_tools=[], primary_tool_instructions="",
+        fallback_tool_instructions="", input_variables=[], output_variable="step_0_output",
+        output_schema="{answer: string}", next_step_sequence_number=-1,
+    )
+
+
+async def simulate(config: TaskConfig, trials: int = 200, seed: int = 0, **runner_options) -> SimulationReport:
+    """Vote on `trials` independent steps with config.voting_strategy.
+    runner_options are passed to SyntheticRunner. Latencies are only meaningful
+    under virtual_time_loop() (or with real sleeps)."""
+    runner = SyntheticRunner(seed=seed, **runner_options)
+    voter = create_voter(config.voting_strategy, runner, RedFlagger())
+    step = simulation_step()
+    loop = asyncio.get_running_loop()
+    latencies, errors, failures = [], 0, 0
+
+    for _ in range(trials):
+        start = loop.time()
+        try:
+            result = await voter.vote(step, "", config)
+            if result.winner != CORRECT:
+                errors += 1
+        except Exception:
+            failures += 1
+        elapsed_ms = (loop.time() - start) * 1000
+        latencies.append(elapsed_ms / runner.time_scale if runner.time_scale else 0.0)
+
+    latencies.sort()
+    return SimulationReport(
+        strategy=config.voting_strategy,
+        trials=trials,
+        expected_samples=runner.completed / trials,
+        p50_latency_ms=_quantile(latencies, 0.5),
+        p99_latency_ms=_quantile(latencies, 0.99),
+        mean_cost_usd=runner.cost_usd / trials,
+        error_rate=(errors + failures) / trials,
+        failure_rate=failures / trials,
+    )
+
+
+async def benchmark(configs: list[TaskConfig], trials: int = 200, seed: int = 0,
+                    **runner_options) -> list[SimulationReport]:
+    """simulate() each config with the same seed and synthetic runner settings."""
+    return [await simulate(config, trials, seed, **runner_options) for config in configs]
+
+
+def format_report(report: SimulationReport) -> str:
+    return (
+        f"{report.strategy:<12} samples={report.expected_samples:6.2f} "
+        f"p50={report.p50_latency_ms:8.0f}ms p99={report.p99_latency_ms:8.0f}ms "
+        f"cost=${report.mean_cost_usd:.4f} error={report.error_rate:.3%} "
+        f"failed={report.failure_rate:.3%}"
+    )
+
+
+def _quantile(ordered: list[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate voting strategies against a synthetic agent")
+    parser.add_argument("--strategies", default="none,majority,first_to_k,sequential")
+    parser.add_argument("--trials", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--accuracy", type=float, default=0.8)
+    parser.add_argument("--red-flag-rate", type=float, default=0.0)
+    parser.add_argument("--answer-space", type=int, default=2)
+    parser.add_argument("--median-latency-ms", type=float, default=2000.0)
+    parser.add_argument("--voting-n", type=int, default=3)
+    parser.add_argument("--voting-k", type=int, default=2)
+    parser.add_argument("--max-voting-samples", type=int, default=10)
+    parser.add_argument("--voting-window", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    base = TaskConfig(
+        instruction="simulation", voting_n=args.voting_n, voting_k=args.voting_k,
+        max_voting_samples=args.max_voting_samples, voting_window=args.voting_window,
+    )
+    configs = [replace(base, voting_strategy=s.strip()) for s in args.strategies.split(",")]
+    with asyncio.Runner(loop_factory=virtual_time_loop) as runner:
+        reports = runner.run(benchmark(
+            configs, args.trials, args.seed,
+            accuracy=args.accuracy, red_flag_rate=args.red_flag_rate,
+            answer_space=args.answer_space,
+            latency_ms=lognormal_latency(args.median_latency_ms),
+        ))
+    for report in reports:
+        print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+from maker.voting.similarity import SimilarityClusterer
+
+
+class VoteTally:
+    """Running vote count per canonical hash.
+
+    Leader, runner-up and total are updated in O(1) per vote, so voters can check
+    their stopping rule after every sample without re-sorting the whole tally.
+    Votes only ever increase a count, which is what keeps the update constant-time.
+    Votes may be weighted (see voting.weights); counts are then weight sums.
+
+    With a clusterer, votes are counted per similarity cluster instead of per hash,
+    and each cluster is represented by its medoid.
+    """
+
+    def __init__(self, clusterer: SimilarityClusterer | None = None):
+        self._clusterer = clusterer
+        self._counts: dict[str, float] = {}
+        self._outputs: dict[str, dict] = {}
+        self.leader: str | None = None
+        self.leader_count: float = 0
+        self.runner_up: str | None = None
+        self.runner_up_count: float = 0
+        self.total = 0  # votes
+        self.weight: float = 0  # sum of vote weights; equals total when unweighted
+
+    def add(self, key: str, output: dict, weight: float = 1) -> None:
+        """Record one vote for key. The first output seen for a key represents it."""
+        if self._clusterer is not None:
+            key = self._clusterer.assign(key, output)
+        count = round(self._counts.get(key, 0) + weight, 9)  # keep weighted margins exact enough to compare
+        self._counts[key] = count
+        if key not in self._outputs:
+            self._outputs[key] = output
+        self.total += 1
+        self.weight = round(self.weight + weight, 9)
+
+        if key == self.leader:
+            self.leader_count = count
+        elif count > self.leader_count:
+            self.runner_up, self.runner_up_count = self.leader, self.leader_count
+            self.leader, self.leader_count = key, count
+        elif key == self.runner_up or count > self.runner_up_count:
+            self.runner_up, self.runner_up_count = key, count
+
+    @property
+    def margin(self) -> float:
+        """Leader's lead over the runner-up."""
+        return self.leader_count - self.runner_up_count
+
+    def output(self, key: str) -> dict:
+        if self._clusterer is not None:
+            return self._clusterer.representative(key)
+        return self._outputs[key]
+
+    def count(self, key: str) -> float:
+        return self._counts.get(key, 0)
+
+    def counts(self) -> dict[str, float]:
+        return dict(self._counts)
+
+    def __len__(self) -> int:
+        return len(self._counts)
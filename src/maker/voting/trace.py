@@ -0,0 +1,42 @@
+import asyncio
+import math
+import time
+from maker.core.models import AgentResult, SampleRecord
+
+
+def entropy(counts: dict[str, int]) -> float:
+    """Shannon entropy in bits of the answer distribution; 0 when all votes agree."""
+    total = sum(counts.values())
+    if not total:
+        return 0.0
+    return -sum(c / total * math.log2(c / total) for c in counts.values() if c) + 0.0
+
+
+class VoteTrace:
+    """Records the vote trajectory of one step: every finished sample, why it was
+    discarded, and the tally it left behind. red_flag_hits counts discards per rule."""
+
+    def __init__(self):
+        # The event loop's clock when there is one, so simulated votes time correctly
+        try:
+            self._clock = asyncio.get_running_loop().time
+        except RuntimeError:
+            self._clock = time.monotonic
+        self._start = self._clock()
+        self.samples: list[SampleRecord] = []
+        self.red_flag_hits: dict[str, int] = {}
+
+    def record(self, result: AgentResult, red_flag_reason: str | None = None,
+               tally: dict[str, int] | None = None) -> None:
+        self.samples.append(SampleRecord(
+            index=len(self.samples),
+            elapsed_ms=self.elapsed_ms(),
+            output=result.output if isinstance(result.output, dict) else {},
+            cost_usd=result.cost_usd,
+            duration_ms=result.duration_ms,
+            red_flag_reason=red_flag_reason,
+            tally=dict(tally or {}),
+        ))
+
+    def elapsed_ms(self) -> int:
+        return int((self._clock() - self._start) * 1000)
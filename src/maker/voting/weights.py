@@ -0,0 +1,27 @@
+from maker.core.models import AgentResult, TaskConfig
+
+# Floor so a heavily penalised sample still counts for something.
+MIN_WEIGHT = 0.05
+
+
+def sample_weight(result: AgentResult, config: TaskConfig) -> float:
+    """Vote weight of a valid sample under config.vote_weighting (1.0 when disabled)."""
+    weighting = config.vote_weighting
+    if not weighting.enabled:
+        return 1.0
+    weight = 1.0
+    if result.was_repaired:
+        weight *= weighting.repaired
+    if weighting.slow_after_ms is not None and result.duration_ms > weighting.slow_after_ms:
+        weight *= weighting.slow
+    if weighting.long_after_chars is not None and len(result.raw_response) > weighting.long_after_chars:
+        weight *= weighting.long
+    weight *= weighting.model_weights.get(result.model or config.model, 1.0)
+    return max(weight, MIN_WEIGHT)
+
+
+def keeps_cheap_votes(config: TaskConfig) -> bool:
+    """Whether cheap-tier votes stay in the tally after a cascade escalates, at their
+    model_weights weight. Otherwise they are dropped and voting restarts."""
+    weighting = config.vote_weighting
+    return weighting.enabled and config.cascade_model in weighting.model_weights
@@ -1,9 +1,11 @@
+import os
 import pytest
 from unittest.mock import AsyncMock, patch
-from maker.cli.main import parse_args, format_event
+from maker.cli.main import parse_args, parse_resume_args, format_event
 from maker.core.events import (
     TaskSubmitted, PlanCreated, StepStarted, StepCompleted,
-    TaskCompleted, TaskFailed, ValidationPassed,
+    TaskCompleted, TaskFailed, ValidationPassed, AgentSampleRedFlagged, VoteCompleted,
+    ContextOverflowHandled,
 )
 from maker.core.models import TaskConfig, Plan, VotingSummary
 
@@ -40,12 +42,33 @@ class TestParseArgs:
         assert args.voting == "first_to_k"
         assert args.voting_k == 3
 
+    def test_sequential_options(self):
+        args = parse_args([
+            "task",
+            "--voting", "sequential",
+            "--voting-confidence", "0.99",
+            "--voting-prior-accuracy", "0.7",
+        ])
+        assert args.voting == "sequential"
+        assert args.voting_confidence == 0.99
+        assert args.voting_prior_accuracy == 0.7
+
     def test_defaults(self):
         args = parse_args(["task"])
         assert args.voting_n == 3
         assert args.voting_k == 2
         assert args.max_voting_samples == 10
+        assert args.max_concurrent_samples == 5
+        assert args.voting_window == 1
+        assert args.similarity_threshold is None
         assert args.quality_checks is False
+        assert args.runs_dir == ".maker/runs"
+        assert args.no_checkpoint is False
+
+    def test_resume_args(self):
+        args = parse_resume_args(["20260101-120000-a1b2c3", "--runs-dir", "/tmp/runs"])
+        assert args.run_id == "20260101-120000-a1b2c3"
+        assert args.runs_dir == "/tmp/runs"
 
 
 class TestFormatEvent:
@@ -86,3 +109,67 @@ class TestFormatEvent:
         event = ValidationPassed(timestamp=1000.0, checks_passed=12)
         output = format_event(event)
         assert "12" in output or "passed" in output.lower()
+
+    def test_format_sample_red_flagged(self):
+        event = AgentSampleRedFlagged(timestamp=1000.0, step=1, sample_index=3, reason="Agent error: boom")
+        output = format_event(event)
+        assert "Sample 3" in output
+        assert "boom" in output
+
+    def test_format_vote_completed(self):
+        event = VoteCompleted(timestamp=1000.0, step=1, winner={}, total_samples=5,
+                              red_flagged=1, agreement_entropy=0.72, decision_ms=4200)
+        output = format_event(event)
+        assert "5 samples" in output
+        assert "0.72" in output
+
+    def test_format_vote_completed_red_flag_hits(self):
+        event = VoteCompleted(timestamp=1000.0, step=1, winner={}, total_samples=5,
+                              red_flagged=3, red_flag_hits={"not_dict": 2, "agent_error": 1})
+        output = format_event(event)
+        assert "3 red-flagged by agent_error: 1, not_dict: 2" in output
+
+    def test_format_context_overflow(self):
+        event = ContextOverflowHandled(timestamp=1000.0, step=2, variable="step_0_output.files",
+                                       policy="spill", tokens_before=9000, tokens_after=20,
+                                       spill_path="/tmp/maker-context/abc.yaml")
+        output = format_event(event)
+        assert "step_0_output.files" in output
+        assert "spill to /tmp/maker-context/abc.yaml" in output
+        assert "9000 -> 20" in output
+
+
+class TestCliRuns:
+    def _cli(self, argv, monkeypatch):
+        from maker.cli import main
+        configs = []
+
+        async def fake_run_task(config):
+            configs.append(config)
+            return
+            yield
+
+        monkeypatch.setattr(main, "run_task", fake_run_task)
+        monkeypatch.setattr(main.sys, "argv", ["maker", *argv])
+        main.cli()
+        return configs[0]
+
+    def test_new_run_checkpoints_to_absolute_path(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        config = self._cli(["task", "--runs-dir", "runs"], monkeypatch)
+        assert os.path.isabs(config.checkpoint_dir)
+        assert os.path.dirname(config.checkpoint_dir) == str(tmp_path / "runs")
+
+    def test_resume_from_another_directory(self, tmp_path, monkeypatch):
+        from maker.core.checkpoint import RunCheckpoint
+        project = tmp_path / "project"
+        project.mkdir()
+        monkeypatch.chdir(project)
+        RunCheckpoint(".maker/runs/r1").save_config(
+            TaskConfig(instruction="task", voting_strategy="majority", checkpoint_dir=".maker/runs/r1"))
+
+        monkeypatch.chdir(tmp_path)
+        config = self._cli(["resume", "r1", "--runs-dir", "project/.maker/runs"], monkeypatch)
+        assert config.instruction == "task"
+        assert config.voting_strategy == "majority"
+        assert config.checkpoint_dir == str(project / ".maker/runs/r1")
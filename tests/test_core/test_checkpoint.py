@@ -0,0 +1,56 @@
+import os
+from maker.core.checkpoint import RunCheckpoint, new_run_id
+from maker.core.models import Plan, PlanStep, TaskConfig, VoteWeightingConfig, VotingSummary
+
+
+def make_step(step_num):
+    return PlanStep(
+        step=step_num, task_type="action_step", title=f"step_{step_num}",
+        task_description="do it", primary_tools=["Read"], fallback_tools=[],
+        primary_tool_instructions="", fallback_tool_instructions="",
+        input_variables=[], output_variable=f"step_{step_num}_output",
+        output_schema="{data: string}", next_step_sequence_number=-1,
+    )
+
+
+class TestRunCheckpoint:
+    def test_config_round_trip(self, tmp_path):
+        checkpoint = RunCheckpoint(str(tmp_path / "run"))
+        config = TaskConfig(instruction="task", voting_strategy="first_to_k",
+                            vote_weighting=VoteWeightingConfig(enabled=True, model_weights={"m": 0.5}),
+                            checkpoint_dir=checkpoint.path)
+        checkpoint.save_config(config)
+        assert checkpoint.load_config() == config
+
+    def test_loaded_config_points_at_its_own_directory(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        RunCheckpoint(".maker/runs/r1").save_config(
+            TaskConfig(instruction="task", checkpoint_dir=".maker/runs/r1"))
+
+        config = RunCheckpoint(str(tmp_path / ".maker/runs/r1")).load_config()
+        assert config.checkpoint_dir == str(tmp_path / ".maker/runs/r1")
+
+    def test_plan_round_trip(self, tmp_path):
+        checkpoint = RunCheckpoint(str(tmp_path / "run"))
+        assert checkpoint.load_plan() is None
+        plan = Plan(reasoning="r", steps=[make_step(0), make_step(1)])
+        checkpoint.save_plan(plan)
+        assert checkpoint.load_plan() == plan
+
+    def test_completed_steps(self, tmp_path):
+        checkpoint = RunCheckpoint(str(tmp_path / "run"))
+        assert checkpoint.completed_steps() == {}
+        summary = VotingSummary(strategy="none", total_samples=2, red_flagged=1, winning_votes=1)
+        checkpoint.save_step(make_step(3), {"data": "x"}, summary, 0.02, 150)
+
+        saved = checkpoint.completed_steps()
+        assert list(saved) == [3]
+        assert saved[3]["output"] == {"data": "x"}
+        assert VotingSummary(**saved[3]["voting"]) == summary
+        assert saved[3]["cost_usd"] == 0.02
+        assert not any(name.endswith(".tmp") for name in os.listdir(tmp_path / "run" / "steps"))
+
+    def test_run_id(self, tmp_path):
+        run_id = new_run_id()
+        assert RunCheckpoint(str(tmp_path / run_id)).run_id == run_id
+        assert new_run_id() != run_id
@@ -20,6 +20,35 @@ class TestTaskConfig:
         assert config.voting_n == 3
         assert config.voting_k == 2
         assert config.max_voting_samples == 10
+        assert config.max_concurrent_samples == 5
+        assert config.voting_window == 1
+        assert config.voting_confidence == 0.95
+        assert config.voting_prior_accuracy == 0.8
+        assert config.project_votes_to_schema is True
+        assert config.normalization.whitespace is True
+        assert config.normalization.lowercase is False
+        assert config.vote_weighting.enabled is False
+        assert config.voting_similarity_threshold is None
+        assert config.cascade_model is None
+        assert config.escalation_model is None
+        assert config.hedge_max_per_step == 0
+        assert config.hedge_after_ms is None
+        assert config.task_sample_budget is None
+        assert config.task_cost_budget_usd is None
+        assert config.red_flag_rules == ["agent_error", "not_dict"]
+        assert config.red_flag_max_turns is None
+        assert config.declared_error_threshold == 2
+        assert config.workspace_dir is None
+        assert config.isolate_sample_workspaces is False
+        assert config.tool_cache == "off"
+        assert config.execution_mode == "sequential"
+        assert config.max_parallel_steps == 4
+        assert config.checkpoint_dir is None
+        assert config.step_cache_dir is None
+        assert config.step_cache_max_mb == 256.0
+        assert config.context_max_tokens is None
+        assert config.context_overflow == "truncate"
+        assert config.red_flag_max_seconds is None
         assert config.step_max_retries == 2
         assert config.enable_quality_checks is False
         assert config.max_planner_retries == 2
@@ -234,3 +234,32 @@ class TestOrchestrator:
         events = [e async for e in orchestrator.run()]
         # Should have at least: TaskSubmitted, PlanCreated, ValidationPassed, TaskCompleted
         assert len(events) >= 4
+
+    async def test_resume_uses_checkpointed_plan(self, tmp_path):
+        config = TaskConfig(instruction="test task", checkpoint_dir=str(tmp_path))
+        plan = make_valid_plan()
+        orchestrator = Orchestrator(config=config, registry=ToolRegistry())
+
+        async def mock_planner_process(event):
+            yield PlanCreated(timestamp=time.time(), plan=plan)
+
+        async def mock_validator_process(event):
+            yield ValidationPassed(timestamp=time.time(), checks_passed=10)
+
+        async def mock_executor_process(event):
+            yield TaskCompleted(timestamp=time.time(), result={}, total_cost_usd=0, total_duration_ms=0)
+
+        orchestrator._planner.process = mock_planner_process
+        orchestrator._validator.process = mock_validator_process
+        orchestrator._executor.process = mock_executor_process
+        [e async for e in orchestrator.run()]
+
+        # Second run in the same directory skips planning and validation
+        resumed = Orchestrator(config=config, registry=ToolRegistry())
+        resumed._planner.process = MagicMock(side_effect=AssertionError("replanned"))
+        resumed._validator.process = MagicMock(side_effect=AssertionError("revalidated"))
+        resumed._executor.process = mock_executor_process
+        events = [e async for e in resumed.run()]
+
+        assert [type(e).__name__ for e in events] == ["TaskSubmitted", "PlanCreated", "TaskCompleted"]
+        assert events[1].plan == plan
@@ -0,0 +1,24 @@
+import pytest
+from maker.core.schema import parse_output_schema
+
+
+class TestParseOutputSchema:
+    def test_flat_fields(self):
+        fields = parse_output_schema("{incident_id: string, severity: int}")
+        assert fields == {"incident_id": "string", "severity": "int"}
+
+    def test_nested_types_not_split(self):
+        fields = parse_output_schema("{files: list[string], owner: {id: int, name: string}}")
+        assert list(fields) == ["files", "owner"]
+        assert fields["owner"] == "{id: int, name: string}"
+
+    def test_multiline_schema(self):
+        fields = parse_output_schema("{\n  summary: string,\n  count: int\n}\n")
+        assert list(fields) == ["summary", "count"]
+
+    def test_quoted_names(self):
+        assert list(parse_output_schema('{"a": string, \'b\': int}')) == ["a", "b"]
+
+    def test_not_a_mapping(self):
+        assert parse_output_schema("a list of files") == {}
+        assert parse_output_schema("") == {}
@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from maker.executor.agent_runner import AgentRunner
@@ -167,3 +168,88 @@ class TestAgentRunner:
 
         assert "step_0_output" in captured_prompt
         assert "data: hello" in captured_prompt
+
+    async def test_stream_red_flag_aborts_sample(self):
+        runner = AgentRunner()
+        yielded = 0
+
+        async def mock_query(*args, **kwargs):
+            nonlocal yielded
+            for _ in range(100):
+                yielded += 1
+                yield make_mock_assistant_message("still working")
+            yield make_mock_result_message()
+
+        with patch.object(runner, "_sdk_query", mock_query):
+            result = await runner.run(make_step(), context="", config=make_config(red_flag_max_turns=3))
+
+        assert result.error is not None
+        assert "3 turns" in result.error
+        assert result.aborted is True
+        assert yielded == 4
+
+    async def test_stream_red_flag_times_out_stalled_sample(self):
+        runner = AgentRunner()
+
+        async def mock_query(*args, **kwargs):
+            yield make_mock_assistant_message("thinking")
+            await asyncio.sleep(5)
+            yield make_mock_result_message()
+
+        with patch.object(runner, "_sdk_query", mock_query):
+            result = await runner.run(make_step(), context="", config=make_config(red_flag_max_seconds=0.05))
+
+        assert "longer than 0.05s" in result.error
+
+    async def test_sdk_timeout_not_reported_as_time_limit(self):
+        runner = AgentRunner()
+
+        async def mock_query(*args, **kwargs):
+            yield make_mock_assistant_message("thinking")
+            raise TimeoutError("control request timed out")
+
+        with patch.object(runner, "_sdk_query", mock_query):
+            with pytest.raises(TimeoutError, match="control request"):
+                await runner.run(make_step(), context="", config=make_config())
+
+    async def test_tool_cache_hooks_shared_within_step(self):
+        runner = AgentRunner()
+        captured = []
+
+        async def mock_query(*args, **kwargs):
+            captured.append(kwargs.get("hooks"))
+            yield make_mock_assistant_message("result: ok")
+            yield make_mock_result_message()
+
+        config = make_config(tool_cache="step")
+        with patch.object(runner, "_sdk_query", mock_query):
+            # Interleaved, as concurrent steps run in DAG mode
+            await runner.run(make_step(step=0), context="", config=config)
+            await runner.run(make_step(step=1), context="", config=config)
+            await runner.run(make_step(step=0), context="", config=config)
+
+        pre_hooks = [h["PreToolUse"][0].hooks[0].__self__ for h in captured]
+        assert pre_hooks[0] is pre_hooks[2]
+        assert pre_hooks[1] is not pre_hooks[0]
+
+    async def test_files_changed_clears_task_cache(self):
+        runner = AgentRunner()
+        cache = runner._cache_for(make_step(step=0), make_config(tool_cache="task"))
+        cache.put("Read", {"file_path": "notes.txt"}, "before commit")
+
+        runner.files_changed(["notes.txt"])
+        assert cache.get("Read", {"file_path": "notes.txt"}) is None
+
+    async def test_tool_cache_off_installs_no_hooks(self):
+        runner = AgentRunner()
+        captured = {}
+
+        async def mock_query(*args, **kwargs):
+            captured.update(kwargs)
+            yield make_mock_assistant_message("result: ok")
+            yield make_mock_result_message()
+
+        with patch.object(runner, "_sdk_query", mock_query):
+            await runner.run(make_step(), context="", config=make_config())
+
+        assert captured["hooks"] is None
@@ -0,0 +1,98 @@
+import os
+import pytest
+from maker.core.models import TaskConfig
+from maker.executor.context_budget import ContextBudget, estimate_tokens
+from maker.executor.context_builder import ContextBuilder
+
+
+def make_context():
+    return {
+        "step_0_output": {"small": "ok", "big": "x" * 4000},
+        "step_1_output": {"medium": "y" * 400},
+    }
+
+
+class TestEstimateTokens:
+    def test_four_chars_per_token(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcd") == 1
+        assert estimate_tokens("abcde") == 2
+
+
+class TestContextBudget:
+    async def test_within_budget_unchanged(self):
+        context = make_context()
+        fitted, overflows = await ContextBudget(max_tokens=10_000).fit(context)
+        assert fitted == context
+        assert overflows == []
+
+    async def test_truncates_largest_value_first(self):
+        budget = ContextBudget(max_tokens=300)
+        fitted, overflows = await budget.fit(make_context())
+
+        assert [o.variable for o in overflows] == ["step_0_output.big"]
+        assert overflows[0].policy == "truncate"
+        assert overflows[0].tokens_after < overflows[0].tokens_before
+        assert fitted["step_0_output"]["small"] == "ok"
+        assert fitted["step_1_output"] == make_context()["step_1_output"]
+        assert "[truncated" in fitted["step_0_output"]["big"]
+        assert estimate_tokens(ContextBuilder.render(fitted)) <= 300
+
+    async def test_spills_to_readable_file(self, tmp_path):
+        budget = ContextBudget(max_tokens=300, policy="spill", spill_dir=str(tmp_path))
+        fitted, overflows = await budget.fit(make_context())
+
+        path = overflows[0].spill_path
+        assert os.path.dirname(path) == str(tmp_path)
+        with open(path) as f:
+            assert f.read() == "x" * 4000
+        assert path in fitted["step_0_output"]["big"]
+
+    async def test_spill_falls_back_to_truncate_without_read(self, tmp_path):
+        budget = ContextBudget(max_tokens=300, policy="spill", spill_dir=str(tmp_path))
+        fitted, overflows = await budget.fit(make_context(), can_read=False)
+
+        assert overflows[0].policy == "truncate"
+        assert overflows[0].spill_path is None
+        assert os.listdir(tmp_path) == []
+        assert "[truncated" in fitted["step_0_output"]["big"]
+
+    async def test_summarize_is_cached(self):
+        calls = []
+
+        class FakeBudget(ContextBudget):
+            _summaries = {}
+
+            async def _summarize(self, prompt):
+                calls.append(prompt)
+                return "short summary"
+
+        budget = FakeBudget(max_tokens=300, policy="summarize", summary_model="cheap")
+        fitted, overflows = await budget.fit(make_context())
+        await budget.fit(make_context())
+
+        assert fitted["step_0_output"]["big"] == "short summary"
+        assert overflows[0].policy == "summarize"
+        assert len(calls) == 1
+        assert "step_0_output.big" in calls[0]
+
+    async def test_summarize_failure_falls_back_to_truncate(self):
+        class FailingBudget(ContextBudget):
+            _summaries = {}
+
+            async def _summarize(self, prompt):
+                raise RuntimeError("model unavailable")
+
+        fitted, overflows = await FailingBudget(max_tokens=300, policy="summarize").fit(make_context())
+        assert overflows[0].policy == "truncate"
+
+    def test_from_config(self):
+        assert ContextBudget.from_config(TaskConfig(instruction="t")) is None
+        budget = ContextBudget.from_config(TaskConfig(
+            instruction="t", context_max_tokens=500, context_overflow="summarize", cascade_model="cheap",
+        ))
+        assert (budget.max_tokens, budget.policy, budget.summary_model) == (500, "summarize", "cheap")
+
+    def test_unknown_policy(self):
+        with pytest.raises(ValueError, match="drop"):
+            ContextBudget(max_tokens=10, policy="drop")
@@ -30,7 +30,7 @@ class TestContextBuilder:
         context = builder.build(step, step_outputs)
         assert "step_0_output" in context
         assert "field: value" in context
-        assert "other: data" in context  # whole output is included
+        assert "other" not in context  # only the referenced field is included
 
     def test_multiple_step_references(self):
         builder = ContextBuilder()
@@ -57,8 +57,50 @@ class TestContextBuilder:
         step = make_step(input_variables=["step_0_output.user_id"])
 
         context = builder.build(step, step_outputs)
-        # Full output is included, not just the referenced field
-        assert "extra: data" in context
+        assert yaml.safe_load(context) == {"step_0_output": {"user_id": "abc"}}
+
+    def test_bare_step_name_includes_whole_output(self):
+        builder = ContextBuilder()
+        step_outputs = {"step_0_output": {"user_id": "abc", "extra": "data"}}
+        step = make_step(input_variables=["step_0_output", "step_0_output.user_id"])
+
+        context = builder.build(step, step_outputs)
+        assert yaml.safe_load(context) == step_outputs
+
+    def test_nested_paths_and_list_indexes(self):
+        builder = ContextBuilder()
+        step_outputs = {
+            "step_2_output": {
+                "owner": {"id": 7, "name": "x"},
+                "files": [{"name": "a.py", "size": 1}, {"name": "b.py", "size": 2}],
+                "big": "y" * 1000,
+            },
+        }
+        step = make_step(input_variables=[
+            "step_2_output.owner.id", "step_2_output.files[0].name", "step_2_output.files[-1]",
+        ])
+
+        context = builder.build(step, step_outputs)
+        assert yaml.safe_load(context) == {"step_2_output": {
+            "owner.id": 7,
+            "files[0].name": "a.py",
+            "files[-1]": {"name": "b.py", "size": 2},
+        }}
+
+    def test_covered_paths_are_not_repeated(self):
+        builder = ContextBuilder()
+        step_outputs = {"step_0_output": {"owner": {"id": 7, "name": "x"}}}
+        step = make_step(input_variables=["step_0_output.owner", "step_0_output.owner.id"])
+
+        context = builder.build(step, step_outputs)
+        assert yaml.safe_load(context) == {"step_0_output": {"owner": {"id": 7, "name": "x"}}}
+
+    def test_unknown_path_falls_back_to_whole_output(self):
+        builder = ContextBuilder()
+        step_outputs = {"step_0_output": {"user_id": "abc", "items": [1]}}
+        for var in ("step_0_output.missing", "step_0_output.items[3]", "step_0_output.user_id[0]"):
+            context = builder.build(make_step(input_variables=[var]), step_outputs)
+            assert yaml.safe_load(context) == step_outputs
 
     def test_empty_input_variables(self):
         builder = ContextBuilder()
@@ -6,9 +6,11 @@ from maker.core.events import (
     TaskCompleted, TaskFailed, PlanCreated,
 )
 from maker.core.models import (
-    Plan, PlanStep, TaskConfig, VoteResult, VotingSummary,
+    Plan, PlanStep, SampleRecord, TaskConfig, VoteResult, VotingSummary,
 )
 from maker.tools.registry import ToolRegistry
+from maker.voting.declared_error import DeclaredStepError
+import os
 import time
 
 
@@ -213,3 +215,410 @@ class TestExecutorModule:
         assert len(task_completed) == 1
         assert task_completed[0].result["status"] == "completed"
         assert len(task_completed[0].result["steps"]) == 1
+
+    async def test_sample_budget_caps_steps(self):
+        plan = make_linear_plan(3)
+        config = TaskConfig(instruction="test", voting_strategy="first_to_k",
+                            voting_k=2, task_sample_budget=12)
+        executor = ExecutorModule(config=config, plan=plan)
+
+        caps = []
+
+        async def mock_vote(step, context, config):
+            caps.append(config.max_voting_samples)
+            result = make_vote_result()
+            result.total_samples = 2
+            return result
+
+        mock_voter = AsyncMock()
+        mock_voter.vote = mock_vote
+        executor._voter = mock_voter
+
+        event = ValidationPassed(timestamp=time.time(), checks_passed=10)
+        events = [e async for e in executor.process(event)]
+
+        assert any(isinstance(e, TaskCompleted) for e in events)
+        # 12 - 2*2 reserved; then 10 - 2 reserved; then all 8 left
+        assert caps == [8, 8, 8]
+
+    async def test_sample_budget_exhausted_fails_before_step(self):
+        plan = make_linear_plan(3)
+        config = TaskConfig(instruction="test", voting_strategy="first_to_k",
+                            voting_k=2, task_sample_budget=6)
+        executor = ExecutorModule(config=config, plan=plan)
+
+        hard = make_vote_result()
+        hard.total_samples = 5
+        mock_voter = AsyncMock()
+        mock_voter.vote = AsyncMock(return_value=hard)
+        executor._voter = mock_voter
+
+        event = ValidationPassed(timestamp=time.time(), checks_passed=10)
+        events = [e async for e in executor.process(event)]
+
+        task_failed = [e for e in events if isinstance(e, TaskFailed)]
+        assert len(task_failed) == 1
+        assert task_failed[0].step == 1
+        assert "budget exhausted" in task_failed[0].error
+        assert mock_voter.vote.call_count == 1
+
+    async def test_declared_error_fails_over_to_fallback_tools(self):
+        plan = Plan(reasoning="test", steps=[
+            make_step(0, primary_tools=["WebFetch"], fallback_tools=["Bash"],
+                      fallback_tool_instructions="Use curl"),
+        ])
+        executor = ExecutorModule(config=make_config(), plan=plan)
+
+        tools_used = []
+
+        async def mock_vote(step, context, config):
+            tools_used.append(step.primary_tools)
+            if step.primary_tools == ["WebFetch"]:
+                raise DeclaredStepError(step.step, "tool_unavailable", "WebFetch tool unavailable", 2)
+            return make_vote_result()
+
+        mock_voter = AsyncMock()
+        mock_voter.vote = mock_vote
+        executor._voter = mock_voter
+
+        event = ValidationPassed(timestamp=time.time(), checks_passed=10)
+        events = [e async for e in executor.process(event)]
+
+        assert tools_used == [["WebFetch"], ["Bash"]]
+        assert any(isinstance(e, TaskCompleted) for e in events)
+
+    async def test_failover_counts_the_abandoned_vote(self):
+        plan = Plan(reasoning="test", steps=[
+            make_step(0, primary_tools=["WebFetch"], fallback_tools=["Bash"]),
+        ])
+        config = TaskConfig(instruction="test", voting_strategy="first_to_k", voting_k=2,
+                            task_sample_budget=10)
+        executor = ExecutorModule(config=config, plan=plan)
+        caps = []
+
+        async def mock_vote(step, context, config):
+            caps.append(config.max_voting_samples)
+            if step.primary_tools == ["WebFetch"]:
+                raise DeclaredStepError(step.step, "tool_unavailable", "WebFetch tool unavailable", 2,
+                                        total_samples=3, cost_usd=0.3)
+            result = make_vote_result()
+            result.total_samples, result.cost_usd = 2, 0.2
+            return result
+
+        executor._voter = MagicMock(vote=mock_vote)
+        event = ValidationPassed(timestamp=time.time(), checks_passed=10)
+        events = [e async for e in executor.process(event)]
+
+        completed = next(e for e in events if isinstance(e, StepCompleted))
+        assert caps == [10, 7]
+        assert completed.cost_usd == pytest.approx(0.5)
+        assert completed.voting_summary.total_samples == 5
+        assert events[-1].total_cost_usd == pytest.approx(0.5)
+
+    async def test_declared_error_without_fallback_fails_with_category(self):
+        plan = make_linear_plan(2)
+        executor = ExecutorModule(config=make_config(), plan=plan)
+
+        mock_voter = AsyncMock()
+        mock_voter.vote = AsyncMock(side_effect=DeclaredStepError(0, "not_found", "no such file", 2))
+        executor._voter = mock_voter
+
+        event = ValidationPassed(timestamp=time.time(), checks_passed=10)
+        events = [e async for e in executor.process(event)]
+
+        step_failed = [e for e in events if isinstance(e, StepFailed)]
+        assert len(step_failed) == 1
+        assert step_failed[0].error_category == "not_found"
+        assert mock_voter.vote.call_count == 1
+
+    async def test_emits_vote_telemetry(self):
+        plan = make_linear_plan(1)
+        executor = ExecutorModule(config=make_config(), plan=plan)
+
+        vote_result = make_vote_result()
+        vote_result.samples = [
+            SampleRecord(index=0, elapsed_ms=10, output={}, cost_usd=0.01, duration_ms=10,
+                         red_flag_reason="Agent error: boom"),
+            SampleRecord(index=1, elapsed_ms=20, output={"data": "result"}, cost_usd=0.01,
+                         duration_ms=20, tally={"abc": 1}),
+        ]
+        vote_result.agreement_entropy = 0.0
+        mock_voter = AsyncMock()
+        mock_voter.vote = AsyncMock(return_value=vote_result)
+        executor._voter = mock_voter
+
+        event = ValidationPassed(timestamp=time.time(), checks_passed=10)
+        events = [e async for e in executor.process(event)]
+
+        types = [type(e).__name__ for e in events]
+        assert types == [
+            "StepStarted", "AgentSampleRedFlagged", "AgentSampleCompleted",
+            "VoteCompleted", "StepCompleted", "TaskCompleted",
+        ]
+        assert events[1].reason == "Agent error: boom"
+        assert events[2].tally == {"abc": 1}
+        assert events[3].vote_counts == {"abc": 1}
+
+    async def test_reports_red_flag_hits_per_step(self):
+        plan = make_linear_plan(1)
+        executor = ExecutorModule(config=make_config(), plan=plan)
+
+        vote_result = make_vote_result()
+        vote_result.red_flagged = 3
+        vote_result.red_flag_hits = {"agent_error": 1, "not_dict": 2}
+        mock_voter = AsyncMock()
+        mock_voter.vote = AsyncMock(return_value=vote_result)
+        executor._voter = mock_voter
+
+        event = ValidationPassed(timestamp=time.time(), checks_passed=10)
+        events = [e async for e in executor.process(event)]
+
+        vote_completed = next(e for e in events if type(e).__name__ == "VoteCompleted")
+        assert vote_completed.red_flag_hits == {"agent_error": 1, "not_dict": 2}
+        step_completed = next(e for e in events if isinstance(e, StepCompleted))
+        assert step_completed.voting_summary.red_flag_hits == {"agent_error": 1, "not_dict": 2}
+        result = events[-1].result
+        assert result["steps"][0]["voting"]["red_flag_hits"] == {"agent_error": 1, "not_dict": 2}
+
+
+def make_fan_out_plan(writer=False):
+    """Step 0 feeds steps 1-3, which all feed step 4."""
+    fan_in = [f"step_{i}_output.data" for i in (1, 2, 3)]
+    steps = [make_step(0, next_step=1)]
+    for i in (1, 2, 3):
+        tools = ["Write"] if writer and i == 2 else ["Read"]
+        steps.append(make_step(i, next_step=i + 1, input_variables=["step_0_output.data"],
+                               primary_tools=tools))
+    steps.append(make_step(4, input_variables=fan_in))
+    return Plan(reasoning="test", steps=steps)
+
+
+class ConcurrencyVoter:
+    """Records which steps were voting at the same time."""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.running: set[int] = set()
+        self.overlaps: list[set[int]] = []
+        self.started: list[int] = []
+
+    async def vote(self, step, context, config):
+        import asyncio
+        self.started.append(step.step)
+        self.running.add(step.step)
+        self.overlaps.append(set(self.running))
+        await asyncio.sleep(self.delays.get(step.step, 0.01))
+        self.running.discard(step.step)
+        return make_vote_result({"data": f"out_{step.step}"})
+
+
+class TestDagExecution:
+    async def _run(self, plan, voter, **overrides):
+        config = TaskConfig(instruction="test", execution_mode="dag", **overrides)
+        executor = ExecutorModule(config=config, plan=plan)
+        executor._voter = voter
+        event = ValidationPassed(timestamp=time.time(), checks_passed=10)
+        return [e async for e in executor.process(event)]
+
+    async def test_independent_steps_run_concurrently(self):
+        # Step 3 finishes first, but events still come out in plan order
+        voter = ConcurrencyVoter(delays={1: 0.03, 2: 0.02, 3: 0.01})
+        events = await self._run(make_fan_out_plan(), voter)
+
+        assert max(len(s) for s in voter.overlaps) == 3
+        assert voter.started[0] == 0 and voter.started[-1] == 4
+        steps = [(type(e).__name__, e.step) for e in events if isinstance(e, (StepStarted, StepCompleted))]
+        assert steps == [(kind, i) for i in range(5) for kind in ("StepStarted", "StepCompleted")]
+        result = events[-1].result
+        assert [s["step"] for s in result["steps"]] == [0, 1, 2, 3, 4]
+        assert result["steps"][-1]["output"] == {"data": "out_4"}
+
+    async def test_respects_max_parallel_steps(self):
+        voter = ConcurrencyVoter()
+        await self._run(make_fan_out_plan(), voter, max_parallel_steps=2)
+        assert max(len(s) for s in voter.overlaps) == 2
+
+    async def test_side_effect_step_is_a_barrier(self):
+        voter = ConcurrencyVoter()
+        events = await self._run(make_fan_out_plan(writer=True), voter)
+
+        # Step 2 writes files: it runs alone, after step 1 and before step 3
+        assert voter.started == [0, 1, 2, 3, 4]
+        assert {2} in voter.overlaps
+        assert all(len(s) == 1 for s in voter.overlaps)
+        assert isinstance(events[-1], TaskCompleted)
+
+    async def test_failure_reports_earlier_steps_then_stops(self):
+        voter = ConcurrencyVoter()
+        original = voter.vote
+
+        async def vote(step, context, config):
+            if step.step == 2:
+                raise RuntimeError("boom")
+            return await original(step, context, config)
+
+        voter.vote = vote
+        events = await self._run(make_fan_out_plan(), voter)
+
+        completed = [e.step for e in events if isinstance(e, StepCompleted)]
+        assert completed == [0, 1]
+        assert isinstance(events[-2], StepFailed) and events[-2].step == 2
+        assert isinstance(events[-1], TaskFailed)
+        assert 4 not in voter.started
+
+    async def test_conditional_plan_runs_sequentially(self):
+        steps = [
+            make_step(0, next_step=1, task_type="conditional_step"),
+            make_step(1, next_step=-1, input_variables=[]),
+        ]
+        voter = ConcurrencyVoter()
+        voter_result = {"data": "x", "next_step": 1}
+
+        async def vote(step, context, config):
+            voter.started.append(step.step)
+            return make_vote_result(voter_result if step.step == 0 else None)
+
+        voter.vote = vote
+        events = await self._run(Plan(reasoning="test", steps=steps), voter)
+        assert voter.started == [0, 1]
+        assert isinstance(events[-1], TaskCompleted)
+
+
+    async def test_concurrent_steps_share_the_task_budget(self):
+        steps = [make_step(i, next_step=i + 1 if i < 3 else -1, input_variables=[]) for i in range(4)]
+        config = TaskConfig(instruction="test", execution_mode="dag", max_parallel_steps=4,
+                            voting_strategy="first_to_k", voting_k=2, task_sample_budget=12)
+        caps = []
+
+        async def vote(step, context, config):
+            import asyncio
+            caps.append(config.max_voting_samples)
+            await asyncio.sleep(0.01)
+            result = make_vote_result()
+            result.total_samples = config.max_voting_samples  # spend the whole cap
+            return result
+
+        executor = ExecutorModule(config=config, plan=Plan(reasoning="test", steps=steps))
+        executor._voter = MagicMock(vote=vote)
+        event = ValidationPassed(timestamp=time.time(), checks_passed=10)
+        events = [e async for e in executor.process(event)]
+
+        assert len(caps) == 4
+        assert sum(caps) <= 12
+        assert all(cap >= 2 for cap in caps)
+        assert isinstance(events[-1], TaskCompleted)
+
+class TestCheckpointResume:
+    async def test_resume_skips_finished_steps(self, tmp_path):
+        plan = make_linear_plan(3)
+        config = TaskConfig(instruction="test", checkpoint_dir=str(tmp_path))
+        event = ValidationPassed(timestamp=time.time(), checks_passed=10)
+
+        # First attempt fails at step 2
+        executor = ExecutorModule(config=config, plan=plan)
+        calls = []
+
+        async def failing_vote(step, context, config):
+            calls.append(step.step)
+            if step.step == 2:
+                raise RuntimeError("boom")
+            return make_vote_result({"data": f"out_{step.step}"})
+
+        executor._voter = MagicMock(vote=failing_vote)
+        events = [e async for e in executor.process(event)]
+        assert isinstance(events[-1], TaskFailed)
+
+        # Resume: steps 0 and 1 are restored, only step 2 is voted on
+        executor = ExecutorModule(config=config, plan=plan)
+        calls.clear()
+        contexts = {}
+
+        async def vote(step, context, config):
+            calls.append(step.step)
+            contexts[step.step] = context
+            return make_vote_result({"data": f"out_{step.step}"})
+
+        executor._voter = MagicMock(vote=vote)
+        events = [e async for e in executor.process(event)]
+
+        assert calls == [2]
+        assert "out_1" in contexts[2]
+        result = events[-1].result
+        assert [s["output"] for s in result["steps"]] == [{"data": f"out_{i}"} for i in range(3)]
+
+
+class TestStepCacheReuse:
+    async def _run(self, plan, config):
+        executor = ExecutorModule(config=config, plan=plan)
+        mock_voter = AsyncMock()
+        mock_voter.vote = AsyncMock(return_value=make_vote_result())
+        executor._voter = mock_voter
+        event = ValidationPassed(timestamp=time.time(), checks_passed=10)
+        events = [e async for e in executor.process(event)]
+        return events, mock_voter.vote.call_count
+
+    async def test_second_task_reuses_steps(self, tmp_path):
+        config = TaskConfig(instruction="test", step_cache_dir=str(tmp_path))
+        _, calls = await self._run(make_linear_plan(2), config)
+        assert calls == 2
+
+        events, calls = await self._run(make_linear_plan(2), config)
+        assert calls == 0
+        steps = events[-1].result["steps"]
+        assert [s["voting"]["cached"] for s in steps] == [True, True]
+        assert events[-1].total_cost_usd == 0.0
+
+    async def test_side_effect_steps_not_cached(self, tmp_path):
+        plan = Plan(reasoning="test", steps=[make_step(0, primary_tools=["Write"])])
+        config = TaskConfig(instruction="test", step_cache_dir=str(tmp_path))
+        await self._run(plan, config)
+        _, calls = await self._run(plan, config)
+        assert calls == 1
+        assert os.listdir(tmp_path) == []
+
+
+class TestContextBudgetEvents:
+    async def test_overflow_recorded_in_step_events(self):
+        plan = make_linear_plan(2)
+        config = TaskConfig(instruction="test", context_max_tokens=50)
+        executor = ExecutorModule(config=config, plan=plan)
+        contexts = []
+
+        async def vote(step, context, config):
+            contexts.append(context)
+            return make_vote_result({"data": "z" * 2000})
+
+        executor._voter = MagicMock(vote=vote)
+        event = ValidationPassed(timestamp=time.time(), checks_passed=10)
+        events = [e async for e in executor.process(event)]
+
+        types = [type(e).__name__ for e in events]
+        assert types[types.index("StepStarted", 1):][:3] == [
+            "StepStarted", "ContextOverflowHandled", "VoteCompleted",
+        ]
+        overflow = events[types.index("ContextOverflowHandled")]
+        assert overflow.step == 1
+        assert overflow.variable == "step_0_output.data"
+        assert overflow.policy == "truncate"
+        assert len(contexts[1]) < 400
+
+
+    async def test_spill_needs_read_tool(self, tmp_path):
+        config = TaskConfig(instruction="test", context_max_tokens=50, context_overflow="spill",
+                            context_spill_dir=str(tmp_path))
+        for tools, policy in ((["Read"], "spill"), (["WebSearch"], "truncate")):
+            plan = Plan(reasoning="test", steps=[
+                make_step(0, next_step=1),
+                make_step(1, primary_tools=tools),
+            ])
+            executor = ExecutorModule(config=config, plan=plan)
+
+            async def vote(step, context, config):
+                return make_vote_result({"data": "z" * 2000})
+
+            executor._voter = MagicMock(vote=vote)
+            event = ValidationPassed(timestamp=time.time(), checks_passed=10)
+            events = [e async for e in executor.process(event)]
+
+            overflow = next(e for e in events if type(e).__name__ == "ContextOverflowHandled")
+            assert overflow.policy == policy
@@ -0,0 +1,75 @@
+import os
+import time
+from dataclasses import replace
+from maker.core.models import PlanStep, SampleRecord, TaskConfig, VoteResult
+from maker.executor.step_cache import StepCache, step_fingerprint
+
+
+def make_step(**overrides):
+    defaults = dict(
+        step=0, task_type="action_step", title="fetch", task_description="Fetch the data",
+        primary_tools=["Read"], fallback_tools=[], primary_tool_instructions="",
+        fallback_tool_instructions="", input_variables=[], output_variable="step_0_output",
+        output_schema="{data: string}", next_step_sequence_number=-1,
+    )
+    defaults.update(overrides)
+    return PlanStep(**defaults)
+
+
+def make_vote_result(data="x"):
+    return VoteResult(
+        winner={"data": data}, canonical_hash="h", total_samples=3, red_flagged=1,
+        vote_counts={"h": 2}, cost_usd=0.03,
+        samples=[SampleRecord(index=0, elapsed_ms=1, output={}, cost_usd=0.01, duration_ms=1)],
+    )
+
+
+class TestStepFingerprint:
+    def test_ignores_step_position(self):
+        config = TaskConfig(instruction="a")
+        key = step_fingerprint(make_step(), "ctx", config)
+        moved = make_step(step=7, title="other", output_variable="step_7_output")
+        assert step_fingerprint(moved, "ctx", TaskConfig(instruction="b")) == key
+
+    def test_changes_with_inputs_and_settings(self):
+        config = TaskConfig(instruction="a")
+        key = step_fingerprint(make_step(), "ctx", config)
+        assert step_fingerprint(make_step(), "other ctx", config) != key
+        assert step_fingerprint(make_step(output_schema="{n: int}"), "ctx", config) != key
+        assert step_fingerprint(make_step(), "ctx", replace(config, model="other")) != key
+        assert step_fingerprint(make_step(), "ctx", replace(config, voting_k=3)) != key
+
+
+class TestStepCache:
+    def test_round_trip_costs_nothing(self, tmp_path):
+        cache = StepCache(str(tmp_path))
+        assert cache.get("k") is None
+        cache.put("k", make_vote_result())
+
+        hit = cache.get("k")
+        assert hit.winner == {"data": "x"}
+        assert hit.vote_counts == {"h": 2}
+        assert hit.cost_usd == 0.0
+        assert hit.samples == []
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = StepCache(str(tmp_path))
+        for key in ("a", "b", "c"):
+            cache.put(key, make_vote_result())
+        entry_size = os.path.getsize(tmp_path / "a.json")
+        # Oldest first: a, b, c; reading a makes b the least recently used
+        for i, key in enumerate(("a", "b", "c")):
+            os.utime(tmp_path / f"{key}.json", ns=(i * 10**9, i * 10**9))
+        cache.get("a")
+
+        cache.max_bytes = 3 * entry_size
+        cache.put("d", make_vote_result())
+        assert cache.get("b") is None
+        assert all(cache.get(key) is not None for key in ("a", "c", "d"))
+
+    def test_from_config(self, tmp_path):
+        assert StepCache.from_config(TaskConfig(instruction="t")) is None
+        cache = StepCache.from_config(TaskConfig(instruction="t", step_cache_dir=str(tmp_path),
+                                                 step_cache_max_mb=1))
+        assert cache.max_bytes == 1024 * 1024
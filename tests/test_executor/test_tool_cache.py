@@ -0,0 +1,89 @@
+from maker.executor.tool_cache import ToolCache
+
+
+def pre(tool_name, tool_input):
+    return {"hook_event_name": "PreToolUse", "tool_name": tool_name, "tool_input": tool_input}
+
+
+def post(tool_name, tool_input, response):
+    return {"hook_event_name": "PostToolUse", "tool_name": tool_name,
+            "tool_input": tool_input, "tool_response": response}
+
+
+class TestToolCache:
+    async def test_identical_read_served_from_cache(self):
+        cache = ToolCache()
+        read = {"file_path": "/repo/a.py"}
+        assert await cache._pre_tool_use(pre("Read", read), "t1", None) == {}
+        await cache._post_tool_use(post("Read", read, "a = 1"), "t1", None)
+
+        out = await cache._pre_tool_use(pre("Read", dict(read)), "t2", None)
+        decision = out["hookSpecificOutput"]
+        assert decision["permissionDecision"] == "deny"
+        assert "a = 1" in decision["permissionDecisionReason"]
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    async def test_results_not_shared_across_workspaces(self):
+        cache = ToolCache()
+        glob = {"pattern": "*.py"}
+        await cache._post_tool_use({**post("Glob", glob, "/tmp/ws-a/a.py"), "cwd": "/tmp/ws-a"}, "t1", None)
+        assert await cache._pre_tool_use({**pre("Glob", glob), "cwd": "/tmp/ws-b"}, "t2", None) == {}
+        assert await cache._pre_tool_use({**pre("Glob", glob), "cwd": "/tmp/ws-a"}, "t3", None) != {}
+
+    async def test_web_results_shared_across_workspaces(self):
+        cache = ToolCache()
+        cache.put("WebFetch", {"url": "https://example.com"}, "page", cwd="/tmp/ws-a")
+        assert cache.get("WebFetch", {"url": "https://example.com"}, cwd="/tmp/ws-b") == "page"
+
+    async def test_different_input_is_a_miss(self):
+        cache = ToolCache()
+        cache.put("Grep", {"pattern": "foo"}, {"matches": 3})
+        assert cache.get("Grep", {"pattern": "bar"}) is None
+        assert cache.get("Grep", {"pattern": "foo"}) == '{"matches": 3}'
+
+    async def test_write_tools_never_cached(self):
+        cache = ToolCache()
+        cache.put("Write", {"file_path": "x"}, "ok")
+        assert cache.get("Write", {"file_path": "x"}) is None
+
+    async def test_write_invalidates_path_and_listings(self):
+        cache = ToolCache()
+        cache.put("Read", {"file_path": "a.py"}, "old")
+        cache.put("Read", {"file_path": "b.py"}, "b")
+        cache.put("Glob", {"pattern": "*.py"}, "a.py\nb.py")
+        await cache._post_tool_use(post("Edit", {"file_path": "a.py"}, "ok"), "t", None)
+
+        assert cache.get("Read", {"file_path": "a.py"}) is None
+        assert cache.get("Glob", {"pattern": "*.py"}) is None
+        assert cache.get("Read", {"file_path": "b.py"}) == "b"
+        # A later read of the written file is not cached either
+        cache.put("Read", {"file_path": "a.py"}, "new")
+        assert cache.get("Read", {"file_path": "a.py"}) is None
+
+    async def test_bash_invalidates_files_but_not_web(self):
+        cache = ToolCache()
+        cache.put("Read", {"file_path": "a.py"}, "a")
+        cache.put("WebFetch", {"url": "https://example.com"}, "page")
+        await cache._post_tool_use(post("Bash", {"command": "make"}, {"stdout": ""}), "t", None)
+
+        assert cache.get("Read", {"file_path": "a.py"}) is None
+        assert cache.get("WebFetch", {"url": "https://example.com"}) == "page"
+
+    async def test_invalidate_files_keeps_web(self):
+        cache = ToolCache()
+        cache.put("Read", {"file_path": "a.py"}, "old")
+        cache.put("Grep", {"pattern": "x"}, "a.py:1")
+        cache.put("WebSearch", {"query": "q"}, "results")
+        cache.invalidate_files()
+
+        assert cache.get("Read", {"file_path": "a.py"}) is None
+        assert cache.get("Grep", {"pattern": "x"}) is None
+        assert cache.get("WebSearch", {"query": "q"}) == "results"
+        # Files can be cached again with their new content
+        cache.put("Read", {"file_path": "a.py"}, "new")
+        assert cache.get("Read", {"file_path": "a.py"}) == "new"
+
+    def test_hooks(self):
+        hooks = ToolCache().hooks()
+        assert set(hooks) == {"PreToolUse", "PostToolUse"}
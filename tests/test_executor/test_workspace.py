@@ -0,0 +1,72 @@
+import os
+from maker.core.models import PlanStep
+from maker.executor.workspace import SampleWorkspace, has_side_effects
+
+
+def make_step(primary_tools, fallback_tools=()):
+    return PlanStep(
+        step=0, task_type="action_step", title="t", task_description="Do",
+        primary_tools=list(primary_tools), fallback_tools=list(fallback_tools),
+        primary_tool_instructions="", fallback_tool_instructions="",
+        input_variables=[], output_variable="step_0_output",
+        output_schema="{r: string}", next_step_sequence_number=-1,
+    )
+
+
+def make_project(root):
+    (root / "src").mkdir()
+    (root / "src" / "a.py").write_text("a = 1\n")
+    (root / "b.txt").write_text("keep\n")
+    (root / ".git").mkdir()
+    (root / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+
+
+class TestHasSideEffects:
+    def test_read_only_step(self):
+        assert has_side_effects(make_step(["Read", "Grep"])) is False
+
+    def test_write_in_fallback(self):
+        assert has_side_effects(make_step(["Read"], ["Edit"])) is True
+
+
+class TestSampleWorkspace:
+    def test_copy_is_private(self, tmp_path):
+        make_project(tmp_path)
+        ws = SampleWorkspace(str(tmp_path))
+        try:
+            with open(os.path.join(ws.path, "b.txt"), "w") as f:
+                f.write("changed\n")
+            assert (tmp_path / "b.txt").read_text() == "keep\n"
+            assert not os.path.exists(os.path.join(ws.path, ".git"))
+        finally:
+            ws.cleanup()
+        assert not os.path.exists(ws.path)
+
+    def test_no_changes(self, tmp_path):
+        make_project(tmp_path)
+        ws = SampleWorkspace(str(tmp_path))
+        try:
+            assert ws.changes() == ([], [])
+        finally:
+            ws.cleanup()
+
+    def test_commit_applies_writes_and_deletes(self, tmp_path):
+        make_project(tmp_path)
+        ws = SampleWorkspace(str(tmp_path))
+        try:
+            with open(os.path.join(ws.path, "src", "a.py"), "w") as f:
+                f.write("a = 2\n")
+            os.makedirs(os.path.join(ws.path, "new"))
+            with open(os.path.join(ws.path, "new", "c.txt"), "w") as f:
+                f.write("c\n")
+            os.remove(os.path.join(ws.path, "b.txt"))
+
+            changed = ws.commit()
+        finally:
+            ws.cleanup()
+
+        assert sorted(changed) == ["b.txt", os.path.join("new", "c.txt"), os.path.join("src", "a.py")]
+        assert (tmp_path / "src" / "a.py").read_text() == "a = 2\n"
+        assert (tmp_path / "new" / "c.txt").read_text() == "c\n"
+        assert not (tmp_path / "b.txt").exists()
+        assert (tmp_path / ".git" / "HEAD").exists()
@@ -1,6 +1,6 @@
 import pytest
 from maker.red_flag.red_flagger import RedFlagger
-from maker.core.models import AgentResult
+from maker.core.models import AgentResult, PlanStep, TaskConfig
 
 
 def make_result(**overrides):
@@ -84,3 +84,74 @@ class TestRedFlagger:
         flagger = RedFlagger()
         result = make_result(output={"error": "something went wrong"})
         assert flagger.check(result) is False  # it's still a dict
+
+
+def make_step(output_schema="{name: string, count: int}", task_type="action_step"):
+    return PlanStep(
+        step=0, task_type=task_type, title="t", task_description="Do",
+        primary_tools=[], fallback_tools=[], primary_tool_instructions="",
+        fallback_tool_instructions="", input_variables=[], output_variable="step_0_output",
+        output_schema=output_schema, next_step_sequence_number=-1,
+    )
+
+
+class TestRedFlagRules:
+    def test_unknown_rule_rejected(self):
+        with pytest.raises(ValueError, match="nope"):
+            RedFlagger(["nope"])
+
+    def test_missing_fields(self):
+        flagger = RedFlagger(["missing_fields"])
+        flagged, reason = flagger.check_with_reason(make_result(output={"name": "x"}), make_step())
+        assert flagged is True
+        assert "count" in reason
+        assert flagger.check(make_result(output={"name": "x", "count": 1}), make_step()) is False
+
+    def test_missing_fields_needs_step(self):
+        flagger = RedFlagger(["missing_fields"])
+        assert flagger.check(make_result(output={})) is False
+
+    def test_missing_next_step_on_conditional(self):
+        flagger = RedFlagger(["missing_fields"])
+        step = make_step(task_type="conditional_step")
+        assert flagger.check(make_result(output={"reason": "x"}), step) is True
+
+    def test_repaired(self):
+        flagger = RedFlagger(["repaired"])
+        assert flagger.check(make_result(was_repaired=True)) is True
+        assert flagger.check(make_result()) is False
+
+    def test_raw_size(self):
+        config = TaskConfig(instruction="t", red_flag_max_raw_chars=5)
+        flagger = RedFlagger(["raw_size"], config)
+        assert flagger.check(make_result(raw_response="key: value")) is True
+        assert flagger.check(make_result(raw_response="k: v")) is False
+
+    def test_error_object(self):
+        flagger = RedFlagger(["error_object"])
+        assert flagger.check(make_result(output={"error": "file not found"}), make_step()) is True
+        assert flagger.check(make_result(output={"error": "x", "name": "y"}), make_step()) is False
+
+    def test_error_object_allowed_when_in_schema(self):
+        flagger = RedFlagger(["error_object"])
+        step = make_step(output_schema="{error: string}")
+        assert flagger.check(make_result(output={"error": "none"}), step) is False
+
+    def test_errors_flagged_without_agent_error_rule(self):
+        flagger = RedFlagger(["not_dict"])
+        assert flagger.check_rule(make_result(output={}, error="YAML parse error: bad"))[0] == "agent_error"
+
+    def test_stream_abort_named_separately(self):
+        flagger = RedFlagger()
+        result = make_result(output={}, error="Red-flagged while streaming: 3 turns", aborted=True)
+        assert flagger.check_rule(result)[0] == "stream_limit"
+
+    def test_check_rule_names_the_rule(self):
+        flagger = RedFlagger(["agent_error", "repaired"])
+        assert flagger.check_rule(make_result(was_repaired=True))[0] == "repaired"
+        assert flagger.check_rule(make_result()) == (None, "")
+
+    def test_from_config(self):
+        config = TaskConfig(instruction="t", red_flag_rules=["agent_error", "error_object"])
+        flagger = RedFlagger.from_config(config)
+        assert flagger.check(make_result(output={"error": "x"})) is True
@@ -0,0 +1,56 @@
+from unittest.mock import MagicMock, patch
+from maker.red_flag.stream_monitor import StreamMonitor
+
+
+def make_message(*blocks):
+    msg = MagicMock()
+    msg.__class__.__name__ = "AssistantMessage"
+    msg.content = list(blocks)
+    return msg
+
+
+def text_block(text):
+    block = MagicMock()
+    block.__class__.__name__ = "TextBlock"
+    block.text = text
+    return block
+
+
+def tool_block():
+    block = MagicMock()
+    block.__class__.__name__ = "ToolUseBlock"
+    return block
+
+
+class TestStreamMonitor:
+    def test_no_limits_never_fires(self):
+        monitor = StreamMonitor()
+        for _ in range(50):
+            assert monitor.observe(make_message(text_block("x" * 1000), tool_block())) is None
+
+    def test_output_chars(self):
+        monitor = StreamMonitor(max_output_chars=10)
+        assert monitor.observe(make_message(text_block("hello"))) is None
+        assert "10 chars" in monitor.observe(make_message(text_block("world!")))
+
+    def test_turns(self):
+        monitor = StreamMonitor(max_turns=2)
+        assert monitor.observe(make_message()) is None
+        assert monitor.observe(make_message()) is None
+        assert "2 turns" in monitor.observe(make_message())
+
+    def test_tool_calls(self):
+        monitor = StreamMonitor(max_tool_calls=1)
+        assert monitor.observe(make_message(tool_block())) is None
+        assert "1 tool calls" in monitor.observe(make_message(text_block("ok"), tool_block()))
+
+    def test_non_assistant_messages_not_counted(self):
+        monitor = StreamMonitor(max_turns=0)
+        other = MagicMock()
+        other.__class__.__name__ = "ResultMessage"
+        assert monitor.observe(other) is None
+
+    def test_elapsed(self):
+        with patch("maker.red_flag.stream_monitor.time.monotonic", side_effect=[0.0, 31.0]):
+            monitor = StreamMonitor(max_seconds=30)
+            assert "30" in monitor.observe(make_message())
@@ -0,0 +1,71 @@
+from maker.voting.budget import SampleBudget, min_samples
+from maker.core.models import TaskConfig
+
+
+def make_config(**overrides):
+    return TaskConfig(instruction="t", voting_strategy="first_to_k", voting_k=2, **overrides)
+
+
+class TestMinSamples:
+    def test_per_strategy(self):
+        assert min_samples(TaskConfig(instruction="t")) == 1
+        assert min_samples(TaskConfig(instruction="t", voting_strategy="majority", voting_n=5)) == 5
+        assert min_samples(make_config()) == 2
+        # Three unanimous samples reach 0.95 confidence at prior accuracy 0.8
+        assert min_samples(TaskConfig(instruction="t", voting_strategy="sequential")) == 3
+        assert min_samples(TaskConfig(instruction="t", voting_strategy="sequential",
+                                      voting_confidence=0.8, voting_prior_accuracy=0.8)) == 1
+
+
+class TestSampleBudget:
+    def test_from_config_without_budget(self):
+        assert SampleBudget.from_config(make_config()) is None
+
+    def test_unlimited_uses_max_voting_samples(self):
+        budget = SampleBudget(max_cost_usd=1.0)
+        assert budget.step_cap(make_config(), steps_left=3) == 10
+
+    def test_reserves_minimum_for_remaining_steps(self):
+        budget = SampleBudget(max_samples=20)
+        # 3 steps left: reserve K=2 for each of the 2 after this one
+        assert budget.step_cap(make_config(), steps_left=3) == 16
+
+    def test_savings_flow_to_later_steps(self):
+        budget = SampleBudget(max_samples=20)
+        budget.record(2, 0.0)  # easy step decided on the first K
+        assert budget.step_cap(make_config(), steps_left=2) == 16
+
+    def test_exhausted(self):
+        budget = SampleBudget(max_samples=5)
+        budget.record(4, 0.0)
+        assert budget.step_cap(make_config(), steps_left=1) == 0
+
+    def test_floor_when_reserve_cannot_be_met(self):
+        budget = SampleBudget(max_samples=3)
+        assert budget.step_cap(make_config(), steps_left=3) == 2
+
+    def test_sequential_floor_can_decide(self):
+        budget = SampleBudget(max_samples=3)
+        config = TaskConfig(instruction="t", voting_strategy="sequential")
+        assert budget.step_cap(config, steps_left=3) == 3
+        budget.record(3, 0.0)
+        assert budget.step_cap(config, steps_left=2) == 0
+
+    def test_reservations_hold_samples_for_running_steps(self):
+        budget = SampleBudget(max_samples=12)
+        budget.reserve(6)
+        assert budget.remaining() == 6
+        budget.release(6)
+        budget.record(2, 0.0)
+        assert budget.remaining() == 10
+
+    def test_cost_budget_uses_average_sample_cost(self):
+        budget = SampleBudget(max_cost_usd=1.0)
+        budget.record(4, 0.4)  # $0.10 per sample, $0.60 left
+        assert budget.remaining() == 6
+        assert budget.step_cap(make_config(), steps_left=1) == 6
+
+    def test_tighter_limit_wins(self):
+        budget = SampleBudget(max_samples=100, max_cost_usd=1.0)
+        budget.record(4, 0.4)
+        assert budget.remaining() == 6
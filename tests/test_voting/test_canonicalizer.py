@@ -1,5 +1,16 @@
 import pytest
 from maker.voting.canonicalizer import Canonicalizer
+from maker.core.models import PlanStep, TaskConfig, NormalizationConfig
+
+
+def make_step(output_schema="{answer: int}", task_type="action_step"):
+    return PlanStep(
+        step=0, task_type=task_type, title="test",
+        task_description="Do", primary_tools=[], fallback_tools=[],
+        primary_tool_instructions="", fallback_tool_instructions="",
+        input_variables=[], output_variable="step_0_output",
+        output_schema=output_schema, next_step_sequence_number=-1,
+    )
 
 
 class TestCanonicalize:
@@ -102,3 +113,101 @@ class TestCanonicalHash:
     def test_hash_is_string(self):
         canon = Canonicalizer()
         assert isinstance(canon.hash({"a": 1}), str)
+
+
+class TestVoteHash:
+    def test_extra_keys_outside_schema_ignored(self):
+        canon = Canonicalizer()
+        step = make_step("{answer: int}")
+        config = TaskConfig(instruction="t")
+        h1 = canon.vote_hash({"answer": 42, "note": "easy"}, step, config)
+        h2 = canon.vote_hash({"answer": 42, "commentary": "I checked twice"}, step, config)
+        assert h1 == h2
+
+    def test_schema_field_differences_still_split(self):
+        canon = Canonicalizer()
+        step = make_step("{answer: int}")
+        config = TaskConfig(instruction="t")
+        assert canon.vote_hash({"answer": 1}, step, config) != canon.vote_hash({"answer": 2}, step, config)
+
+    def test_conditional_step_hashes_only_next_step(self):
+        canon = Canonicalizer()
+        step = make_step("{next_step: int, reason: string}", task_type="conditional_step")
+        config = TaskConfig(instruction="t")
+        h1 = canon.vote_hash({"next_step": 3, "reason": "severity high"}, step, config)
+        h2 = canon.vote_hash({"next_step": 3, "reason": "it is critical"}, step, config)
+        assert h1 == h2
+
+    def test_no_schema_fields_present_falls_back_to_whole_output(self):
+        canon = Canonicalizer()
+        step = make_step("{answer: int}")
+        config = TaskConfig(instruction="t")
+        assert canon.vote_hash({"v": 1}, step, config) != canon.vote_hash({"v": 2}, step, config)
+
+    def test_projection_can_be_disabled(self):
+        canon = Canonicalizer()
+        step = make_step("{answer: int}")
+        config = TaskConfig(instruction="t", project_votes_to_schema=False)
+        h1 = canon.vote_hash({"answer": 42, "note": "a"}, step, config)
+        h2 = canon.vote_hash({"answer": 42, "note": "b"}, step, config)
+        assert h1 != h2
+
+
+class TestNormalization:
+    def hash(self, data, schema="{}", **options):
+        canon = Canonicalizer()
+        config = TaskConfig(
+            instruction="t", project_votes_to_schema=False,
+            normalization=NormalizationConfig(**options),
+        )
+        return canon.vote_hash(data, make_step(schema), config)
+
+    def test_trailing_newline_and_repeated_spaces(self):
+        assert self.hash({"s": "hello  world\n"}) == self.hash({"s": "hello world"})
+
+    def test_whitespace_can_be_kept(self):
+        assert self.hash({"s": "a  b"}, whitespace=False) != self.hash({"s": "a b"}, whitespace=False)
+
+    def test_unicode_nfc(self):
+        composed = "caf\u00e9"
+        decomposed = "cafe\u0301"
+        assert self.hash({"s": composed}) == self.hash({"s": decomposed})
+
+    def test_numeric_strings_and_numbers_equal(self):
+        assert self.hash({"n": 1}) == self.hash({"n": 1.0}) == self.hash({"n": "1.0"}) == self.hash({"n": " 1 "})
+
+    def test_long_integer_strings_stay_distinct(self):
+        assert self.hash({"id": "12345678901234567890"}) != self.hash({"id": "12345678901234567891"})
+
+    def test_identifier_strings_stay_distinct(self):
+        assert self.hash({"id": "007"}) != self.hash({"id": "7"})
+        assert self.hash({"zip": "02134"}) != self.hash({"zip": "2134"})
+        assert self.hash({"id": "2e5"}) != self.hash({"id": "200000"})
+        assert self.hash({"n": "0.5"}) == self.hash({"n": 0.5})
+
+    def test_booleans_not_treated_as_numbers(self):
+        assert self.hash({"b": True}) != self.hash({"b": 1})
+
+    def test_float_tolerance(self):
+        assert self.hash({"x": 0.1 + 0.2}, float_tolerance=1e-6) == self.hash({"x": 0.3}, float_tolerance=1e-6)
+        assert self.hash({"x": 0.31}, float_tolerance=1e-6) != self.hash({"x": 0.3}, float_tolerance=1e-6)
+
+    def test_lowercase_opt_in(self):
+        assert self.hash({"s": "Yes"}) != self.hash({"s": "yes"})
+        assert self.hash({"s": "Yes"}, lowercase=True) == self.hash({"s": "yes"}, lowercase=True)
+
+    def test_lists_keep_order_by_default(self):
+        assert self.hash({"l": [1, 2]}) != self.hash({"l": [2, 1]})
+
+    def test_unordered_lists_option(self):
+        assert self.hash({"l": [1, 2]}, unordered_lists=True) == self.hash({"l": [2, 1]}, unordered_lists=True)
+
+    def test_set_typed_schema_field_sorted(self):
+        schema = "{tags: set[string], steps: list[string]}"
+        assert self.hash({"tags": ["a", "b"], "steps": ["x"]}, schema) == \
+            self.hash({"tags": ["b", "a"], "steps": ["x"]}, schema)
+        assert self.hash({"tags": ["a"], "steps": ["x", "y"]}, schema) != \
+            self.hash({"tags": ["a"], "steps": ["y", "x"]}, schema)
+
+    def test_nested_values_normalized(self):
+        assert self.hash({"o": {"items": [" a ", "2.0"]}}) == self.hash({"o": {"items": ["a", 2]}})
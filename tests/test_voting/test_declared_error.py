@@ -0,0 +1,52 @@
+import pytest
+from maker.voting.declared_error import DeclaredErrorTracker, DeclaredStepError, classify_error
+from maker.core.models import PlanStep, TaskConfig
+
+
+def make_step(output_schema="{r: string}"):
+    return PlanStep(
+        step=3, task_type="action_step", title="test",
+        task_description="Do", primary_tools=["Read"], fallback_tools=[],
+        primary_tool_instructions="", fallback_tool_instructions="",
+        input_variables=[], output_variable="step_3_output",
+        output_schema=output_schema, next_step_sequence_number=-1,
+    )
+
+
+class TestClassifyError:
+    @pytest.mark.parametrize("message, category", [
+        ("File /tmp/x.txt not found", "not_found"),
+        ("No such file or directory", "not_found"),
+        ("Permission denied writing to /etc", "permission"),
+        ("The Bash tool is not available", "tool_unavailable"),
+        ("Request timed out after 30s", "timeout"),
+        ("Input JSON is malformed", "invalid_input"),
+        ("Something went wrong", "unknown"),
+    ])
+    def test_categories(self, message, category):
+        assert classify_error(message) == category
+
+
+class TestDeclaredErrorTracker:
+    def test_normal_output_ignored(self):
+        tracker = DeclaredErrorTracker(make_step(), TaskConfig(instruction="t"))
+        assert tracker.observe({"r": "ok"}) is False
+        assert tracker.observe({"r": "ok", "error": None}) is False
+
+    def test_raises_at_threshold_per_category(self):
+        tracker = DeclaredErrorTracker(make_step(), TaskConfig(instruction="t"))
+        assert tracker.observe({"error": "file not found"}) is True
+        assert tracker.observe({"error": "permission denied"}) is True
+        with pytest.raises(DeclaredStepError) as exc:
+            tracker.observe({"error": "no such file"})
+        assert exc.value.category == "not_found"
+        assert exc.value.step == 3
+        assert exc.value.samples == 2
+
+    def test_disabled_with_zero_threshold(self):
+        tracker = DeclaredErrorTracker(make_step(), TaskConfig(instruction="t", declared_error_threshold=0))
+        assert tracker.observe({"error": "x"}) is False
+
+    def test_error_field_in_schema_is_a_normal_output(self):
+        tracker = DeclaredErrorTracker(make_step("{error: string}"), TaskConfig(instruction="t"))
+        assert tracker.observe({"error": "none"}) is False
@@ -4,6 +4,8 @@ from maker.voting.factory import create_voter
 from maker.voting.no_voter import NoVoter
 from maker.voting.majority_voter import MajorityVoter
 from maker.voting.first_to_k_voter import FirstToKVoter
+from maker.voting.sequential_voter import SequentialVoter
+from maker.voting.fieldwise_voter import FieldwiseVoter
 from maker.core.models import TaskConfig
 from maker.executor.agent_runner import AgentRunner
 from maker.red_flag.red_flagger import RedFlagger
@@ -25,6 +27,16 @@ class TestCreateVoter:
         voter = create_voter("first_to_k", runner, RedFlagger())
         assert isinstance(voter, FirstToKVoter)
 
+    def test_sequential_strategy(self):
+        runner = MagicMock(spec=AgentRunner)
+        voter = create_voter("sequential", runner, RedFlagger())
+        assert isinstance(voter, SequentialVoter)
+
+    def test_fieldwise_strategy(self):
+        runner = MagicMock(spec=AgentRunner)
+        voter = create_voter("fieldwise", runner, RedFlagger())
+        assert isinstance(voter, FieldwiseVoter)
+
     def test_invalid_strategy_raises(self):
         runner = MagicMock(spec=AgentRunner)
         with pytest.raises(ValueError, match="Unknown voting strategy"):
@@ -0,0 +1,198 @@
+import os
+import pytest
+from unittest.mock import AsyncMock
+from maker.voting.fieldwise_voter import FieldwiseVoter
+from maker.core.models import AgentResult, PlanStep, TaskConfig
+from maker.executor.agent_runner import AgentRunner
+from maker.red_flag.red_flagger import RedFlagger
+
+
+def make_step(output_schema="{a: int, b: int, c: string}", task_type="action_step"):
+    return PlanStep(
+        step=0, task_type=task_type, title="test",
+        task_description="Do", primary_tools=["Read"], fallback_tools=[],
+        primary_tool_instructions="", fallback_tool_instructions="",
+        input_variables=[], output_variable="step_0_output",
+        output_schema=output_schema, next_step_sequence_number=-1,
+    )
+
+
+def make_config(voting_k=2, max_voting_samples=10):
+    return TaskConfig(
+        instruction="test", voting_strategy="fieldwise",
+        voting_k=voting_k, max_voting_samples=max_voting_samples,
+    )
+
+
+def make_result(output):
+    return AgentResult(
+        output=output, raw_response="", was_repaired=False,
+        tokens=100, cost_usd=0.001, duration_ms=500,
+    )
+
+
+class TestFieldwiseVoter:
+    async def test_unanimous(self):
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(return_value=make_result({"a": 1, "b": 2, "c": "x"}))
+
+        voter = FieldwiseVoter(runner=runner, red_flagger=RedFlagger())
+        result = await voter.vote(make_step(), context="", config=make_config())
+
+        assert result.winner == {"a": 1, "b": 2, "c": "x"}
+        assert result.total_samples == 2
+
+    async def test_one_disagreeing_field_does_not_split_sample(self):
+        """Whole-output first-to-K would need many samples here; a and b lock after
+        2 samples and only c keeps voting."""
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=[
+            make_result({"a": 1, "b": 2, "c": "x"}),
+            make_result({"a": 1, "b": 2, "c": "y"}),
+            make_result({"a": 1, "b": 2, "c": "x"}),
+            make_result({"a": 9, "b": 9, "c": "x"}),  # a, b already locked
+        ])
+
+        voter = FieldwiseVoter(runner=runner, red_flagger=RedFlagger())
+        result = await voter.vote(make_step(), context="", config=make_config())
+
+        assert result.winner == {"a": 1, "b": 2, "c": "x"}
+        assert result.total_samples == 4
+        assert result.field_votes["a"] == {next(iter(result.field_votes["a"])): 2}
+        assert sum(result.field_votes["c"].values()) == 4
+
+    async def test_winner_assembled_from_different_samples(self):
+        """No single sample is the winner: b locks on 5 after two samples,
+        a locks on 1 after four."""
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=[
+            make_result({"a": 2, "b": 5}),
+            make_result({"a": 1, "b": 5}),
+            make_result({"a": 1, "b": 6}),
+            make_result({"a": 1, "b": 6}),
+        ])
+
+        voter = FieldwiseVoter(runner=runner, red_flagger=RedFlagger())
+        result = await voter.vote(make_step("{a: int, b: int}"), context="", config=make_config())
+
+        assert result.winner == {"a": 1, "b": 5}
+        assert result.total_samples == 4
+
+    async def test_missing_field_votes_absent(self):
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(return_value=make_result({"a": 1}))
+
+        voter = FieldwiseVoter(runner=runner, red_flagger=RedFlagger())
+        result = await voter.vote(make_step("{a: int, b: int}"), context="", config=make_config())
+
+        assert result.winner == {"a": 1}
+
+    async def test_fields_from_output_when_schema_unparseable(self):
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=[
+            make_result({"x": 1}),
+            make_result({"x": 1, "y": 2}),
+            make_result({"x": 1, "y": 2}),
+            make_result({"x": 1, "y": 2}),
+        ])
+
+        voter = FieldwiseVoter(runner=runner, red_flagger=RedFlagger())
+        result = await voter.vote(make_step("free text schema"), context="", config=make_config())
+
+        # y was absent in sample 1, so it needs two more votes to lead by 2
+        assert result.winner == {"x": 1, "y": 2}
+        assert result.total_samples == 4
+
+    async def test_conditional_votes_on_next_step_only(self):
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=[
+            make_result({"next_step": 3, "reason": "a"}),
+            make_result({"next_step": 3, "reason": "b"}),
+        ])
+
+        voter = FieldwiseVoter(runner=runner, red_flagger=RedFlagger())
+        step = make_step("{next_step: int, reason: string}", task_type="conditional_step")
+        result = await voter.vote(step, context="", config=make_config())
+
+        assert result.winner == {"next_step": 3}
+
+    async def test_respects_max_voting_samples(self):
+        call_count = 0
+
+        async def run_agent(*args, **kwargs):
+            nonlocal call_count
+            call_count += 1
+            return make_result({"a": 1, "b": call_count % 2})
+
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=run_agent)
+
+        voter = FieldwiseVoter(runner=runner, red_flagger=RedFlagger())
+        with pytest.raises(RuntimeError, match=r"fields \['b'\]"):
+            await voter.vote(make_step("{a: int, b: int}"), context="", config=make_config(max_voting_samples=6))
+
+    async def test_cascade_escalates_on_weakest_field(self):
+        cheap_c = iter(["x", "y", "z"])
+
+        async def run_agent(step, context, config):
+            if config.model == "claude-haiku-4-5":
+                # a and b agree, but c never does on the cheap model
+                return make_result({"a": 1, "b": 2, "c": next(cheap_c)})
+            return make_result({"a": 1, "b": 2, "c": "w"})
+
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=run_agent)
+
+        config = make_config(voting_k=2)
+        config.cascade_model = "claude-haiku-4-5"
+        config.cascade_min_samples = 3
+        voter = FieldwiseVoter(runner=runner, red_flagger=RedFlagger())
+        result = await voter.vote(make_step(), context="", config=config)
+
+        assert result.winner == {"a": 1, "b": 2, "c": "w"}
+        assert result.samples_by_model == {"claude-haiku-4-5": 3, "claude-sonnet-4-5": 2}
+
+    async def test_cascade_settles_on_cheap_model_when_it_agrees(self):
+        models = []
+
+        async def run_agent(step, context, config):
+            models.append(config.model)
+            return make_result({"a": 1, "b": 2, "c": "x"})
+
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=run_agent)
+
+        config = make_config(voting_k=2)
+        config.cascade_model = "claude-haiku-4-5"
+        voter = FieldwiseVoter(runner=runner, red_flagger=RedFlagger())
+        result = await voter.vote(make_step(), context="", config=config)
+
+        assert models == ["claude-haiku-4-5", "claude-haiku-4-5"]
+
+
+class TestFieldwiseWorkspaces:
+    async def test_assembled_winner_commits_closest_sample(self, tmp_path):
+        """No sample matches the assembled winner {a: x, b: q} on every field."""
+        outputs = iter([{"a": "x", "b": "p"}, {"a": "x", "b": "r"}] + [{"a": "y", "b": "q"}] * 3)
+
+        async def run(step, context, config):
+            output = next(outputs)
+            with open(os.path.join(config.workspace_dir, "out.txt"), "w") as f:
+                f.write(f"{output['a']}{output['b']}\n")
+            return make_result(output)
+
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=run)
+        step = make_step(output_schema="{a: string, b: string}")
+        step.primary_tools = ["Edit"]
+        config = make_config(voting_k=2)
+        config.workspace_dir = str(tmp_path)
+        config.isolate_sample_workspaces = True
+        config.max_concurrent_samples = 1
+
+        voter = FieldwiseVoter(runner=runner, red_flagger=RedFlagger())
+        result = await voter.vote(step, context="", config=config)
+
+        assert result.winner == {"a": "x", "b": "q"}
+        # Ties on agreement go to the earliest sample
+        assert (tmp_path / "out.txt").read_text() == "xp\n"
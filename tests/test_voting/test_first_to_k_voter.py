@@ -1,9 +1,11 @@
 import pytest
+import asyncio
 from unittest.mock import AsyncMock
 from maker.voting.first_to_k_voter import FirstToKVoter
-from maker.core.models import AgentResult, PlanStep, TaskConfig, VoteResult
+from maker.core.models import AgentResult, PlanStep, TaskConfig, VoteResult, VoteWeightingConfig
 from maker.executor.agent_runner import AgentRunner
 from maker.red_flag.red_flagger import RedFlagger
+from maker.voting.declared_error import DeclaredStepError
 
 
 def make_step():
@@ -115,6 +117,7 @@ class TestFirstToKVoter:
 
         assert result.winner == {"answer": 42}
         assert result.red_flagged == 1
+        assert result.red_flag_hits == {"not_dict": 1}
 
     async def test_canonicalization_groups_votes(self):
         """Same content with different key order should be same vote."""
@@ -129,3 +132,208 @@ class TestFirstToKVoter:
 
         assert result.total_samples == 2
         # Both should count as the same answer -> 2-0 >= 2
+
+    async def test_window_cancels_in_flight_samples_on_k_lead(self):
+        """With a window of 4, the two fast agreeing samples decide the vote
+        and the slow ones still in flight are cancelled, not counted."""
+        cancelled_calls = 0
+        call_count = 0
+
+        async def run_agent(*args, **kwargs):
+            nonlocal call_count, cancelled_calls
+            delay = 0.0 if call_count < 2 else 5.0
+            call_count += 1
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                cancelled_calls += 1
+                raise
+            return make_result({"answer": 42})
+
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=run_agent)
+
+        config = make_config(voting_k=2)
+        config.voting_window = 4
+        voter = FirstToKVoter(runner=runner, red_flagger=RedFlagger())
+        result = await voter.vote(make_step(), context="", config=config)
+
+        assert result.winner == {"answer": 42}
+        assert result.total_samples == 2
+        assert result.cancelled == 3  # window refilled once after the first sample
+        assert result.red_flagged == 0
+        assert cancelled_calls == 3
+
+    async def test_window_never_exceeds_max_voting_samples(self):
+        call_count = 0
+
+        async def run_agent(*args, **kwargs):
+            nonlocal call_count
+            call_count += 1
+            return make_result({"answer": call_count})  # never agree
+
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=run_agent)
+
+        config = make_config(voting_k=2, max_voting_samples=5)
+        config.voting_window = 3
+        voter = FirstToKVoter(runner=runner, red_flagger=RedFlagger())
+
+        with pytest.raises(RuntimeError, match="max_voting_samples"):
+            await voter.vote(make_step(), context="", config=config)
+        assert call_count == 5
+
+    async def test_commentary_outside_schema_does_not_split_votes(self):
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=[
+            make_result({"r": "yes", "note": "checked the file"}),
+            make_result({"r": "yes", "note": "looked twice"}),
+        ])
+
+        voter = FirstToKVoter(runner=runner, red_flagger=RedFlagger())
+        result = await voter.vote(make_step(), context="", config=make_config(voting_k=2))
+
+        assert result.total_samples == 2
+        assert result.winner == {"r": "yes", "note": "checked the file"}
+
+    async def test_similarity_clusters_free_text_votes(self):
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=[
+            make_result({"r": "The build failed because the lockfile is out of date"}),
+            make_result({"r": "The build failed since the lockfile is out of date"}),
+        ])
+
+        config = make_config(voting_k=2)
+        config.voting_similarity_threshold = 0.6
+        voter = FirstToKVoter(runner=runner, red_flagger=RedFlagger())
+        result = await voter.vote(make_step(), context="", config=config)
+
+        assert result.total_samples == 2
+        assert sum(result.vote_counts.values()) == 2
+        assert len(result.vote_counts) == 1
+
+    async def test_cascade_settles_on_cheap_model_when_it_agrees(self):
+        models = []
+
+        async def run_agent(step, context, config):
+            models.append(config.model)
+            return make_result({"answer": 42})
+
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=run_agent)
+
+        config = make_config(voting_k=2)
+        config.cascade_model = "claude-haiku-4-5"
+        voter = FirstToKVoter(runner=runner, red_flagger=RedFlagger())
+        result = await voter.vote(make_step(), context="", config=config)
+
+        assert models == ["claude-haiku-4-5", "claude-haiku-4-5"]
+        assert result.samples_by_model == {"claude-haiku-4-5": 2}
+
+    async def test_cascade_escalates_on_disagreement(self):
+        cheap_answers = iter(["A", "B", "C"])
+
+        async def run_agent(step, context, config):
+            if config.model == "claude-haiku-4-5":
+                return make_result({"answer": next(cheap_answers)})
+            return make_result({"answer": "B"})
+
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=run_agent)
+
+        config = make_config(voting_k=2)
+        config.cascade_model = "claude-haiku-4-5"
+        config.cascade_min_samples = 3
+        voter = FirstToKVoter(runner=runner, red_flagger=RedFlagger())
+        result = await voter.vote(make_step(), context="", config=config)
+
+        # Cheap votes were dropped: the strong model needs its own 2-0 lead
+        assert result.winner == {"answer": "B"}
+        assert result.samples_by_model == {"claude-haiku-4-5": 3, "claude-sonnet-4-5": 2}
+        assert result.total_samples == 5
+        assert result.vote_counts == {result.canonical_hash: 2}
+
+    async def test_cascade_keeps_weighted_cheap_votes(self):
+        cheap_answers = iter(["A", "B", "C"])
+
+        async def run_agent(step, context, config):
+            if config.model == "claude-haiku-4-5":
+                return make_result({"answer": next(cheap_answers)})
+            return make_result({"answer": "B"})
+
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=run_agent)
+
+        config = make_config(voting_k=2)
+        config.cascade_model = "claude-haiku-4-5"
+        config.cascade_min_samples = 3
+        config.vote_weighting = VoteWeightingConfig(enabled=True, model_weights={"claude-haiku-4-5": 0.5})
+        voter = FirstToKVoter(runner=runner, red_flagger=RedFlagger())
+        result = await voter.vote(make_step(), context="", config=config)
+
+        # The cheap B (0.5) and two strong Bs against the cheap A and C
+        assert result.winner == {"answer": "B"}
+        assert result.samples_by_model == {"claude-haiku-4-5": 3, "claude-sonnet-4-5": 2}
+        assert result.vote_counts[result.canonical_hash] == 2.5
+
+    async def test_consistent_declared_error_fails_fast(self):
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(return_value=make_result({"error": "input file not found"}))
+
+        voter = FirstToKVoter(runner=runner, red_flagger=RedFlagger())
+        with pytest.raises(DeclaredStepError, match="not_found") as exc_info:
+            await voter.vote(make_step(), context="", config=make_config(voting_k=2, max_voting_samples=10))
+
+        assert runner.run.call_count == 2
+        assert exc_info.value.total_samples == 2
+        assert exc_info.value.cost_usd == pytest.approx(0.002)
+
+    async def test_declared_error_fails_fast_with_error_object_rule(self):
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(return_value=make_result({"error": "file not found"}))
+
+        flagger = RedFlagger(["agent_error", "not_dict", "error_object"])
+        voter = FirstToKVoter(runner=runner, red_flagger=flagger)
+        with pytest.raises(DeclaredStepError, match="not_found"):
+            await voter.vote(make_step(), context="", config=make_config(voting_k=2, max_voting_samples=10))
+
+        assert runner.run.call_count == 2
+
+    async def test_declared_error_does_not_vote(self):
+        outputs = iter([{"error": "not found"}, {"r": "A"}, {"r": "A"}])
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=lambda *a, **k: make_result(next(outputs)))
+
+        voter = FirstToKVoter(runner=runner, red_flagger=RedFlagger())
+        result = await voter.vote(make_step(), context="", config=make_config(voting_k=2))
+
+        assert result.winner == {"r": "A"}
+        assert result.red_flagged == 1
+
+    async def test_vote_trajectory_recorded(self):
+        outputs = iter([{"r": "A"}, "bad", {"r": "B"}, {"r": "A"}, {"r": "A"}])
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=lambda *a, **k: make_result(next(outputs)))
+
+        voter = FirstToKVoter(runner=runner, red_flagger=RedFlagger())
+        result = await voter.vote(make_step(), context="", config=make_config(voting_k=2))
+
+        assert [s.index for s in result.samples] == [0, 1, 2, 3, 4]
+        assert "dict" in result.samples[1].red_flag_reason
+        assert sorted(result.samples[2].tally.values()) == [1, 1]
+        assert sorted(result.samples[4].tally.values()) == [1, 3]
+        assert 0 < result.agreement_entropy < 1
+
+    async def test_weighted_repaired_samples_need_more_votes(self):
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(return_value=AgentResult(
+            output={"r": "A"}, raw_response="", was_repaired=True,
+            tokens=0, cost_usd=0.0, duration_ms=100,
+        ))
+        config = make_config(voting_k=2)
+        config.vote_weighting = VoteWeightingConfig(enabled=True)
+
+        voter = FirstToKVoter(runner=runner, red_flagger=RedFlagger())
+        result = await voter.vote(make_step(), context="", config=config)
+
+        assert result.total_samples == 4  # four half-votes for a margin of 2
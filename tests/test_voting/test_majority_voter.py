@@ -1,4 +1,5 @@
 import pytest
+import asyncio
 from unittest.mock import AsyncMock
 from maker.voting.majority_voter import MajorityVoter
 from maker.core.models import AgentResult, PlanStep, TaskConfig, VoteResult
@@ -125,3 +126,125 @@ class TestMajorityVoter:
 
         assert result.winner == {"answer": 42}
         assert result.red_flagged >= 1
+
+    async def test_initial_samples_run_concurrently(self):
+        """The first voting_n samples are in flight at the same time."""
+        in_flight = 0
+        peak = 0
+
+        async def run_agent(*args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return make_result({"answer": 42})
+
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=run_agent)
+
+        voter = MajorityVoter(runner=runner, red_flagger=RedFlagger())
+        result = await voter.vote(make_step(), context="", config=make_config(voting_n=5))
+
+        assert result.winner == {"answer": 42}
+        assert result.total_samples == 5
+        assert peak == 5
+
+    async def test_concurrency_cap_respected(self):
+        in_flight = 0
+        peak = 0
+
+        async def run_agent(*args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return make_result({"answer": 42})
+
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=run_agent)
+
+        config = make_config(voting_n=5)
+        config.max_concurrent_samples = 2
+        voter = MajorityVoter(runner=runner, red_flagger=RedFlagger())
+        result = await voter.vote(make_step(), context="", config=config)
+
+        assert peak == 2
+        # Samples 3 and 4 run together; once 3 of 5 agree the fifth is never started
+        assert result.total_samples == 4
+        assert runner.run.call_count == 4
+
+    async def test_top_up_wave_sized_to_possible_majority(self):
+        """After a 3-way split of 3, a wave of 2 is the smallest that can decide."""
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=[
+            make_result({"v": 1}),
+            make_result({"v": 2}),
+            make_result({"v": 3}),
+            make_result({"v": 1}),
+            make_result({"v": 1}),
+        ])
+
+        voter = MajorityVoter(runner=runner, red_flagger=RedFlagger())
+        result = await voter.vote(make_step(), context="", config=make_config(voting_n=3))
+
+        assert result.winner == {"v": 1}
+        assert result.total_samples == 5
+        assert runner.run.call_count == 5
+
+    async def test_stops_once_leader_cannot_be_overtaken(self):
+        """With N=5 and one sample at a time, 3 agreeing votes settle it."""
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(return_value=make_result({"answer": 42}))
+
+        config = make_config(voting_n=5)
+        config.max_concurrent_samples = 1
+        voter = MajorityVoter(runner=runner, red_flagger=RedFlagger())
+        result = await voter.vote(make_step(), context="", config=config)
+
+        assert result.winner == {"answer": 42}
+        assert result.total_samples == 3
+        assert runner.run.await_count == 3
+
+    async def test_stops_once_majority_impossible(self):
+        """Every sample differs, so the vote gives up before the budget is spent."""
+        call_count = 0
+
+        async def run_agent(*args, **kwargs):
+            nonlocal call_count
+            call_count += 1
+            return make_result({"v": call_count})
+
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=run_agent)
+
+        config = make_config(voting_n=3, max_voting_samples=9)
+        config.max_concurrent_samples = 1
+        voter = MajorityVoter(runner=runner, red_flagger=RedFlagger())
+
+        with pytest.raises(RuntimeError, match="no majority possible"):
+            await voter.vote(make_step(), context="", config=config)
+        # After 6 distinct answers 3 samples remain: 1 + 3 votes can't pass 9 / 2
+        assert call_count == 6
+
+    async def test_cascade_escalation_uses_escalation_model(self):
+        cheap_answers = iter([1, 2, 3])
+
+        async def run_agent(step, context, config):
+            if config.model == "claude-haiku-4-5":
+                return make_result({"v": next(cheap_answers)})
+            return make_result({"v": 7})
+
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=run_agent)
+
+        config = make_config(voting_n=3)
+        config.cascade_model = "claude-haiku-4-5"
+        config.escalation_model = "claude-opus-4-6"
+        voter = MajorityVoter(runner=runner, red_flagger=RedFlagger())
+        result = await voter.vote(make_step(), context="", config=config)
+
+        assert result.winner == {"v": 7}
+        assert result.samples_by_model["claude-haiku-4-5"] == 3
+        assert result.samples_by_model["claude-opus-4-6"] >= 2
@@ -4,6 +4,7 @@ from maker.voting.no_voter import NoVoter
 from maker.core.models import AgentResult, PlanStep, TaskConfig, VoteResult
 from maker.executor.agent_runner import AgentRunner
 from maker.red_flag.red_flagger import RedFlagger
+from maker.voting.declared_error import DeclaredStepError
 
 
 def make_step():
@@ -56,6 +57,7 @@ class TestNoVoter:
         assert result.winner == {"result": "ok"}
         assert result.total_samples == 2
         assert result.red_flagged == 1
+        assert result.red_flag_hits == {"not_dict": 1}
 
     async def test_fails_after_max_retries(self):
         runner = AsyncMock(spec=AgentRunner)
@@ -69,6 +71,29 @@ class TestNoVoter:
         with pytest.raises(RuntimeError, match="retries"):
             await voter.vote(make_step(), context="", config=config)
 
+    async def test_retries_capped_by_max_voting_samples(self):
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(return_value=make_agent_result(error="crash"))
+
+        config = make_config()
+        config.max_voting_samples = 1
+
+        voter = NoVoter(runner=runner, red_flagger=RedFlagger())
+        with pytest.raises(RuntimeError, match="retries"):
+            await voter.vote(make_step(), context="", config=config)
+        assert runner.run.call_count == 1
+
+    async def test_declared_error_reports_spend(self):
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(return_value=make_agent_result(output={"error": "file not found"}))
+
+        voter = NoVoter(runner=runner, red_flagger=RedFlagger())
+        with pytest.raises(DeclaredStepError) as exc_info:
+            await voter.vote(make_step(), context="", config=make_config())
+
+        assert exc_info.value.total_samples == 2
+        assert exc_info.value.cost_usd == pytest.approx(0.002)
+
     async def test_retries_on_error(self):
         runner = AsyncMock(spec=AgentRunner)
         runner.run = AsyncMock(side_effect=[
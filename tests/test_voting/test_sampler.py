@@ -0,0 +1,217 @@
+import asyncio
+import os
+import pytest
+from unittest.mock import AsyncMock
+from maker.voting.sampler import SamplePool, LatencyTracker
+from maker.core.models import AgentResult, PlanStep, TaskConfig
+from maker.executor.agent_runner import AgentRunner
+
+
+def make_step():
+    return PlanStep(
+        step=0, task_type="action_step", title="test",
+        task_description="Do", primary_tools=["Read"], fallback_tools=[],
+        primary_tool_instructions="", fallback_tool_instructions="",
+        input_variables=[], output_variable="step_0_output",
+        output_schema="{r: string}", next_step_sequence_number=-1,
+    )
+
+
+def make_result(output):
+    return AgentResult(
+        output=output, raw_response="", was_repaired=False,
+        tokens=100, cost_usd=0.001, duration_ms=500,
+    )
+
+
+class TestSamplePool:
+    async def test_results_in_launch_order_when_simultaneous(self):
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=[make_result({"i": i}) for i in range(3)])
+
+        async with SamplePool(runner, make_step(), "", TaskConfig(instruction="t")) as pool:
+            pool.launch(3)
+            outputs = [(await pool.next_result()).output for _ in range(3)]
+
+        assert outputs == [{"i": 0}, {"i": 1}, {"i": 2}]
+        assert pool.launched == 3
+
+    async def test_exit_cancels_in_flight(self):
+        async def slow(*args, **kwargs):
+            await asyncio.sleep(5)
+
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=slow)
+
+        async with SamplePool(runner, make_step(), "", TaskConfig(instruction="t")) as pool:
+            pool.launch(2)
+            await asyncio.sleep(0)
+            assert pool.in_flight == 2
+
+        assert pool.in_flight == 0
+
+    async def test_runner_exception_propagates(self):
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=ValueError("boom"))
+
+        with pytest.raises(ValueError, match="boom"):
+            async with SamplePool(runner, make_step(), "", TaskConfig(instruction="t")) as pool:
+                pool.launch(1)
+                await pool.next_result()
+
+    async def test_queued_samples_not_started_until_requested(self):
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(return_value=make_result({"ok": True}))
+        config = TaskConfig(instruction="t", max_concurrent_samples=1)
+
+        async with SamplePool(runner, make_step(), "", config) as pool:
+            pool.launch(3)
+            await pool.next_result()
+            cancelled = await pool.cancel_all()
+
+        # Only the first sample ran; the queued two were dropped before starting
+        assert runner.run.call_count == 1
+        assert cancelled == 0
+        assert pool.launched == 1
+
+    async def test_slow_sample_is_hedged_and_fast_duplicate_wins(self):
+        calls = 0
+
+        async def run(*args, **kwargs):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(5)
+                return make_result({"copy": "primary"})
+            return make_result({"copy": "hedge"})
+
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=run)
+        config = TaskConfig(instruction="t", hedge_max_per_step=1, hedge_after_ms=10)
+
+        async with SamplePool(runner, make_step(), "", config) as pool:
+            pool.launch(1)
+            result = await pool.next_result()
+
+        assert result.output == {"copy": "hedge"}
+        assert pool.hedged == 1
+        assert runner.run.call_count == 2
+
+    async def test_no_hedge_without_latency_history(self):
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(return_value=make_result({"ok": True}))
+        config = TaskConfig(instruction="t", hedge_max_per_step=2)
+
+        async with SamplePool(runner, make_step(), "", config) as pool:
+            pool.launch(1)
+            await pool.next_result()
+
+        assert pool.hedged == 0
+        assert runner.run.call_count == 1
+
+
+class TestLatencyTracker:
+    def test_quantile_needs_history(self):
+        tracker = LatencyTracker()
+        for ms in range(LatencyTracker.MIN_HISTORY - 1):
+            tracker.record("action_step", ms)
+        assert tracker.quantile("action_step", 0.9) is None
+
+    def test_quantile(self):
+        tracker = LatencyTracker()
+        for ms in range(1, 11):
+            tracker.record("action_step", ms * 100)
+        assert tracker.quantile("action_step", 0.9) == 1000
+        assert tracker.quantile("other", 0.9) is None
+
+    def test_window_drops_old_samples(self):
+        tracker = LatencyTracker(window=5)
+        for ms in [1000] * 5 + [10] * 5:
+            tracker.record("action_step", ms)
+        assert tracker.quantile("action_step", 0.9) == 10
+
+
+def make_edit_step():
+    step = make_step()
+    step.primary_tools = ["Edit"]
+    return step
+
+
+class TestSampleWorkspaces:
+    async def test_side_effecting_step_runs_serially_without_isolation(self):
+        running = 0
+        peak = 0
+
+        async def run(*args, **kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return make_result({"ok": True})
+
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=run)
+
+        async with SamplePool(runner, make_edit_step(), "", TaskConfig(instruction="t")) as pool:
+            pool.launch(3)
+            for _ in range(3):
+                await pool.next_result()
+
+        assert peak == 1
+
+    async def test_isolated_samples_commit_only_the_winner(self, tmp_path):
+        (tmp_path / "notes.txt").write_text("original\n")
+        seen_dirs = []
+
+        async def run(step, context, config):
+            seen_dirs.append(config.workspace_dir)
+            answer = "A" if len(seen_dirs) != 2 else "B"
+            with open(os.path.join(config.workspace_dir, "notes.txt"), "w") as f:
+                f.write(f"{answer}\n")
+            return make_result({"r": answer})
+
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=run)
+        config = TaskConfig(instruction="t", workspace_dir=str(tmp_path), isolate_sample_workspaces=True)
+
+        async with SamplePool(runner, make_edit_step(), "", config) as pool:
+            pool.launch(3)
+            outputs = [(await pool.next_result()).output for _ in range(3)]
+            # Which sample answers B depends on workspace setup order, so pick by content
+            assert sorted(o["r"] for o in outputs) == ["A", "A", "B"]
+            changed = await pool.commit(next(o for o in outputs if o["r"] == "A"))
+
+        assert len(set(seen_dirs)) == 3
+        assert str(tmp_path) not in seen_dirs
+        assert changed == ["notes.txt"]
+        assert (tmp_path / "notes.txt").read_text() == "A\n"
+        assert not any(os.path.exists(d) for d in seen_dirs)
+
+    async def test_commit_tells_runner_which_files_changed(self, tmp_path):
+        (tmp_path / "notes.txt").write_text("original\n")
+
+        async def run(step, context, config):
+            with open(os.path.join(config.workspace_dir, "notes.txt"), "w") as f:
+                f.write("A\n")
+            return make_result({"r": "A"})
+
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=run)
+        config = TaskConfig(instruction="t", workspace_dir=str(tmp_path), isolate_sample_workspaces=True)
+
+        async with SamplePool(runner, make_edit_step(), "", config) as pool:
+            pool.launch(1)
+            result = await pool.next_result()
+            await pool.commit(result.output)
+
+        runner.files_changed.assert_called_once_with(["notes.txt"])
+
+    async def test_commit_is_noop_without_isolation(self):
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(return_value=make_result({"ok": True}))
+
+        async with SamplePool(runner, make_step(), "", TaskConfig(instruction="t")) as pool:
+            pool.launch(1)
+            result = await pool.next_result()
+            assert await pool.commit(result.output) == []
@@ -0,0 +1,128 @@
+import pytest
+from unittest.mock import AsyncMock
+from maker.voting.sequential_voter import SequentialVoter
+from maker.voting.tally import VoteTally
+from maker.core.models import AgentResult, PlanStep, TaskConfig
+from maker.executor.agent_runner import AgentRunner
+from maker.red_flag.red_flagger import RedFlagger
+
+
+def make_step():
+    return PlanStep(
+        step=0, task_type="action_step", title="test",
+        task_description="Do", primary_tools=["Read"], fallback_tools=[],
+        primary_tool_instructions="", fallback_tool_instructions="",
+        input_variables=[], output_variable="step_0_output",
+        output_schema="{r: string}", next_step_sequence_number=-1,
+    )
+
+
+def make_config(voting_confidence=0.95, voting_prior_accuracy=0.8, max_voting_samples=10):
+    return TaskConfig(
+        instruction="test", voting_strategy="sequential",
+        voting_confidence=voting_confidence,
+        voting_prior_accuracy=voting_prior_accuracy,
+        max_voting_samples=max_voting_samples,
+    )
+
+
+def make_result(output):
+    return AgentResult(
+        output=output, raw_response="", was_repaired=False,
+        tokens=100, cost_usd=0.001, duration_ms=500,
+    )
+
+
+class TestPosterior:
+    def test_empty_tally(self):
+        assert SequentialVoter.posterior(VoteTally(), 0.8) == 0.0
+
+    def test_single_vote_equals_prior(self):
+        tally = VoteTally()
+        tally.add("a", {})
+        assert SequentialVoter.posterior(tally, 0.8) == pytest.approx(0.8)
+
+    def test_disagreement_lowers_posterior(self):
+        agree = VoteTally()
+        split = VoteTally()
+        for key in ["a", "a", "a"]:
+            agree.add(key, {})
+        for key in ["a", "a", "a", "b"]:
+            split.add(key, {})
+        assert SequentialVoter.posterior(split, 0.8) < SequentialVoter.posterior(agree, 0.8)
+
+
+class TestSequentialVoter:
+    async def test_unanimous_stops_when_confident(self):
+        """p=0.8: posteriors are 0.8, 0.94, 0.985 -> stops after 3 at 0.95."""
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(return_value=make_result({"answer": 42}))
+
+        voter = SequentialVoter(runner=runner, red_flagger=RedFlagger())
+        result = await voter.vote(make_step(), context="", config=make_config())
+
+        assert result.winner == {"answer": 42}
+        assert result.total_samples == 3
+
+    async def test_lower_confidence_needs_fewer_samples(self):
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(return_value=make_result({"answer": 42}))
+
+        voter = SequentialVoter(runner=runner, red_flagger=RedFlagger())
+        result = await voter.vote(make_step(), context="", config=make_config(voting_confidence=0.9))
+
+        assert result.total_samples == 2
+
+    async def test_contested_step_samples_past_fixed_k(self):
+        """A:3 B:1 is a K=2 win, but not yet 0.95 confident."""
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=[
+            make_result({"answer": "A"}),
+            make_result({"answer": "B"}),
+            make_result({"answer": "A"}),
+            make_result({"answer": "A"}),
+            make_result({"answer": "A"}),
+        ])
+
+        voter = SequentialVoter(runner=runner, red_flagger=RedFlagger())
+        result = await voter.vote(make_step(), context="", config=make_config())
+
+        assert result.winner == {"answer": "A"}
+        assert result.total_samples == 5
+
+    async def test_red_flagged_excluded(self):
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=[
+            make_result("not a dict"),
+            make_result({"answer": 42}),
+            make_result({"answer": 42}),
+            make_result({"answer": 42}),
+        ])
+
+        voter = SequentialVoter(runner=runner, red_flagger=RedFlagger())
+        result = await voter.vote(make_step(), context="", config=make_config())
+
+        assert result.winner == {"answer": 42}
+        assert result.red_flagged == 1
+        assert result.total_samples == 4
+
+    async def test_respects_max_voting_samples(self):
+        call_count = 0
+
+        async def run_agent(*args, **kwargs):
+            nonlocal call_count
+            call_count += 1
+            return make_result({"answer": call_count % 2})
+
+        runner = AsyncMock(spec=AgentRunner)
+        runner.run = AsyncMock(side_effect=run_agent)
+
+        voter = SequentialVoter(runner=runner, red_flagger=RedFlagger())
+        with pytest.raises(RuntimeError, match="max_voting_samples"):
+            await voter.vote(make_step(), context="", config=make_config(max_voting_samples=6))
+
+    async def test_invalid_prior_accuracy_raises(self):
+        runner = AsyncMock(spec=AgentRunner)
+        voter = SequentialVoter(runner=runner, red_flagger=RedFlagger())
+        with pytest.raises(ValueError, match="voting_prior_accuracy"):
+            await voter.vote(make_step(), context="", config=make_config(voting_prior_accuracy=0.5))
@@ -0,0 +1,62 @@
+import pytest
+from maker.voting.similarity import SimilarityClusterer, shingles, jaccard
+
+
+class TestShingles:
+    def test_unigrams(self):
+        assert shingles("The cat sat") == frozenset({("the",), ("cat",), ("sat",)})
+
+    def test_bigrams(self):
+        assert shingles("a b c", size=2) == frozenset({("a", "b"), ("b", "c")})
+
+    def test_short_text_single_shingle(self):
+        assert shingles("a", size=3) == frozenset({("a",)})
+
+    def test_jaccard(self):
+        assert jaccard(frozenset({1, 2}), frozenset({2, 3})) == pytest.approx(1 / 3)
+        assert jaccard(frozenset(), frozenset()) == 1.0
+
+
+SUMMARY_A = "The service failed because the database connection pool was exhausted"
+SUMMARY_B = "The service failed because the database connection pool got exhausted"
+SUMMARY_C = "Users reported slow page loads after the CDN cache was purged"
+
+
+class TestSimilarityClusterer:
+    def test_near_duplicate_summaries_share_cluster(self):
+        clusterer = SimilarityClusterer(threshold=0.6)
+        a = clusterer.assign("h1", {"summary": SUMMARY_A})
+        b = clusterer.assign("h2", {"summary": SUMMARY_B})
+        assert a == b == "h1"
+
+    def test_different_summaries_split(self):
+        clusterer = SimilarityClusterer(threshold=0.6)
+        a = clusterer.assign("h1", {"summary": SUMMARY_A})
+        c = clusterer.assign("h3", {"summary": SUMMARY_C})
+        assert a != c
+
+    def test_non_text_fields_must_match_exactly(self):
+        clusterer = SimilarityClusterer(threshold=0.6)
+        a = clusterer.assign("h1", {"summary": SUMMARY_A, "count": 3})
+        b = clusterer.assign("h2", {"summary": SUMMARY_A, "count": 4})
+        assert a != b
+
+    def test_short_strings_are_not_free_text(self):
+        clusterer = SimilarityClusterer(threshold=0.5)
+        a = clusterer.assign("h1", {"answer": "the count is 3"})
+        b = clusterer.assign("h2", {"answer": "the count is 4"})
+        assert a != b
+
+    def test_same_key_same_cluster(self):
+        clusterer = SimilarityClusterer(threshold=0.99)
+        assert clusterer.assign("h1", {"summary": SUMMARY_A}) == clusterer.assign("h1", {"summary": SUMMARY_A})
+
+    def test_representative_is_medoid(self):
+        clusterer = SimilarityClusterer(threshold=0.5)
+        outlier = {"summary": "The service failed because the database pool was exhausted again today"}
+        clusterer.assign("h0", outlier)
+        clusterer.assign("h1", {"summary": SUMMARY_A})
+        clusterer.assign("h2", {"summary": SUMMARY_B})
+        cluster = clusterer.assign("h1", {"summary": SUMMARY_A})
+        assert cluster == "h0"
+        assert clusterer.representative(cluster) == {"summary": SUMMARY_A}
@@ -0,0 +1,78 @@
+import asyncio
+from maker.core.models import TaskConfig
+from maker.red_flag.red_flagger import RedFlagger
+from maker.voting.factory import create_voter
+from maker.voting.simulator import (
+    SyntheticRunner, simulate, benchmark, simulation_step, virtual_time_loop, CORRECT,
+)
+
+
+def make_config(strategy, **overrides):
+    return TaskConfig(instruction="sim", voting_strategy=strategy, **overrides)
+
+
+class TestSyntheticRunner:
+    async def test_perfect_accuracy(self):
+        runner = SyntheticRunner(accuracy=1.0, time_scale=0, seed=1)
+        result = await runner.run(simulation_step(), "", make_config("none"))
+        assert result.output == CORRECT
+        assert result.error is None
+        assert runner.completed == 1
+
+    async def test_red_flags(self):
+        runner = SyntheticRunner(red_flag_rate=1.0, time_scale=0, seed=1)
+        result = await runner.run(simulation_step(), "", make_config("none"))
+        assert result.error is not None
+
+    async def test_wrong_answers_within_answer_space(self):
+        runner = SyntheticRunner(accuracy=0.0, answer_space=3, time_scale=0, seed=1)
+        outputs = {(await runner.run(simulation_step(), "", make_config("none"))).output["answer"]
+                   for _ in range(50)}
+        assert outputs == {"wrong_1", "wrong_2"}
+
+
+class TestSimulate:
+    async def test_voting_beats_single_sample(self):
+        none, first_to_k = await benchmark(
+            [make_config("none"), make_config("first_to_k", voting_k=3)],
+            trials=300, accuracy=0.8, time_scale=0,
+        )
+        assert first_to_k.error_rate < none.error_rate
+        assert first_to_k.expected_samples > none.expected_samples
+
+    async def test_majority_unanimous_stops_at_clinch(self):
+        report = await simulate(make_config("majority", voting_n=3), trials=50,
+                                accuracy=1.0, time_scale=0)
+        assert report.error_rate == 0
+        assert report.expected_samples <= 3
+
+    async def test_cost_tracks_samples(self):
+        report = await simulate(make_config("first_to_k"), trials=50, time_scale=0,
+                                cost_per_sample=0.5)
+        assert report.mean_cost_usd == report.expected_samples * 0.5
+
+    async def test_failures_counted_as_errors(self):
+        report = await simulate(make_config("first_to_k", max_voting_samples=4), trials=20,
+                                red_flag_rate=1.0, time_scale=0)
+        assert report.failure_rate == 1.0
+        assert report.error_rate == 1.0
+
+    def test_latency_under_virtual_time(self):
+        with asyncio.Runner(loop_factory=virtual_time_loop) as runner:
+            report = runner.run(simulate(
+                make_config("none"), trials=20, latency_ms=lambda rng: 1500.0,
+            ))
+        assert abs(report.p50_latency_ms - 1500) < 1
+        assert abs(report.p99_latency_ms - 1500) < 1
+
+    def test_decision_time_under_virtual_time(self):
+        async def vote():
+            runner = SyntheticRunner(accuracy=1.0, latency_ms=lambda rng: 1500.0, seed=1)
+            return await create_voter("first_to_k", runner, RedFlagger()).vote(
+                simulation_step(), "", make_config("first_to_k", voting_k=2))
+
+        with asyncio.Runner(loop_factory=virtual_time_loop) as runner:
+            result = runner.run(vote())
+        # Two samples one after another, on the virtual clock
+        assert result.decision_ms == 3000
+        assert [s.elapsed_ms for s in result.samples] == [1500, 3000]
@@ -0,0 +1,89 @@
+import random
+import pytest
+from maker.voting.tally import VoteTally
+
+
+class TestVoteTally:
+    def test_empty(self):
+        tally = VoteTally()
+        assert tally.leader is None
+        assert tally.leader_count == 0
+        assert tally.runner_up_count == 0
+        assert tally.total == 0
+        assert len(tally) == 0
+
+    def test_single_vote_leads(self):
+        tally = VoteTally()
+        tally.add("a", {"v": 1})
+        assert tally.leader == "a"
+        assert tally.leader_count == 1
+        assert tally.runner_up is None
+        assert tally.margin == 1
+
+    def test_runner_up_tracked(self):
+        tally = VoteTally()
+        for key in ["a", "b", "a", "c"]:
+            tally.add(key, {"v": key})
+        assert tally.leader == "a"
+        assert tally.leader_count == 2
+        assert tally.runner_up_count == 1
+        assert tally.margin == 1
+        assert tally.total == 4
+
+    def test_overtake_demotes_leader_to_runner_up(self):
+        tally = VoteTally()
+        for key in ["a", "b", "b"]:
+            tally.add(key, {"v": key})
+        assert tally.leader == "b"
+        assert tally.runner_up == "a"
+        assert tally.margin == 1
+
+    def test_third_answer_can_become_runner_up(self):
+        tally = VoteTally()
+        for key in ["a", "a", "a", "b", "c", "c"]:
+            tally.add(key, {"v": key})
+        assert tally.leader == "a"
+        assert tally.runner_up == "c"
+        assert tally.runner_up_count == 2
+
+    def test_first_output_represents_key(self):
+        tally = VoteTally()
+        tally.add("a", {"first": True})
+        tally.add("a", {"first": False})
+        assert tally.output("a") == {"first": True}
+
+    def test_counts_match_full_recount(self):
+        """Incremental leader/runner-up agrees with sorting from scratch."""
+        rng = random.Random(0)
+        tally = VoteTally()
+        seen: dict[str, int] = {}
+        for _ in range(500):
+            key = str(rng.randint(0, 9))
+            tally.add(key, {})
+            seen[key] = seen.get(key, 0) + 1
+            ranked = sorted(seen.values(), reverse=True)
+            assert tally.leader_count == ranked[0]
+            assert tally.runner_up_count == (ranked[1] if len(ranked) > 1 else 0)
+            assert tally.count(tally.leader) == ranked[0]
+        assert tally.counts() == seen
+        assert tally.total == 500
+
+
+class TestWeightedTally:
+    def test_weighted_margin(self):
+        tally = VoteTally()
+        tally.add("a", {}, 0.5)
+        tally.add("b", {}, 1.0)
+        tally.add("a", {}, 0.5)
+        tally.add("a", {}, 0.5)
+        assert tally.leader == "a"
+        assert tally.leader_count == 1.5
+        assert tally.margin == 0.5
+        assert tally.total == 4
+        assert tally.weight == 2.5
+
+    def test_repeated_fractions_reach_whole_margin(self):
+        tally = VoteTally()
+        for _ in range(10):
+            tally.add("a", {}, 0.1)
+        assert tally.margin >= 1
@@ -0,0 +1,41 @@
+import math
+from maker.core.models import AgentResult
+from maker.voting.trace import VoteTrace, entropy
+
+
+def make_result(output, cost=0.01):
+    return AgentResult(output=output, raw_response="", was_repaired=False,
+                       tokens=0, cost_usd=cost, duration_ms=300)
+
+
+class TestEntropy:
+    def test_unanimous(self):
+        assert entropy({"a": 5}) == 0.0
+
+    def test_even_split(self):
+        assert math.isclose(entropy({"a": 2, "b": 2}), 1.0)
+
+    def test_empty(self):
+        assert entropy({}) == 0.0
+
+
+class TestVoteTrace:
+    def test_records_in_order(self):
+        trace = VoteTrace()
+        trace.record(make_result({"r": 1}), tally={"h1": 1})
+        trace.record(make_result("not a dict"), "Output is not a dict")
+
+        first, second = trace.samples
+        assert (first.index, second.index) == (0, 1)
+        assert first.tally == {"h1": 1}
+        assert first.red_flag_reason is None
+        assert second.red_flag_reason == "Output is not a dict"
+        assert second.output == {}
+        assert second.tally == {}
+
+    def test_tally_is_a_snapshot(self):
+        trace = VoteTrace()
+        counts = {"h1": 1}
+        trace.record(make_result({"r": 1}), tally=counts)
+        counts["h1"] = 2
+        assert trace.samples[0].tally == {"h1": 1}
@@ -0,0 +1,36 @@
+from maker.core.models import AgentResult, TaskConfig, VoteWeightingConfig
+from maker.voting.weights import sample_weight, MIN_WEIGHT
+
+
+def make_result(was_repaired=False, duration_ms=500, raw_response="r: x", model=None):
+    return AgentResult(output={"r": "x"}, raw_response=raw_response, was_repaired=was_repaired,
+                       tokens=0, cost_usd=0.0, duration_ms=duration_ms, model=model)
+
+
+def make_config(**weighting):
+    return TaskConfig(instruction="t", vote_weighting=VoteWeightingConfig(enabled=True, **weighting))
+
+
+class TestSampleWeight:
+    def test_disabled(self):
+        assert sample_weight(make_result(was_repaired=True), TaskConfig(instruction="t")) == 1.0
+
+    def test_clean_sample(self):
+        assert sample_weight(make_result(), make_config()) == 1.0
+
+    def test_repaired(self):
+        assert sample_weight(make_result(was_repaired=True), make_config()) == 0.5
+
+    def test_slow_and_long_multiply(self):
+        config = make_config(slow_after_ms=1000, long_after_chars=10)
+        result = make_result(duration_ms=5000, raw_response="x" * 50)
+        assert sample_weight(result, config) == 0.75 * 0.75
+
+    def test_model_weight(self):
+        config = make_config(model_weights={"claude-haiku-4-5": 0.5})
+        assert sample_weight(make_result(model="claude-haiku-4-5"), config) == 0.5
+        assert sample_weight(make_result(model="claude-sonnet-4-5"), config) == 1.0
+
+    def test_floor(self):
+        config = make_config(repaired=0.0)
+        assert sample_weight(make_result(was_repaired=True), config) == MIN_WEIGHT